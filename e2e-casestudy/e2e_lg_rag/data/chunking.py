@@ -0,0 +1,325 @@
+"""
+Pluggable chunking strategies for the document loader
+"""
+import re
+import uuid
+from functools import lru_cache
+from pathlib import Path
+
+import tiktoken
+from bs4 import BeautifulSoup
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_community.document_loaders import WebBaseLoader
+from langchain_core.documents import Document
+
+ENCODING_NAME = "cl100k_base"
+# The encoding of RecursiveCharacterTextSplitter.from_tiktoken_encoder, which
+# load_data used before chunking became pluggable
+LEGACY_ENCODING_NAME = "gpt2"
+
+HEADING_TAGS = ["h1", "h2", "h3", "h4"]
+BLOCK_TAGS = ["p", "li", "pre", "blockquote", "table"]
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+
+@lru_cache(maxsize=None)
+def _encoding(name):
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception:
+        # tiktoken downloads the encoding on first use, which fails offline
+        return None
+
+
+def count_tokens(text: str, encoding_name: str = ENCODING_NAME) -> int:
+    """
+    Count tokens in text, by default with the cl100k_base encoding of the
+    OpenAI embedding models.
+
+    Falls back to an estimate of 4 characters per token when the encoding
+    cannot be loaded.
+    """
+    encoding = _encoding(encoding_name)
+    if encoding is None:
+        return -(-len(text) // 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _token_splitter(chunk_size, chunk_overlap=0, encoding_name=ENCODING_NAME):
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=lambda text: count_tokens(text, encoding_name),
+    )
+
+
+def _scrape(source):
+    """
+    Parse a web page, or a local HTML file when source is a file path
+    """
+    path = Path(source)
+    if path.is_file():
+        return BeautifulSoup(path.read_text(encoding="utf-8"), "html.parser")
+    return WebBaseLoader(source).scrape()
+
+
+def _chunk(text, metadata, token_count):
+    return Document(page_content=text, metadata={**metadata, "token_count": token_count})
+
+
+class ChunkingStrategy:
+    """
+    Base class for chunking strategies.
+
+    A strategy decides how pages are loaded and split, and how retrieved
+    chunks are expanded before they reach the graders and the generator.
+    Every chunk it produces carries its token count in metadata["token_count"].
+    """
+    name = "base"
+
+    def load(self, url):
+        """
+        Load the documents for a single URL or local HTML file
+        """
+        if not Path(url).is_file():
+            return WebBaseLoader(url).load()
+
+        soup = _scrape(url)
+        title = soup.title.get_text(strip=True) if soup.title else ""
+        return [Document(page_content=soup.get_text(), metadata={"source": url, "title": title})]
+
+    def split_documents(self, documents):
+        """
+        Split loaded documents into chunks
+        """
+        raise NotImplementedError
+
+    def expand(self, documents):
+        """
+        Map retrieved chunks to the documents handed to the graders
+        """
+        return documents
+
+
+class RecursiveChunking(ChunkingStrategy):
+    """
+    Fixed-size token chunks, as load_data has always produced them.
+
+    Chunks are measured in gpt2 tokens, like the from_tiktoken_encoder
+    splitter load_data used, so chunk boundaries are unchanged. Their
+    metadata["token_count"] is in cl100k_base, like every other strategy.
+    """
+    name = "recursive"
+
+    def __init__(self, chunk_size=250, chunk_overlap=0, encoding_name=LEGACY_ENCODING_NAME):
+        self.splitter = _token_splitter(chunk_size, chunk_overlap, encoding_name)
+
+    def split_documents(self, documents):
+        return [
+            _chunk(d.page_content, d.metadata, count_tokens(d.page_content))
+            for d in self.splitter.split_documents(documents)
+        ]
+
+
+class HeadingChunking(ChunkingStrategy):
+    """
+    Sections delimited by the page's HTML headings.
+
+    Small neighbouring sections are merged up to chunk_size tokens and only
+    sections larger than chunk_size are split further, so chunk boundaries
+    follow the structure of the post instead of a fixed window.
+    """
+    name = "headings"
+
+    def __init__(self, chunk_size=800):
+        self.chunk_size = chunk_size
+        self.splitter = _token_splitter(chunk_size)
+
+    def load(self, url):
+        soup = _scrape(url)
+        title = soup.title.get_text(strip=True) if soup.title else ""
+        root = soup.find("article") or soup.body or soup
+
+        sections = []
+        path = []
+        blocks = []
+
+        def flush():
+            if blocks:
+                sections.append(Document(
+                    page_content="\n".join(blocks),
+                    metadata={"source": url, "title": title, "section": " > ".join(path)},
+                ))
+                blocks.clear()
+
+        for element in root.find_all(HEADING_TAGS + BLOCK_TAGS):
+            if element.find_parent(BLOCK_TAGS):
+                continue
+            text = element.get_text(" ", strip=True)
+            if not text:
+                continue
+            if element.name in HEADING_TAGS:
+                flush()
+                level = HEADING_TAGS.index(element.name)
+                path[level:] = [text]
+            else:
+                blocks.append(text)
+        flush()
+
+        return sections
+
+    def split_documents(self, documents):
+        chunks = []
+        pending = []
+        pending_tokens = 0
+        pending_source = None
+
+        def flush():
+            if pending:
+                chunks.append(_chunk(
+                    "\n\n".join(d.page_content for d in pending),
+                    pending[0].metadata,
+                    pending_tokens,
+                ))
+                pending.clear()
+
+        for doc in documents:
+            tokens = count_tokens(doc.page_content)
+            source = doc.metadata.get("source")
+
+            if tokens > self.chunk_size:
+                flush()
+                pending_tokens = 0
+                chunks.extend(
+                    _chunk(d.page_content, d.metadata, count_tokens(d.page_content))
+                    for d in self.splitter.split_documents([doc])
+                )
+                continue
+
+            if source != pending_source or pending_tokens + tokens > self.chunk_size:
+                flush()
+                pending_tokens = 0
+            pending.append(doc)
+            pending_tokens += tokens
+            pending_source = source
+        flush()
+
+        return chunks
+
+
+class SentenceWindowChunking(ChunkingStrategy):
+    """
+    Small sentence groups are embedded, a window of neighbouring groups is returned.
+
+    Each chunk holds whole sentences up to chunk_size tokens and stores the
+    surrounding text in metadata["window"]; expand() swaps the window in and
+    drops duplicate windows so overlapping hits are graded once.
+    """
+    name = "sentence_window"
+
+    def __init__(self, chunk_size=128, window_size=1):
+        self.chunk_size = chunk_size
+        self.window_size = window_size
+
+    def split_documents(self, documents):
+        chunks = []
+        for doc in documents:
+            groups = self._group_sentences(doc.page_content)
+            for i, (text, tokens) in enumerate(groups):
+                lo = max(0, i - self.window_size)
+                hi = i + self.window_size + 1
+                window = " ".join(g[0] for g in groups[lo:hi])
+                chunks.append(_chunk(text, {**doc.metadata, "window": window}, tokens))
+        return chunks
+
+    def _group_sentences(self, text):
+        groups = []
+        current = []
+        current_tokens = 0
+        for sentence in _SENTENCE_BOUNDARY.split(text):
+            sentence = " ".join(sentence.split())
+            if not sentence:
+                continue
+            tokens = count_tokens(sentence)
+            if current and current_tokens + tokens > self.chunk_size:
+                groups.append((" ".join(current), current_tokens))
+                current = []
+                current_tokens = 0
+            current.append(sentence)
+            current_tokens += tokens
+        if current:
+            groups.append((" ".join(current), current_tokens))
+        return groups
+
+    def expand(self, documents):
+        seen = set()
+        expanded = []
+        for doc in documents:
+            window = doc.metadata.get("window", doc.page_content)
+            if window in seen:
+                continue
+            seen.add(window)
+            expanded.append(Document(page_content=window, metadata=doc.metadata))
+        return expanded
+
+
+class ParentChildChunking(ChunkingStrategy):
+    """
+    Small child chunks are searched, their larger parent chunks are returned.
+
+    Parents are kept in memory by id; several children hitting the same
+    parent collapse into one document, which is what cuts grader calls.
+    """
+    name = "parent_child"
+
+    def __init__(self, parent_chunk_size=1000, child_chunk_size=200):
+        self.parent_splitter = _token_splitter(parent_chunk_size)
+        self.child_splitter = _token_splitter(child_chunk_size)
+        self.parents = {}
+
+    def split_documents(self, documents):
+        children = []
+        for parent in self.parent_splitter.split_documents(documents):
+            parent_id = str(uuid.uuid4())
+            self.parents[parent_id] = _chunk(
+                parent.page_content, parent.metadata, count_tokens(parent.page_content)
+            )
+            for child in self.child_splitter.split_documents([parent]):
+                children.append(_chunk(
+                    child.page_content,
+                    {**child.metadata, "parent_id": parent_id},
+                    count_tokens(child.page_content),
+                ))
+        return children
+
+    def expand(self, documents):
+        seen = set()
+        expanded = []
+        for doc in documents:
+            parent_id = doc.metadata.get("parent_id")
+            if parent_id not in self.parents:
+                expanded.append(doc)
+                continue
+            if parent_id in seen:
+                continue
+            seen.add(parent_id)
+            expanded.append(self.parents[parent_id])
+        return expanded
+
+
+CHUNKING_STRATEGIES = {
+    strategy.name: strategy
+    for strategy in (RecursiveChunking, HeadingChunking, SentenceWindowChunking, ParentChildChunking)
+}
+
+
+def get_chunking_strategy(name="recursive", **kwargs):
+    """
+    Create a chunking strategy by name
+    """
+    if name not in CHUNKING_STRATEGIES:
+        raise ValueError(
+            f"Unknown chunking strategy '{name}'. Available: {sorted(CHUNKING_STRATEGIES)}"
+        )
+    return CHUNKING_STRATEGIES[name](**kwargs)
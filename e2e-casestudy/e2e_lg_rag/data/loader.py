@@ -1,25 +1,32 @@
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import WebBaseLoader
 from langchain_community.vectorstores import Chroma
+from langchain_core.runnables import RunnableLambda
 from langchain_openai import OpenAIEmbeddings
 
-def load_data(urls):
+from e2e_lg_rag.data.chunking import ChunkingStrategy, get_chunking_strategy
+
+def load_data(urls, strategy="recursive"):
     """
     Load and process documents from URLs
+
+    strategy is a ChunkingStrategy instance or the name of one
+    (recursive, headings, sentence_window, parent_child).
     """
-    docs = [WebBaseLoader(url).load() for url in urls]
+    if not isinstance(strategy, ChunkingStrategy):
+        strategy = get_chunking_strategy(strategy)
+
+    docs = [strategy.load(url) for url in urls]
     docs_list = [item for sublist in docs for item in sublist]
 
-    text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-        chunk_size=250, chunk_overlap=0
-    )
-    doc_splits = text_splitter.split_documents(docs_list)
+    doc_splits = strategy.split_documents(docs_list)
     
     return doc_splits
 
-def setup_vectorstore(documents, collection_name="rag-chroma"):
+def setup_vectorstore(documents, collection_name="rag-chroma", strategy=None):
     """
     Create and return a vector store and retriever
+
+    When the chunking strategy is given, retrieved chunks are expanded
+    (windows, parents) before they are returned by the retriever.
     """
     vectorstore = Chroma.from_documents(
         documents=documents,
@@ -28,4 +35,6 @@ def setup_vectorstore(documents, collection_name="rag-chroma"):
     )
     
     retriever = vectorstore.as_retriever()
+    if strategy is not None:
+        retriever = retriever | RunnableLambda(strategy.expand)
     return vectorstore, retriever
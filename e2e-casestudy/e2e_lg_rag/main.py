@@ -1,4 +1,6 @@
+import os
 from e2e_lg_rag.data.loader import load_data, setup_vectorstore
+from e2e_lg_rag.data.chunking import get_chunking_strategy
 from e2e_lg_rag.components.graders import create_retrieval_grader, create_hallucination_grader, create_answer_grader
 from e2e_lg_rag.components.transformers import create_question_rewriter
 from e2e_lg_rag.components.generator import create_rag_chain
@@ -13,9 +15,12 @@ class SelfRAG:
     """
     Self-RAG system using LangGraph for RAG with self-reflection capabilities
     """
-    def __init__(self, urls=None):
+    def __init__(self, urls=None, chunking_strategy=None):
         """
         Initialize the Self-RAG system
+
+        chunking_strategy names the chunking strategy to use; it defaults to
+        the CHUNKING_STRATEGY environment variable, then to "recursive".
         """
         logger.info("Initializing Self-RAG system")
         
@@ -27,7 +32,7 @@ class SelfRAG:
             
             # Set up data sources - always call this to ensure retriever exists
             logger.info("Setting up data sources")
-            self.setup_data_sources(urls)
+            self.setup_data_sources(urls, chunking_strategy)
             
             # Initialize components
             logger.debug("Setting up RAG components")
@@ -43,7 +48,7 @@ class SelfRAG:
             logger.exception(f"Failed to initialize Self-RAG system: {str(e)}")
             raise
     
-    def setup_data_sources(self, urls):
+    def setup_data_sources(self, urls, chunking_strategy=None):
         """
         Set up data sources from URLs
         """
@@ -62,13 +67,18 @@ class SelfRAG:
             logger.debug(f"URLs: {urls}")
             
             # Load and process documents
-            logger.info("Loading and processing documents")
-            doc_splits = load_data(urls)
-            logger.info(f"Processed {len(doc_splits)} document chunks")
+            strategy_name = chunking_strategy or os.getenv("CHUNKING_STRATEGY", "recursive")
+            self.chunking_strategy = get_chunking_strategy(strategy_name)
+            logger.info(f"Loading and processing documents with '{strategy_name}' chunking")
+            doc_splits = load_data(urls, self.chunking_strategy)
+            total_tokens = sum(d.metadata.get("token_count", 0) for d in doc_splits)
+            logger.info(f"Processed {len(doc_splits)} document chunks ({total_tokens} tokens)")
             
             # Set up vector store and retriever
             logger.info("Setting up vector store and retriever")
-            self.vectorstore, self.retriever = setup_vectorstore(doc_splits)
+            self.vectorstore, self.retriever = setup_vectorstore(
+                doc_splits, strategy=self.chunking_strategy
+            )
             logger.info("Vector store and retriever set up successfully")
             
         except Exception as e:
@@ -0,0 +1,172 @@
+"""
+Compare chunking strategies on a fixed corpus.
+
+Reports, per strategy, the number of chunks and tokens that get embedded
+and the number of retrieval grader calls the workflow makes for a set of
+questions. Grader calls are counted by running the workflow graph up to the
+generation step with a counting wrapper around the retrieval grader.
+
+By default the checked-in corpus in experiments/corpus is used. With
+--offline, documents are embedded with a local hashing embedding and graded
+with a keyword grader, so the comparison runs without any API; otherwise
+OpenAI embeddings and the configured Ollama grader are used.
+
+Usage:
+    python experiments/compare_chunking.py --offline
+    python experiments/compare_chunking.py -q "What is task decomposition?" -q "What is CoT prompting?"
+    python experiments/compare_chunking.py -u https://lilianweng.github.io/posts/2023-06-23-agent/
+"""
+import argparse
+import contextlib
+import io
+import math
+import re
+import sys
+import zlib
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.runnables import RunnableLambda
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from e2e_lg_rag.components.graders import create_retrieval_grader
+from e2e_lg_rag.data.chunking import CHUNKING_STRATEGIES, get_chunking_strategy
+from e2e_lg_rag.data.loader import load_data, setup_vectorstore
+from e2e_lg_rag.models.schema import GradeDocuments
+from e2e_lg_rag.utils.env_setup import load_environment
+from e2e_lg_rag.workflows.rag_workflow import create_workflow_graph
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+
+FIXTURE_QUESTIONS = [
+    "What is task decomposition?",
+    "How does chain of thought prompting work?",
+    "Which approximate nearest neighbour algorithms are used for agent memory?",
+    "What are gradient based adversarial attacks?",
+]
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "do", "does", "for", "how", "in", "is",
+    "it", "of", "on", "or", "the", "to", "what", "which", "with",
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _words(text):
+    return set(_WORD.findall(text.lower())) - STOPWORDS
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Deterministic bag-of-words embedding for offline runs
+    """
+    def __init__(self, size=512):
+        self.size = size
+
+    def _embed(self, text):
+        vector = [0.0] * self.size
+        for word in _WORD.findall(text.lower()):
+            if word not in STOPWORDS:
+                vector[zlib.crc32(word.encode("utf-8")) % self.size] += 1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def keyword_grader(inputs):
+    """
+    Offline stand-in for the retrieval grader: relevant if any question term occurs
+    """
+    relevant = _words(inputs["question"]) & _words(inputs["document"])
+    return GradeDocuments(binary_score="yes" if relevant else "no")
+
+
+def count_grader_calls(retriever, retrieval_grader, questions):
+    """
+    Run the workflow's retrieve and grade steps for each question and count
+    how often the retrieval grader is invoked
+    """
+    calls = 0
+
+    def counted(inputs):
+        nonlocal calls
+        calls += 1
+        return retrieval_grader.invoke(inputs)
+
+    # Only retrieve and grade_documents run: the graph stops before any later node
+    app = create_workflow_graph(retriever, None, RunnableLambda(counted), None, None, None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for question in questions:
+            app.invoke({"question": question}, interrupt_before=["generate", "transform_query"])
+    return calls
+
+
+def compare(sources, questions, offline=False):
+    if questions and not offline:
+        model_name, base_url = load_environment()
+        retrieval_grader = create_retrieval_grader(model_name, base_url)
+    else:
+        retrieval_grader = RunnableLambda(keyword_grader)
+
+    rows = []
+    for name in CHUNKING_STRATEGIES:
+        strategy = get_chunking_strategy(name)
+        chunks = load_data(sources, strategy)
+        tokens = [c.metadata["token_count"] for c in chunks]
+        row = {
+            "strategy": name,
+            "chunks": len(chunks),
+            "tokens": sum(tokens),
+            "avg_tokens": sum(tokens) // max(len(tokens), 1),
+            "grader_calls": None,
+        }
+
+        if questions:
+            if offline:
+                vectorstore = InMemoryVectorStore.from_documents(chunks, HashingEmbeddings())
+                retriever = vectorstore.as_retriever() | RunnableLambda(strategy.expand)
+            else:
+                vectorstore, retriever = setup_vectorstore(
+                    chunks, collection_name=f"compare-{name}", strategy=strategy
+                )
+            row["grader_calls"] = count_grader_calls(retriever, retrieval_grader, questions)
+            if not offline:
+                vectorstore.delete_collection()
+
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-u", "--url", action="append", dest="urls", help="URL or HTML file to load (repeatable)")
+    parser.add_argument("-q", "--question", action="append", dest="questions", help="question to retrieve for (repeatable)")
+    parser.add_argument("--offline", action="store_true", help="use local embeddings and a keyword grader")
+    args = parser.parse_args()
+
+    sources = args.urls or sorted(str(path) for path in CORPUS_DIR.glob("*.html"))
+    questions = args.questions or ([] if args.urls else FIXTURE_QUESTIONS)
+
+    rows = compare(sources, questions, offline=args.offline)
+    baseline = rows[0]
+
+    print(f"{'strategy':<16}{'chunks':>8}{'tokens':>10}{'avg':>6}{'grader calls':>14}")
+    for row in rows:
+        calls = "-" if row["grader_calls"] is None else row["grader_calls"]
+        print(f"{row['strategy']:<16}{row['chunks']:>8}{row['tokens']:>10}{row['avg_tokens']:>6}{calls:>14}")
+
+    for row in rows[1:]:
+        delta = row["chunks"] - baseline["chunks"]
+        print(f"{row['strategy']}: {delta:+d} chunks vs {baseline['strategy']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+from pathlib import Path
+
+from langchain_core.documents import Document
+
+from e2e_lg_rag.data import chunking
+from e2e_lg_rag.data.chunking import (
+    HeadingChunking,
+    ParentChildChunking,
+    RecursiveChunking,
+    SentenceWindowChunking,
+    count_tokens,
+)
+
+CORPUS_DIR = Path(__file__).parent.parent / "experiments" / "corpus"
+
+
+def _section(text, source="a", section=""):
+    return Document(page_content=text, metadata={"source": source, "section": section})
+
+
+def test_count_tokens_falls_back_to_character_estimate(monkeypatch):
+    monkeypatch.setattr(chunking, "_encoding", lambda name: None)
+
+    assert count_tokens("") == 0
+    assert count_tokens("abcd") == 1
+    assert count_tokens("abcde") == 2
+
+
+def test_recursive_chunking_keeps_the_legacy_splitter_encoding(monkeypatch):
+    used = set()
+    monkeypatch.setattr(chunking, "_encoding", lambda name: used.add(name))
+    text = " ".join(f"Sentence number {i} about agents." for i in range(100))
+
+    RecursiveChunking(chunk_size=50).split_documents([_section(text)])
+
+    # Split on gpt2 tokens as before, token_count in cl100k_base
+    assert used == {"gpt2", "cl100k_base"}
+
+
+def test_recursive_chunks_carry_their_token_count():
+    text = " ".join(f"Sentence number {i} about agents." for i in range(200))
+
+    chunks = RecursiveChunking(chunk_size=50).split_documents([_section(text)])
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk.metadata["token_count"] == count_tokens(chunk.page_content)
+        assert chunk.metadata["token_count"] <= 50
+
+
+def test_headings_load_sections_with_heading_path():
+    sections = HeadingChunking().load(str(CORPUS_DIR / "agents.html"))
+
+    paths = [s.metadata["section"] for s in sections]
+    assert "LLM Powered Autonomous Agents > Planning > Task Decomposition" in paths
+    assert "LLM Powered Autonomous Agents > Memory > Maximum Inner Product Search" in paths
+    # The Planning heading is directly followed by a sub-heading: no empty section
+    assert "LLM Powered Autonomous Agents > Planning" not in paths
+    assert all(s.metadata["title"] == "LLM Powered Autonomous Agents" for s in sections)
+    # List items are kept with the section they belong to
+    reflection = sections[paths.index("LLM Powered Autonomous Agents > Planning > Self-Reflection")]
+    assert "Observation: the result of the action" in reflection.page_content
+
+
+def test_headings_merge_small_sections_up_to_chunk_size():
+    first, second, third = (_section(f"Section {name} text. " * 5, section=name) for name in "xyz")
+    chunk_size = count_tokens(first.page_content) + count_tokens(second.page_content)
+
+    chunks = HeadingChunking(chunk_size=chunk_size).split_documents([first, second, third])
+
+    assert [c.page_content for c in chunks] == [
+        first.page_content + "\n\n" + second.page_content,
+        third.page_content,
+    ]
+    assert chunks[0].metadata["section"] == "x"
+    assert chunks[0].metadata["token_count"] == chunk_size
+
+
+def test_headings_do_not_merge_across_sources():
+    first, second = _section("Short text.", source="a"), _section("Short text.", source="b")
+
+    chunks = HeadingChunking(chunk_size=1000).split_documents([first, second])
+
+    assert [c.metadata["source"] for c in chunks] == ["a", "b"]
+
+
+def test_headings_split_sections_larger_than_chunk_size():
+    small = _section("Introduction.", section="intro")
+    large = _section(" ".join(f"Detail number {i} of the section." for i in range(100)), section="big")
+
+    chunks = HeadingChunking(chunk_size=40).split_documents([small, large])
+
+    assert chunks[0].page_content == "Introduction."
+    assert len(chunks) > 2
+    assert all(c.metadata["section"] == "big" for c in chunks[1:])
+    assert all(c.metadata["token_count"] <= 40 for c in chunks)
+
+
+def test_sentence_window_stores_neighbouring_sentences():
+    text = "Alpha one. Beta two. Gamma three. Delta four."
+    strategy = SentenceWindowChunking(chunk_size=count_tokens("Gamma three."), window_size=1)
+
+    chunks = strategy.split_documents([_section(text)])
+
+    assert [c.page_content for c in chunks] == ["Alpha one.", "Beta two.", "Gamma three.", "Delta four."]
+    assert chunks[0].metadata["window"] == "Alpha one. Beta two."
+    assert chunks[1].metadata["window"] == "Alpha one. Beta two. Gamma three."
+    assert chunks[3].metadata["window"] == "Gamma three. Delta four."
+
+
+def test_sentence_window_expand_drops_duplicate_windows():
+    hit = Document(page_content="Beta two.", metadata={"window": "Alpha one. Beta two."})
+    same_window = Document(page_content="Alpha one.", metadata={"window": "Alpha one. Beta two."})
+    other = Document(page_content="Delta four.", metadata={"window": "Gamma three. Delta four."})
+
+    expanded = SentenceWindowChunking().expand([hit, same_window, other])
+
+    assert [d.page_content for d in expanded] == ["Alpha one. Beta two.", "Gamma three. Delta four."]
+
+
+def test_parent_child_expand_collapses_children_of_one_parent():
+    text = " ".join(f"Fact number {i} about retrieval." for i in range(120))
+    strategy = ParentChildChunking(parent_chunk_size=200, child_chunk_size=40)
+
+    children = strategy.split_documents([_section(text)])
+    first_parent = children[0].metadata["parent_id"]
+    siblings = [c for c in children if c.metadata["parent_id"] == first_parent]
+    stranger = Document(page_content="Not indexed by this strategy.", metadata={})
+
+    expanded = strategy.expand(siblings + [stranger])
+
+    assert len(siblings) > 1
+    assert len(strategy.parents) > 1
+    assert expanded == [strategy.parents[first_parent], stranger]
+    parent = expanded[0]
+    assert all(c.page_content in parent.page_content for c in siblings)
+    assert parent.metadata["token_count"] == count_tokens(parent.page_content)
@@ -0,0 +1,216 @@
+"""Concurrent multi-company enrichment.
+
+Runs the enrichment graph over many companies with bounded concurrency. All
+runs in the process share the graph's rate limiter and Tavily client, so the
+API budget is spent across companies rather than per company. Every finished
+company is appended to a JSON lines file and flushed immediately; that file
+is also the checkpoint, so an interrupted batch resumes with the companies
+that have not succeeded yet.
+
+Usage:
+    python -m enrichment_agent.batch companies.txt -o results.jsonl --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections.abc import Iterable
+from typing import Any, Optional, Union
+
+from langchain_core.runnables import Runnable, RunnableConfig
+
+
+def company_key(company: str) -> str:
+    """Return the key identifying a company in the checkpoint."""
+    return " ".join(company.lower().split())
+
+
+def load_completed(output_path: str) -> set[str]:
+    """Return the keys of the companies already enriched successfully.
+
+    Lines that cannot be parsed (e.g. one cut off by a crash) and failed
+    companies are ignored, so those companies are run again.
+
+    Args:
+        output_path: JSON lines file written by a previous run.
+
+    Returns:
+        set[str]: Company keys with a successful result.
+    """
+    completed: set[str] = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("error") is None and "company" in record:
+                completed.add(company_key(record["company"]))
+
+    return completed
+
+
+def build_inputs(
+    companies: Iterable[Union[str, dict[str, Any]]],
+    extraction_schema: Optional[dict[str, Any]] = None,
+    skip: Optional[set[str]] = None,
+) -> list[dict[str, Any]]:
+    """Turn company names or input dicts into graph inputs.
+
+    Duplicate companies and companies in skip are dropped.
+
+    Args:
+        companies: Company names, or dicts with a "company" key and optional
+            "user_notes" and "extraction_schema".
+        extraction_schema: Schema used for companies that do not set their own.
+        skip: Company keys to leave out, e.g. those already completed.
+
+    Returns:
+        list[dict[str, Any]]: One graph input per company to run.
+    """
+    seen = set(skip or ())
+    inputs = []
+    for company in companies:
+        item = {"company": company} if isinstance(company, str) else dict(company)
+        item["company"] = item["company"].strip()
+        key = company_key(item["company"])
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        if extraction_schema is not None:
+            item.setdefault("extraction_schema", extraction_schema)
+        inputs.append(item)
+
+    return inputs
+
+
+async def run_batch(
+    companies: Iterable[Union[str, dict[str, Any]]],
+    output_path: str,
+    *,
+    max_concurrency: int = 8,
+    extraction_schema: Optional[dict[str, Any]] = None,
+    config: Optional[RunnableConfig] = None,
+    graph: Optional[Runnable] = None,
+) -> dict[str, int]:
+    """Enrich many companies concurrently, appending results as JSON lines.
+
+    Each output line holds the company, its extracted info (or the error),
+    and the elapsed seconds. Companies already in output_path with a
+    successful result are skipped.
+
+    Args:
+        companies: Company names or input dicts (see build_inputs).
+        output_path: JSON lines file to append results to.
+        max_concurrency: Maximum number of graph runs in flight.
+        extraction_schema: Schema for companies that do not set their own.
+        config: Base config for every run, e.g. {"configurable": {...}}.
+        graph: Graph to run; defaults to the enrichment graph.
+
+    Returns:
+        dict[str, int]: Counts of succeeded, failed and skipped companies.
+    """
+    if graph is None:
+        from enrichment_agent.graph import graph
+
+    companies = list(companies)
+    completed = load_completed(output_path)
+    inputs = build_inputs(companies, extraction_schema, skip=completed)
+    stats = {
+        "succeeded": 0,
+        "failed": 0,
+        "skipped": len(build_inputs(companies)) - len(inputs),
+    }
+
+    pending: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+    for item in inputs:
+        pending.put_nowait(item)
+
+    async def run_one(item: dict[str, Any]) -> dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            result = await graph.ainvoke(item, config)
+            error = None
+        except Exception as e:
+            result, error = {}, f"{type(e).__name__}: {e}"
+        return {
+            "company": item["company"],
+            "info": result.get("info"),
+            "error": error,
+            "elapsed": round(time.perf_counter() - started, 3),
+        }
+
+    with open(output_path, "a", encoding="utf-8") as f:
+
+        async def worker() -> None:
+            # A fixed set of workers keeps at most max_concurrency runs (and
+            # their state) alive, however many companies are queued
+            while not pending.empty():
+                record = await run_one(pending.get_nowait())
+                f.write(json.dumps(record, default=str) + "\n")
+                f.flush()
+                stats["failed" if record["error"] else "succeeded"] += 1
+
+        await asyncio.gather(
+            *(worker() for _ in range(min(max_concurrency, len(inputs))))
+        )
+
+    return stats
+
+
+def read_companies(path: str) -> list[Union[str, dict[str, Any]]]:
+    """Read companies from a text file (one per line) or a JSON lines file."""
+    companies: list[Union[str, dict[str, Any]]] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            companies.append(json.loads(line) if line.startswith("{") else line)
+    return companies
+
+
+def main() -> None:
+    """Run a batch from the command line."""
+    parser = argparse.ArgumentParser(description="Enrich many companies concurrently.")
+    parser.add_argument(
+        "companies", help="text file with one company per line, or JSON lines"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="enrichment-results.jsonl",
+        help="JSON lines output and checkpoint",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="maximum concurrent companies"
+    )
+    parser.add_argument("--schema", help="JSON file with the extraction schema")
+    args = parser.parse_args()
+
+    schema = None
+    if args.schema:
+        with open(args.schema, encoding="utf-8") as f:
+            schema = json.load(f)
+
+    stats = asyncio.run(
+        run_batch(
+            read_companies(args.companies),
+            args.output,
+            max_concurrency=args.concurrency,
+            extraction_schema=schema,
+        )
+    )
+    from enrichment_agent.graph import search_cache
+
+    summary = {**stats, "search_cache_hit_rate": round(search_cache.hit_rate, 3)}
+    print(json.dumps(summary))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,14 @@ class Configuration:
     include_search_results: bool = (
         False  # Whether to include search results in the output
     )
+    search_cache_ttl_seconds: int = 24 * 3600  # Max age of cached search results
+    source_token_budget: int = 8000  # Max tokens of search results per notes prompt
+    field_group_size: int = (
+        0  # If set, research groups of this many schema fields in parallel branches
+    )
+    incremental_research: bool = (
+        False  # Research and re-extract only missing fields in reflection loops
+    )
 
     @classmethod
     def from_runnable_config(
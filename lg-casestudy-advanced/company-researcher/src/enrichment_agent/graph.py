@@ -1,17 +1,35 @@
 import asyncio
-from typing import cast, Any, Literal
+import functools
+import os
+from typing import cast, Any, Literal, Union
 import json
 
+import anthropic
 from tavily import AsyncTavilyClient
 from langchain_anthropic import ChatAnthropic
-from langchain_core.rate_limiters import InMemoryRateLimiter
-from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables import Runnable, RunnableConfig
 from langgraph.graph import START, END, StateGraph
+from langgraph.types import Send
 from pydantic import BaseModel, Field
 
 from enrichment_agent.configuration import Configuration
-from enrichment_agent.state import InputState, OutputState, OverallState
-from enrichment_agent.utils import deduplicate_sources, format_sources, format_all_notes
+from enrichment_agent.rate_limiter import RateLimitFeedback, SharedRateLimiter
+from enrichment_agent.search_cache import SearchCache
+from enrichment_agent.state import (
+    FieldGroupState,
+    InputState,
+    OutputState,
+    OverallState,
+)
+from enrichment_agent.utils import (
+    deduplicate_sources,
+    filter_new_sources,
+    format_sources,
+    format_all_notes,
+    merge_info,
+    select_schema_fields,
+    split_schema_fields,
+)
 from enrichment_agent.prompts import (
     EXTRACTION_PROMPT,
     REFLECTION_PROMPT,
@@ -19,29 +37,75 @@ from enrichment_agent.prompts import (
     QUERY_WRITER_PROMPT,
 )
 
-# LLMs
+# Rate limits, shared by all processes using the same RATE_LIMIT_DB file and
+# adapted to 429/overload responses; Anthropic and Tavily have separate budgets
 
-rate_limiter = InMemoryRateLimiter(
-    requests_per_second=4,
+rate_limit_db = os.environ.get("RATE_LIMIT_DB", "rate-limits.sqlite")
+anthropic_rate_limiter = SharedRateLimiter(
+    "anthropic",
+    rate_limit_db,
+    requests_per_second=float(os.environ.get("ANTHROPIC_REQUESTS_PER_SECOND", 4)),
     check_every_n_seconds=0.1,
     max_bucket_size=10,  # Controls the maximum burst size.
 )
+tavily_rate_limiter = SharedRateLimiter(
+    "tavily",
+    rate_limit_db,
+    requests_per_second=float(os.environ.get("TAVILY_REQUESTS_PER_SECOND", 5)),
+    check_every_n_seconds=0.1,
+    max_bucket_size=10,
+)
+
+# LLMs
+
+# The SDK's own retries are disabled so every rejection reaches the limiter;
+# rejected, overloaded and failed connections are retried with backoff
+# through LLM_RETRY instead, as the SDK would have
 claude_3_5_sonnet = ChatAnthropic(
-    model="claude-3-5-sonnet-latest", temperature=0, rate_limiter=rate_limiter
+    model="claude-3-5-sonnet-latest",
+    temperature=0,
+    rate_limiter=anthropic_rate_limiter,
+    max_retries=0,
+    callbacks=[RateLimitFeedback(anthropic_rate_limiter)],
 )
+LLM_RETRY: dict[str, Any] = {
+    "retry_if_exception_type": (
+        anthropic.RateLimitError,
+        anthropic.OverloadedError,
+        anthropic.InternalServerError,
+        anthropic.ConflictError,
+        anthropic.APIConnectionError,
+        anthropic.APITimeoutError,
+    ),
+    "wait_exponential_jitter": True,
+    "stop_after_attempt": 4,
+}
 
 # Search
 
 tavily_async_client = AsyncTavilyClient()
 
 
+async def tavily_search(query: str, **params: Any) -> dict[str, Any]:
+    """Search with Tavily within the shared Tavily rate limit."""
+    return await tavily_rate_limiter.acall(tavily_async_client.search, query, **params)
+
+
+# Search results cached across runs and processes (see Configuration.search_cache_ttl_seconds)
+search_cache = SearchCache(os.environ.get("SEARCH_CACHE_PATH", "search-cache.sqlite"))
+
+
 class Queries(BaseModel):
+    """Search queries written for the extraction schema."""
+
     queries: list[str] = Field(
         description="List of search queries.",
     )
 
 
 class ReflectionOutput(BaseModel):
+    """Assessment of the extracted info and what to search for next."""
+
     is_satisfactory: bool = Field(
         description="True if all required fields are well populated, False otherwise"
     )
@@ -54,14 +118,38 @@ class ReflectionOutput(BaseModel):
     reasoning: str = Field(description="Brief explanation of the assessment")
 
 
-def generate_queries(state: OverallState, config: RunnableConfig) -> dict[str, Any]:
+# Structured output runnables are shared by all runs. Incremental research and
+# field groups ask for many schema subsets, so only the most recent are kept.
+STRUCTURED_LLM_CACHE_SIZE = 128
+
+
+@functools.lru_cache(maxsize=STRUCTURED_LLM_CACHE_SIZE)
+def _build_structured_llm(key: Union[type[BaseModel], str]) -> Runnable:
+    schema = key if isinstance(key, type) else json.loads(key)
+    return claude_3_5_sonnet.with_structured_output(schema).with_retry(**LLM_RETRY)
+
+
+def get_structured_llm(schema: Union[type[BaseModel], dict[str, Any]]) -> Runnable:
+    """Return the structured output runnable for a schema, building it on first use.
+
+    Pydantic models are keyed by class and JSON schemas by their canonical
+    JSON, so every run with the same extraction schema reuses one runnable.
+    The STRUCTURED_LLM_CACHE_SIZE most recently used runnables are kept.
+    """
+    key = schema if isinstance(schema, type) else json.dumps(schema, sort_keys=True)
+    return _build_structured_llm(key)
+
+
+async def generate_queries(
+    state: OverallState, config: RunnableConfig
+) -> dict[str, Any]:
     """Generate search queries based on the user input and extraction schema."""
     # Get configuration
     configurable = Configuration.from_runnable_config(config)
     max_search_queries = configurable.max_search_queries
 
     # Generate search queries
-    structured_llm = claude_3_5_sonnet.with_structured_output(Queries)
+    structured_llm = get_structured_llm(Queries)
 
     # Format system instructions
     query_instructions = QUERY_WRITER_PROMPT.format(
@@ -74,7 +162,7 @@ def generate_queries(state: OverallState, config: RunnableConfig) -> dict[str, A
     # Generate queries
     results = cast(
         Queries,
-        structured_llm.invoke(
+        await structured_llm.ainvoke(
             [
                 {"role": "system", "content": query_instructions},
                 {
@@ -98,18 +186,24 @@ async def research_company(
     This function performs the following steps:
     1. Executes concurrent web searches using the Tavily API
     2. Deduplicates and formats the search results
+
+    In incremental mode, research after a reflection step skips sources used
+    before and takes notes on the missing fields only.
     """
 
     # Get configuration
     configurable = Configuration.from_runnable_config(config)
     max_search_results = configurable.max_search_results
+    cache_ttl = float(configurable.search_cache_ttl_seconds)
 
     # Search tasks
     search_tasks = []
     for query in state.search_queries:
         search_tasks.append(
-            tavily_async_client.search(
+            search_cache.search(
+                tavily_search,
                 query,
+                ttl_seconds=cache_ttl,
                 max_results=max_search_results,
                 include_raw_content=True,
                 topic="general",
@@ -121,20 +215,34 @@ async def research_company(
 
     # Deduplicate and format sources
     deduplicated_search_docs = deduplicate_sources(search_docs)
+    schema = state.extraction_schema
+    if configurable.incremental_research and state.reflection_steps_taken:
+        deduplicated_search_docs = filter_new_sources(
+            deduplicated_search_docs, state.seen_urls
+        )
+        schema = select_schema_fields(schema, state.missing_fields)
+        if not deduplicated_search_docs:
+            return {}
+
     source_str = format_sources(
-        deduplicated_search_docs, max_tokens_per_source=1000, include_raw_content=True
+        deduplicated_search_docs,
+        max_tokens_per_source=1000,
+        include_raw_content=True,
+        schema=schema,
+        token_budget=int(configurable.source_token_budget),
     )
 
     # Generate structured notes relevant to the extraction schema
     p = INFO_PROMPT.format(
-        info=json.dumps(state.extraction_schema, indent=2),
+        info=json.dumps(schema, indent=2),
         content=source_str,
         company=state.company,
         user_notes=state.user_notes,
     )
-    result = await claude_3_5_sonnet.ainvoke(p)
+    result = await claude_3_5_sonnet.with_retry(**LLM_RETRY).ainvoke(p)
     state_update = {
         "completed_notes": [str(result.content)],
+        "seen_urls": [source["url"] for source in deduplicated_search_docs],
     }
     if configurable.include_search_results:
         state_update["search_results"] = deduplicated_search_docs
@@ -142,18 +250,37 @@ async def research_company(
     return state_update
 
 
-def gather_notes_extract_schema(state: OverallState) -> dict[str, Any]:
-    """Gather notes from the web search and extract the schema fields."""
+async def gather_notes_extract_schema(
+    state: OverallState, config: RunnableConfig
+) -> dict[str, Any]:
+    """Gather notes from the web search and extract the schema fields.
+
+    In incremental mode, after a reflection step only the notes added since
+    the last extraction are read, only the missing fields are extracted, and
+    the result is merged into the existing info.
+    """
+    configurable = Configuration.from_runnable_config(config)
+    incremental = (
+        configurable.incremental_research and state.info and state.missing_fields
+    )
+
+    notes_list = state.completed_notes
+    schema = state.extraction_schema
+    if incremental:
+        notes_list = state.completed_notes[state.notes_extracted :]
+        schema = select_schema_fields(schema, state.missing_fields)
+        if not notes_list:
+            return {}
 
     # Format all notes
-    notes = format_all_notes(state.completed_notes)
+    notes = format_all_notes(notes_list)
 
     # Extract schema fields
     system_prompt = EXTRACTION_PROMPT.format(
-        info=json.dumps(state.extraction_schema, indent=2), notes=notes
+        info=json.dumps(schema, indent=2), notes=notes
     )
-    structured_llm = claude_3_5_sonnet.with_structured_output(state.extraction_schema)
-    result = structured_llm.invoke(
+    structured_llm = get_structured_llm(schema)
+    result = await structured_llm.ainvoke(
         [
             {"role": "system", "content": system_prompt},
             {
@@ -162,12 +289,14 @@ def gather_notes_extract_schema(state: OverallState) -> dict[str, Any]:
             },
         ]
     )
-    return {"info": result}
+    if incremental:
+        result = merge_info(state.info, result)
+    return {"info": result, "notes_extracted": len(state.completed_notes)}
 
 
-def reflection(state: OverallState) -> dict[str, Any]:
+async def reflection(state: OverallState) -> dict[str, Any]:
     """Reflect on the extracted information and generate search queries to find missing information."""
-    structured_llm = claude_3_5_sonnet.with_structured_output(ReflectionOutput)
+    structured_llm = get_structured_llm(ReflectionOutput)
 
     # Format reflection prompt
     system_prompt = REFLECTION_PROMPT.format(
@@ -178,7 +307,7 @@ def reflection(state: OverallState) -> dict[str, Any]:
     # Invoke
     result = cast(
         ReflectionOutput,
-        structured_llm.invoke(
+        await structured_llm.ainvoke(
             [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": "Produce a structured reflection output."},
@@ -192,10 +321,72 @@ def reflection(state: OverallState) -> dict[str, Any]:
         return {
             "is_satisfactory": result.is_satisfactory,
             "search_queries": result.search_queries,
+            "missing_fields": result.missing_fields,
             "reflection_steps_taken": state.reflection_steps_taken + 1,
         }
 
 
+def route_from_start(
+    state: OverallState, config: RunnableConfig
+) -> Union[Literal["generate_queries"], list[Send]]:
+    """Fan out one research branch per field group, or research the whole schema."""
+    configurable = Configuration.from_runnable_config(config)
+    group_size = int(configurable.field_group_size)
+    groups = (
+        split_schema_fields(state.extraction_schema, group_size) if group_size else []
+    )
+
+    if len(groups) <= 1:
+        return "generate_queries"
+
+    return [
+        Send(
+            "research_field_group",
+            FieldGroupState(
+                company=state.company,
+                extraction_schema=group,
+                user_notes=state.user_notes,
+            ),
+        )
+        for group in groups
+    ]
+
+
+async def research_field_group(
+    state: FieldGroupState, config: RunnableConfig
+) -> dict[str, Any]:
+    """Generate queries, research and extract one group of schema fields.
+
+    Runs the same steps as the main path, restricted to the group's schema;
+    the branches run concurrently and merge_field_groups combines them.
+    """
+    branch = OverallState(
+        company=state.company,
+        extraction_schema=state.extraction_schema,
+        user_notes=state.user_notes,
+    )
+    branch.search_queries = (await generate_queries(branch, config))["search_queries"]
+
+    research = await research_company(branch, config)
+    branch.completed_notes = research.get("completed_notes", [])
+    extracted = await gather_notes_extract_schema(branch, config)
+
+    return {
+        "completed_notes": branch.completed_notes,
+        "seen_urls": research.get("seen_urls", []),
+        "search_results": research.get("search_results"),
+        "field_group_info": [extracted.get("info") or {}],
+    }
+
+
+def merge_field_groups(state: OverallState) -> dict[str, Any]:
+    """Merge the info extracted by the field group branches."""
+    info: dict[str, Any] = {}
+    for group_info in state.field_group_info:
+        info = merge_info(info, group_info)
+    return {"info": info, "notes_extracted": len(state.completed_notes)}
+
+
 def route_from_reflection(
     state: OverallState, config: RunnableConfig
 ) -> Literal[END, "research_company"]:  # type: ignore
@@ -226,8 +417,14 @@ builder.add_node("gather_notes_extract_schema", gather_notes_extract_schema)
 builder.add_node("generate_queries", generate_queries)
 builder.add_node("research_company", research_company)
 builder.add_node("reflection", reflection)
+builder.add_node("research_field_group", research_field_group)
+builder.add_node("merge_field_groups", merge_field_groups)
 
-builder.add_edge(START, "generate_queries")
+builder.add_conditional_edges(
+    START, route_from_start, ["generate_queries", "research_field_group"]
+)
+builder.add_edge("research_field_group", "merge_field_groups")
+builder.add_edge("merge_field_groups", "reflection")
 builder.add_edge("generate_queries", "research_company")
 builder.add_edge("research_company", "gather_notes_extract_schema")
 builder.add_edge("gather_notes_extract_schema", "reflection")
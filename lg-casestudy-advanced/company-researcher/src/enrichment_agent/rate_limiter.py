@@ -0,0 +1,233 @@
+"""Adaptive rate limiting shared across processes.
+
+SharedRateLimiter is a token bucket kept in a SQLite file, so every worker
+process using the same file draws from one budget per provider. Its rate
+adapts to the provider's responses (AIMD): each success adds a small step
+up to the configured ceiling, and a 429 or overload response halves it,
+at most once per cooldown so a burst of rejections counts as one signal.
+
+RateLimitFeedback reports chat model successes and rejections to a limiter;
+SharedRateLimiter.acall wraps other async API calls (e.g. Tavily searches).
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections.abc import Awaitable
+from typing import Any, Callable, Optional, TypeVar
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.rate_limiters import BaseRateLimiter
+
+T = TypeVar("T")
+
+THROTTLE_STATUS_CODES = (429, 529)
+THROTTLE_ERROR_NAMES = ("RateLimitError", "OverloadedError", "UsageLimitExceededError")
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """Return True if an exception is a provider's rate limit or overload response."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status in THROTTLE_STATUS_CODES or type(error).__name__ in (
+        THROTTLE_ERROR_NAMES
+    )
+
+
+class SharedRateLimiter(BaseRateLimiter):
+    """Token bucket rate limiter stored in SQLite, with AIMD rate adaptation.
+
+    Limiters with the same name and path share one bucket, in any process.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        requests_per_second: float,
+        *,
+        min_requests_per_second: Optional[float] = None,
+        max_bucket_size: float = 1,
+        increase_step: Optional[float] = None,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 1.0,
+        check_every_n_seconds: float = 0.05,
+    ) -> None:
+        """Create a limiter for one provider budget.
+
+        Args:
+            name: Budget name, e.g. "anthropic" or "tavily".
+            path: SQLite file shared by all processes using the budget.
+            requests_per_second: Rate ceiling, normally the provider quota.
+            min_requests_per_second: Rate floor; defaults to 5% of the ceiling.
+            max_bucket_size: Maximum burst size.
+            increase_step: Rate added per success; defaults to 1% of the ceiling.
+            decrease_factor: Factor applied to the rate on a rejection.
+            decrease_cooldown: Minimum seconds between two decreases.
+            check_every_n_seconds: Longest sleep while waiting for a token.
+        """
+        self.name = name
+        self.path = path
+        self.max_rate = requests_per_second
+        self.min_rate = min_requests_per_second or requests_per_second / 20
+        self.max_bucket_size = max_bucket_size
+        self.increase_step = increase_step or requests_per_second / 100
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.check_every_n_seconds = check_every_n_seconds
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per limiter, created on first use and guarded by _lock
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS rate_limits (
+                    name TEXT PRIMARY KEY,
+                    rate REAL NOT NULL,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    last_decrease REAL NOT NULL
+                )"""
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO rate_limits VALUES (?, ?, ?, ?, 0)",
+                (self.name, self.max_rate, self.max_bucket_size, time.time()),
+            )
+            self._conn = conn
+        return self._conn
+
+    def _try_acquire(self) -> float:
+        """Take a token if one is available; return 0.0 or the seconds to wait."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rate, tokens, updated = conn.execute(
+                    "SELECT rate, tokens, updated FROM rate_limits WHERE name = ?",
+                    (self.name,),
+                ).fetchone()
+                now = time.time()
+                tokens = min(
+                    self.max_bucket_size, tokens + max(0.0, now - updated) * rate
+                )
+                wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+                if not wait:
+                    tokens -= 1
+                conn.execute(
+                    "UPDATE rate_limits SET tokens = ?, updated = ? WHERE name = ?",
+                    (tokens, now, self.name),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        """Take a token, waiting for one if blocking."""
+        while True:
+            wait = self._try_acquire()
+            if not wait:
+                return True
+            if not blocking:
+                return False
+            time.sleep(min(wait, self.check_every_n_seconds))
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        """Take a token without blocking the event loop."""
+        while True:
+            wait = await asyncio.to_thread(self._try_acquire)
+            if not wait:
+                return True
+            if not blocking:
+                return False
+            await asyncio.sleep(min(wait, self.check_every_n_seconds))
+
+    @property
+    def rate(self) -> float:
+        """Current shared rate in requests per second."""
+        with self._lock:
+            row = (
+                self._connection()
+                .execute("SELECT rate FROM rate_limits WHERE name = ?", (self.name,))
+                .fetchone()
+            )
+        return float(row[0])
+
+    def on_success(self) -> None:
+        """Additive increase: raise the shared rate by one step, up to the ceiling."""
+        with self._lock:
+            self._connection().execute(
+                "UPDATE rate_limits SET rate = MIN(?, rate + ?) WHERE name = ?",
+                (self.max_rate, self.increase_step, self.name),
+            )
+
+    def on_throttle(self) -> None:
+        """Multiplicative decrease: cut the shared rate and empty the bucket."""
+        now = time.time()
+        with self._lock:
+            self._connection().execute(
+                """UPDATE rate_limits
+                SET rate = MAX(?, rate * ?), tokens = MIN(tokens, 0), last_decrease = ?
+                WHERE name = ? AND last_decrease <= ?""",
+                (
+                    self.min_rate,
+                    self.decrease_factor,
+                    now,
+                    self.name,
+                    now - self.decrease_cooldown,
+                ),
+            )
+
+    async def acall(
+        self,
+        function: Callable[..., Awaitable[T]],
+        *args: Any,
+        retries: int = 3,
+        **kwargs: Any,
+    ) -> T:
+        """Call an async API function within the budget, adapting to its responses.
+
+        Rate limit and overload errors lower the rate and are retried up to
+        retries times (each retry waits for a token at the lowered rate).
+        """
+        attempt = 0
+        while True:
+            await self.aacquire()
+            try:
+                result = await function(*args, **kwargs)
+            except Exception as e:
+                if not is_throttle_error(e):
+                    raise
+                self.on_throttle()
+                attempt += 1
+                if attempt > retries:
+                    raise
+                continue
+            self.on_success()
+            return result
+
+
+class RateLimitFeedback(BaseCallbackHandler):
+    """Report chat model successes and rate limit errors to a SharedRateLimiter."""
+
+    def __init__(self, limiter: SharedRateLimiter) -> None:
+        """Attach the handler to a limiter."""
+        self.limiter = limiter
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        """Count a successful call."""
+        self.limiter.on_success()
+
+    def on_llm_error(self, error: BaseException, **kwargs: Any) -> None:
+        """Lower the rate if the call was rejected for rate or load."""
+        if is_throttle_error(error):
+            self.limiter.on_throttle()
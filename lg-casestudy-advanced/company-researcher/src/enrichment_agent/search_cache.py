@@ -0,0 +1,145 @@
+"""Persistent cache for Tavily search results.
+
+Reflection loops and repeated runs for the same company issue near-identical
+queries. SearchCache stores each response in SQLite, keyed by the normalized
+query and the search parameters, compressed with zlib since responses carry
+large raw_content payloads. Entries older than the TTL are ignored. The
+database runs in WAL mode, so several processes can share one cache file.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Awaitable, Callable, Iterator, Optional
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase a query and collapse its whitespace."""
+    return " ".join(query.lower().split())
+
+
+class SearchCache:
+    """Search responses by (normalized query, parameters), with a TTL.
+
+    Attributes:
+        path: SQLite file shared by every run and process using the cache.
+        ttl_seconds: Default age after which entries are stale.
+        hits: Lookups answered from the cache in this process.
+        misses: Lookups that found no fresh entry in this process.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 24 * 3600) -> None:
+        """Configure a cache stored in the SQLite file at path."""
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one transaction and close it afterwards."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            # The database is created on first use, not when the graph is imported
+            with self._lock:
+                if not self._initialized:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        """CREATE TABLE IF NOT EXISTS search_results (
+                            key TEXT PRIMARY KEY,
+                            created REAL NOT NULL,
+                            payload BLOB NOT NULL
+                        )"""
+                    )
+                    self._initialized = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache, 0.0 before any lookup."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def key(self, query: str, params: dict[str, Any]) -> str:
+        """Return the cache key of a query and its search parameters."""
+        material = json.dumps(
+            {"query": normalize_query(query), "params": params},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(
+        self, query: str, params: dict[str, Any], ttl_seconds: Optional[float] = None
+    ) -> Optional[dict[str, Any]]:
+        """Return the cached response, or None if missing or stale."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload FROM search_results WHERE key = ? AND created >= ?",
+                (self.key(query, params), time.time() - ttl),
+            ).fetchone()
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, query: str, params: dict[str, Any], response: dict[str, Any]) -> None:
+        """Store a response, replacing any previous entry."""
+        payload = zlib.compress(json.dumps(response).encode("utf-8"))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO search_results VALUES (?, ?, ?)",
+                (self.key(query, params), time.time(), payload),
+            )
+
+    def purge_expired(self, ttl_seconds: Optional[float] = None) -> int:
+        """Delete stale entries and return how many were removed."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._connect() as conn:
+            removed = conn.execute(
+                "DELETE FROM search_results WHERE created < ?", (time.time() - ttl,)
+            ).rowcount
+        return removed
+
+    async def search(
+        self,
+        search: Callable[..., Awaitable[dict[str, Any]]],
+        query: str,
+        ttl_seconds: Optional[float] = None,
+        **params: Any,
+    ) -> dict[str, Any]:
+        """Return the cached response of a query, calling search on a miss.
+
+        SQLite access runs in a worker thread so the event loop is not blocked.
+
+        Args:
+            search: Async search function, e.g. AsyncTavilyClient.search.
+            query: Search query.
+            ttl_seconds: Maximum age of a cached response; defaults to the cache TTL.
+            **params: Search parameters, passed to search and part of the key.
+
+        Returns:
+            dict[str, Any]: The search response.
+        """
+        cached = await asyncio.to_thread(self.get, query, params, ttl_seconds)
+        if cached is not None:
+            return cached
+
+        response = await search(query, **params)
+        await asyncio.to_thread(self.put, query, params, response)
+        return response
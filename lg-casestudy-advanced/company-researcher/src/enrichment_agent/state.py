@@ -35,6 +35,22 @@ DEFAULT_EXTRACTION_SCHEMA = {
 }
 
 
+def add_search_results(
+    left: Optional[list[dict]], right: Optional[list[dict]]
+) -> Optional[list[dict]]:
+    """Append search results, skipping URLs already present.
+
+    Lets parallel field group branches and later research steps each add
+    their results; stays None while no step has reported any.
+    """
+    if right is None:
+        return left
+    seen = {result.get("url") for result in left or []}
+    return list(left or []) + [
+        result for result in right if result.get("url") not in seen
+    ]
+
+
 @dataclass(kw_only=True)
 class InputState:
     """Input state defines the interface between the graph and the user (external API)."""
@@ -69,8 +85,10 @@ class OverallState:
     search_queries: list[str] = field(default=None)
     "List of generated search queries to find relevant information"
 
-    search_results: list[dict] = field(default=None)
-    "List of search results"
+    search_results: Annotated[Optional[list[dict]], add_search_results] = field(
+        default=None
+    )
+    "List of search results from every research step"
 
     completed_notes: Annotated[list, operator.add] = field(default_factory=list)
     "Notes from completed research related to the schema"
@@ -88,6 +106,34 @@ class OverallState:
     reflection_steps_taken: int = field(default=0)
     "Number of times the reflection node has been executed"
 
+    missing_fields: list[str] = field(default_factory=list)
+    "Fields the last reflection found missing or incomplete"
+
+    seen_urls: Annotated[list[str], operator.add] = field(default_factory=list)
+    "URLs of the sources already used for notes, skipped in later research steps"
+
+    notes_extracted: int = field(default=0)
+    "Number of completed_notes already extracted into info"
+
+    field_group_info: Annotated[list[dict[str, Any]], operator.add] = field(
+        default_factory=list
+    )
+    "Info extracted by each field group branch, merged into info"
+
+
+@dataclass(kw_only=True)
+class FieldGroupState:
+    """State of one field group branch in the fan-out research mode."""
+
+    company: str
+    "Company to research provided by the user."
+
+    extraction_schema: dict[str, Any]
+    "The part of the extraction schema this branch researches."
+
+    user_notes: Optional[str] = field(default=None)
+    "Any notes from the user to start the research process."
+
 
 @dataclass(kw_only=True)
 class OutputState:
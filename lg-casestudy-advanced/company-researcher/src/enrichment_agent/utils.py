@@ -1,3 +1,8 @@
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any, Optional
 
 
 def deduplicate_sources(search_response: dict | list[dict]) -> list[dict]:
@@ -38,45 +43,235 @@ def deduplicate_sources(search_response: dict | list[dict]) -> list[dict]:
     return unique_sources_list
 
 
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "about and are brief but for from has have its main names not of official "
+    "that the their them this was were what when which who with".split()
+)
+
+_encoding: Any = None
+
+
+def count_tokens(text: str) -> int:
+    """Count the tokens of a text with tiktoken's cl100k_base encoding.
+
+    If the encoding cannot be loaded (e.g. offline), falls back to the rough
+    estimate of 4 characters per token.
+    """
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut a text down to at most max_tokens tokens."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    if _encoding:
+        tokens = _encoding.encode(text, disallowed_special=())
+        return _encoding.decode(tokens[:max_tokens])
+    return text[: max_tokens * 4]
+
+
+def _words(text: str) -> list[str]:
+    return [
+        word
+        for word in _WORD.findall(text.lower())
+        if len(word) > 2 and word not in _STOPWORDS
+    ]
+
+
+def schema_terms(schema: dict[str, Any]) -> set[str]:
+    """Collect the words of a JSON schema's property names and descriptions."""
+    terms: set[str] = set()
+
+    def visit(node: Any) -> None:
+        if not isinstance(node, dict):
+            return
+        if isinstance(node.get("description"), str):
+            terms.update(_words(node["description"]))
+        for name, value in node.get("properties", {}).items():
+            terms.update(_words(name))
+            visit(value)
+        visit(node.get("items"))
+
+    visit(schema)
+    return terms
+
+
+def split_passages(text: str, max_tokens: int = 150) -> list[str]:
+    """Split a text into passages of whole lines of up to about max_tokens tokens.
+
+    A single line longer than max_tokens becomes a passage of its own.
+    """
+    passages: list[str] = []
+    current: list[str] = []
+    size = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        tokens = count_tokens(line)
+        if current and size + tokens > max_tokens:
+            passages.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += tokens
+    if current:
+        passages.append("\n".join(current))
+    return passages
+
+
+def score_passages(
+    passages: list[str], terms: set[str], k1: float = 1.2, b: float = 0.75
+) -> list[float]:
+    """Score passages against query terms with BM25.
+
+    Args:
+        passages: Texts to score; they also provide the document frequencies.
+        terms: Query terms, e.g. from schema_terms.
+        k1: Term frequency saturation.
+        b: Length normalization.
+
+    Returns:
+        list[float]: One score per passage, 0.0 when no term occurs.
+    """
+    if not passages or not terms:
+        return [0.0] * len(passages)
+
+    counts = [Counter(_words(passage)) for passage in passages]
+    lengths = [sum(count.values()) for count in counts]
+    average_length = (sum(lengths) / len(lengths)) or 1.0
+    document_frequency = Counter(
+        term for count in counts for term in count if term in terms
+    )
+
+    scores = []
+    for count, length in zip(counts, lengths):
+        score = 0.0
+        for term in terms & count.keys():
+            idf = math.log(
+                1
+                + (len(passages) - document_frequency[term] + 0.5)
+                / (document_frequency[term] + 0.5)
+            )
+            frequency = count[term]
+            score += (
+                idf
+                * frequency
+                * (k1 + 1)
+                / (frequency + k1 * (1 - b + b * length / average_length))
+            )
+        scores.append(score)
+    return scores
+
+
 def format_sources(
     sources_list: list[dict],
     include_raw_content: bool = True,
     max_tokens_per_source: int = 1000,
+    schema: Optional[dict[str, Any]] = None,
+    token_budget: Optional[int] = None,
 ) -> str:
-    """
-    Takes a list of unique results from Tavily API and formats them.
-    Limits the raw_content to approximately max_tokens_per_source.
-    include_raw_content specifies whether to include the raw_content from Tavily in the formatted string.
+    """Format search results for a prompt, within a token budget.
+
+    With a schema, sources are ranked by how relevant their snippet and raw
+    content are to the schema's fields (BM25 over property names and
+    descriptions), and the most relevant passages of each raw_content are
+    kept rather than its prefix. Sources are packed in rank order until
+    token_budget is used up. Without a schema, sources keep their order and
+    each raw content contributes a contiguous prefix: passages are taken
+    from the start and the first one that does not fit is truncated.
 
     Args:
         sources_list: list of unique results from Tavily API
-        max_tokens_per_source: int, maximum number of tokens per each search result to include in the formatted string
         include_raw_content: bool, whether to include the raw_content from Tavily in the formatted string
+        max_tokens_per_source: int, maximum number of raw content tokens per search result
+        schema: JSON schema the research is for, used to rank sources and passages
+        token_budget: maximum number of tokens of the whole formatted string, or None for no limit
 
     Returns:
-        str: Formatted string with deduplicated sources
+        str: Formatted string with the selected sources
     """
-    # Format output
-    formatted_text = "Sources:\n\n"
+    terms = schema_terms(schema) if schema else set()
+
+    # Split raw contents and score all passages together, so term rarity is
+    # measured across every source
+    passages_by_source = []
     for source in sources_list:
-        formatted_text += f"Source {source['title']}:\n===\n"
-        formatted_text += f"URL: {source['url']}\n===\n"
-        formatted_text += (
-            f"Most relevant content from source: {source['content']}\n===\n"
+        raw_content = source.get("raw_content") or ""
+        if include_raw_content and source.get("raw_content") is None:
+            print(f"Warning: No raw_content found for source {source['url']}")
+        passages_by_source.append(
+            split_passages(raw_content) if include_raw_content else []
+        )
+
+    snippets = [source.get("content") or "" for source in sources_list]
+    all_passages = snippets + [p for ps in passages_by_source for p in ps]
+    all_scores = score_passages(all_passages, terms)
+
+    ranked = []
+    offset = len(snippets)
+    for index, (source, passages) in enumerate(zip(sources_list, passages_by_source)):
+        scores = all_scores[offset : offset + len(passages)]
+        offset += len(passages)
+        relevance = all_scores[index] + max(scores, default=0.0)
+        ranked.append((relevance, index, source, passages, scores))
+    ranked.sort(key=lambda entry: (-entry[0], entry[1]))
+
+    budget = token_budget if token_budget is not None else math.inf
+    parts = ["Sources:\n"]
+    used = count_tokens(parts[0])
+
+    for _, _, source, passages, scores in ranked:
+        header = (
+            f"Source {source['title']}:\n===\n"
+            f"URL: {source['url']}\n===\n"
+            f"Most relevant content from source: {source['content']}\n==="
         )
-        if include_raw_content:
-            # Using rough estimate of 4 characters per token
-            char_limit = max_tokens_per_source * 4
-            # Handle None raw_content
-            raw_content = source.get("raw_content", "")
-            if raw_content is None:
-                raw_content = ""
-                print(f"Warning: No raw_content found for source {source['url']}")
-            if len(raw_content) > char_limit:
-                raw_content = raw_content[:char_limit] + "... [truncated]"
-            formatted_text += f"Full source content limited to {max_tokens_per_source} tokens: {raw_content}\n\n"
+        header_tokens = count_tokens(header)
+        if used + header_tokens > budget:
+            break
+        parts.append(header)
+        used += header_tokens
+
+        if not passages:
+            continue
 
-    return formatted_text.strip()
+        allowance = min(max_tokens_per_source, budget - used)
+        chosen: list[tuple[int, str]] = []
+        taken = 0
+        for position in sorted(range(len(passages)), key=lambda i: (-scores[i], i)):
+            tokens = count_tokens(passages[position])
+            if taken + tokens <= allowance:
+                chosen.append((position, passages[position]))
+                taken += tokens
+            elif not terms:
+                # Prefix mode: a later, smaller passage would leave a gap
+                if allowance - taken > 0:
+                    remainder = truncate_tokens(passages[position], int(allowance - taken))
+                    chosen.append((position, remainder))
+                break
+        if not chosen and allowance > 0:
+            best = min(range(len(passages)), key=lambda i: (-scores[i], i))
+            chosen.append((best, truncate_tokens(passages[best], int(allowance))))
+
+        if chosen:
+            separator = "\n...\n" if terms else "\n"
+            content = separator.join(passage for _, passage in sorted(chosen))
+            section = f"Most relevant passages of the full source content:\n{content}\n"
+            parts.append(section)
+            used += count_tokens(section)
+
+    return "\n".join(parts).strip()
 
 
 def format_all_notes(completed_notes: list[str]) -> str:
@@ -90,3 +285,79 @@ Note: {idx}:
 Notes from research:
 {company_notes}"""
     return formatted_str
+
+
+def select_schema_fields(
+    schema: dict[str, Any], field_names: list[str]
+) -> dict[str, Any]:
+    """Restrict a JSON schema to some of its top-level properties.
+
+    Unknown field names are ignored. If none of the names is a property of the
+    schema, the schema is returned unchanged.
+
+    Args:
+        schema: JSON schema of an object.
+        field_names: Names of the properties to keep.
+
+    Returns:
+        dict[str, Any]: Schema with only the selected properties and required fields.
+    """
+    properties = schema.get("properties", {})
+    selected = [name for name in field_names if name in properties]
+    if not selected:
+        return schema
+
+    return {
+        **schema,
+        "properties": {name: properties[name] for name in selected},
+        "required": [name for name in schema.get("required", []) if name in selected],
+    }
+
+
+def split_schema_fields(schema: dict[str, Any], group_size: int) -> list[dict[str, Any]]:
+    """Split a JSON schema into schemas of at most group_size top-level properties.
+
+    Args:
+        schema: JSON schema of an object.
+        group_size: Maximum number of properties per group.
+
+    Returns:
+        list[dict[str, Any]]: One schema per group of properties, in property order.
+    """
+    names = list(schema.get("properties", {}))
+    if len(names) <= group_size:
+        return [schema]
+
+    return [
+        select_schema_fields(schema, names[start : start + group_size])
+        for start in range(0, len(names), group_size)
+    ]
+
+
+def merge_info(
+    info: Optional[dict[str, Any]], update: dict[str, Any]
+) -> dict[str, Any]:
+    """Merge newly extracted fields into previously extracted info.
+
+    Empty values (None, "", [] and {}) in update do not overwrite existing values.
+
+    Args:
+        info: Info extracted so far, or None.
+        update: Fields extracted in the latest step.
+
+    Returns:
+        dict[str, Any]: The merged info.
+    """
+    merged = dict(info or {})
+    for name, value in update.items():
+        if value not in (None, "", [], {}) or name not in merged:
+            merged[name] = value
+    return merged
+
+
+def filter_new_sources(
+    sources_list: list[dict], seen_urls: Iterable[str]
+) -> list[dict]:
+    """Drop sources whose URL has already been used in an earlier research step."""
+    seen = set(seen_urls)
+    return [source for source in sources_list if source["url"] not in seen]
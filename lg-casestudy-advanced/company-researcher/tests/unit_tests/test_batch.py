@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+from langchain_core.runnables import RunnableLambda
+
+from enrichment_agent.batch import build_inputs, company_key, load_completed, run_batch
+
+
+def test_build_inputs_skips_duplicates_and_completed() -> None:
+    inputs = build_inputs(
+        ["Acme", " acme ", {"company": "Globex", "user_notes": "x"}, "Initech"],
+        extraction_schema={"type": "object"},
+        skip={company_key("Initech")},
+    )
+
+    assert [item["company"] for item in inputs] == ["Acme", "Globex"]
+    assert inputs[1]["user_notes"] == "x"
+    assert all(item["extraction_schema"] == {"type": "object"} for item in inputs)
+
+
+def test_run_batch_bounds_concurrency_and_resumes(tmp_path) -> None:
+    output = tmp_path / "results.jsonl"
+    in_flight = 0
+    peak = 0
+
+    async def fake_graph(item: dict) -> dict:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if item["company"] == "Broken":
+            raise RuntimeError("search failed")
+        return {"info": {"company_name": item["company"]}}
+
+    graph = RunnableLambda(fake_graph)
+    companies = [f"Company {i}" for i in range(10)] + ["Broken"]
+
+    stats = asyncio.run(
+        run_batch(companies, str(output), max_concurrency=3, graph=graph)
+    )
+    assert stats == {"succeeded": 10, "failed": 1, "skipped": 0}
+    assert peak <= 3
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert {r["company"] for r in records if r["error"] is None} == set(companies) - {
+        "Broken"
+    }
+
+    # A crash mid-write leaves a partial line; it must not break resuming
+    with open(output, "a") as f:
+        f.write('{"company": "Compa')
+    assert len(load_completed(str(output))) == 10
+
+    stats = asyncio.run(
+        run_batch(companies, str(output), max_concurrency=3, graph=graph)
+    )
+    assert stats == {"succeeded": 0, "failed": 1, "skipped": 10}
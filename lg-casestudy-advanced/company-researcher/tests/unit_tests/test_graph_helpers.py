@@ -0,0 +1,128 @@
+import asyncio
+import copy
+import importlib
+
+import anthropic
+import httpx
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from enrichment_agent.graph import (
+    LLM_RETRY,
+    STRUCTURED_LLM_CACHE_SIZE,
+    Queries,
+    _build_structured_llm,
+    get_structured_llm,
+    route_from_start,
+)
+from enrichment_agent.state import DEFAULT_EXTRACTION_SCHEMA, OverallState
+
+# The package re-exports the compiled graph under the module's name
+graph_module = importlib.import_module("enrichment_agent.graph")
+
+
+def test_structured_llm_is_built_once_per_schema() -> None:
+    assert get_structured_llm(Queries) is get_structured_llm(Queries)
+
+    schema = copy.deepcopy(DEFAULT_EXTRACTION_SCHEMA)
+    reordered = dict(reversed(list(schema.items())))
+    assert get_structured_llm(schema) is get_structured_llm(reordered)
+    assert get_structured_llm(schema) is not get_structured_llm(Queries)
+
+
+def test_route_from_start_fans_out_field_groups() -> None:
+    state = OverallState(company="Acme")
+
+    assert route_from_start(state, {}) == "generate_queries"
+
+    sends = route_from_start(state, {"configurable": {"field_group_size": 3}})
+    assert [send.node for send in sends] == ["research_field_group"] * 2
+    assert [list(send.arg.extraction_schema["properties"]) for send in sends] == [
+        ["company_name", "founding_year", "founder_names"],
+        ["product_description", "funding_summary"],
+    ]
+
+
+@pytest.mark.parametrize("status_code", [409, 429, 500, 529])
+def test_llm_retry_covers_transient_errors(status_code: int) -> None:
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    response = httpx.Response(status_code, request=request)
+    client = anthropic.Anthropic(api_key="test")
+    errors = [
+        client._make_status_error("rejected", body=None, response=response),
+        anthropic.APIConnectionError(request=request),
+        anthropic.APITimeoutError(request=request),
+    ]
+    attempts = []
+
+    def call(_: str) -> str:
+        attempts.append(1)
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    retry = {**LLM_RETRY, "wait_exponential_jitter": False, "stop_after_attempt": 4}
+    assert RunnableLambda(call).with_retry(**retry).invoke("acme") == "ok"
+    assert len(attempts) == 4
+
+
+def test_llm_retry_does_not_retry_client_errors() -> None:
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    response = httpx.Response(400, request=request)
+    attempts = []
+
+    def call(_: str) -> str:
+        attempts.append(1)
+        raise anthropic.BadRequestError("bad", response=response, body=None)
+
+    with pytest.raises(anthropic.BadRequestError):
+        RunnableLambda(call).with_retry(**LLM_RETRY).invoke("acme")
+    assert len(attempts) == 1
+
+
+def test_field_group_branches_return_search_results(monkeypatch) -> None:
+    async def generate_queries(state: OverallState, config: dict) -> dict:
+        return {"search_queries": [state.company]}
+
+    async def research_company(state: OverallState, config: dict) -> dict:
+        fields = list(state.extraction_schema["properties"])
+        results = [{"url": f"https://example.com/{field}"} for field in fields]
+        results.append({"url": "https://example.com/about"})
+        return {
+            "completed_notes": [",".join(fields)],
+            "seen_urls": [result["url"] for result in results],
+            "search_results": results,
+        }
+
+    async def gather_notes_extract_schema(state: OverallState, config: dict) -> dict:
+        return {"info": {field: "x" for field in state.extraction_schema["properties"]}}
+
+    monkeypatch.setattr(graph_module, "generate_queries", generate_queries)
+    monkeypatch.setattr(graph_module, "research_company", research_company)
+    monkeypatch.setattr(
+        graph_module, "gather_notes_extract_schema", gather_notes_extract_schema
+    )
+
+    output = asyncio.run(
+        graph_module.graph.ainvoke(
+            {"company": "Acme"},
+            {"configurable": {"field_group_size": 3, "include_search_results": True}},
+            interrupt_before=["reflection"],
+        )
+    )
+
+    urls = [result["url"] for result in output["search_results"]]
+    assert sorted(urls) == sorted(
+        [f"https://example.com/{field}" for field in DEFAULT_EXTRACTION_SCHEMA["properties"]]
+        + ["https://example.com/about"]
+    )
+    assert set(output["info"]) == set(DEFAULT_EXTRACTION_SCHEMA["properties"])
+
+
+def test_structured_llm_cache_is_bounded() -> None:
+    for i in range(STRUCTURED_LLM_CACHE_SIZE + 5):
+        schema = copy.deepcopy(DEFAULT_EXTRACTION_SCHEMA)
+        schema["properties"] = {f"field_{i}": {"type": "string"}}
+        get_structured_llm(schema)
+
+    assert _build_structured_llm.cache_info().currsize == STRUCTURED_LLM_CACHE_SIZE
@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+import pytest
+
+from enrichment_agent.rate_limiter import SharedRateLimiter, is_throttle_error
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def test_limiters_on_the_same_file_share_one_bucket(tmp_path) -> None:
+    path = str(tmp_path / "limits.sqlite")
+    first = SharedRateLimiter("api", path, requests_per_second=20, max_bucket_size=2)
+    second = SharedRateLimiter("api", path, requests_per_second=20, max_bucket_size=2)
+    other = SharedRateLimiter("other", path, requests_per_second=20, max_bucket_size=2)
+
+    assert first.acquire(blocking=False)
+    assert second.acquire(blocking=False)
+    assert not first.acquire(blocking=False)
+    assert other.acquire(blocking=False)
+
+    started = time.monotonic()
+    assert second.acquire()
+    assert time.monotonic() - started >= 0.03
+
+
+def test_rate_adapts_with_aimd(tmp_path) -> None:
+    limiter = SharedRateLimiter(
+        "api", str(tmp_path / "limits.sqlite"), requests_per_second=10
+    )
+
+    limiter.on_throttle()
+    assert limiter.rate == pytest.approx(5)
+    # A burst of rejections within the cooldown counts once
+    limiter.on_throttle()
+    assert limiter.rate == pytest.approx(5)
+
+    for _ in range(3):
+        limiter.on_success()
+    assert limiter.rate == pytest.approx(5.3)
+
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.rate == pytest.approx(10)
+
+
+def test_acall_retries_rate_limited_calls(tmp_path) -> None:
+    limiter = SharedRateLimiter(
+        "api", str(tmp_path / "limits.sqlite"), requests_per_second=100
+    )
+    attempts = []
+
+    async def search(query: str) -> str:
+        attempts.append(query)
+        if len(attempts) < 3:
+            raise RateLimitError()
+        return "ok"
+
+    async def failing(query: str) -> str:
+        raise ValueError(query)
+
+    assert asyncio.run(limiter.acall(search, "acme")) == "ok"
+    assert len(attempts) == 3
+    assert limiter.rate < 100
+
+    with pytest.raises(ValueError):
+        asyncio.run(limiter.acall(failing, "acme"))
+
+
+def test_is_throttle_error() -> None:
+    assert is_throttle_error(RateLimitError())
+    assert not is_throttle_error(ValueError())
@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+from enrichment_agent.search_cache import SearchCache
+
+
+def test_search_cache_hits_normalized_queries_and_expires(tmp_path) -> None:
+    cache = SearchCache(str(tmp_path / "cache.sqlite"), ttl_seconds=60)
+    calls = []
+
+    async def search(query: str, **params) -> dict:
+        calls.append((query, params))
+        return {
+            "results": [{"url": "https://example.com", "raw_content": "x" * 10_000}]
+        }
+
+    async def run() -> None:
+        first = await cache.search(search, "Acme  founders", max_results=3)
+        second = await cache.search(search, "acme founders", max_results=3)
+        assert first == second
+        await cache.search(search, "acme founders", max_results=5)
+
+    asyncio.run(run())
+    assert len(calls) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.hit_rate == 1 / 3
+
+    # A second instance (another process) sees the same entries
+    other = SearchCache(cache.path)
+    assert other.get("ACME founders", {"max_results": 3}) is not None
+    assert other.get("acme founders", {"max_results": 3}, ttl_seconds=0) is None
+
+    time.sleep(0.01)
+    assert cache.purge_expired(ttl_seconds=0) == 2
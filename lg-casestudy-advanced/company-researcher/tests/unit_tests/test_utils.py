@@ -0,0 +1,112 @@
+from enrichment_agent.state import DEFAULT_EXTRACTION_SCHEMA
+from enrichment_agent.utils import (
+    count_tokens,
+    filter_new_sources,
+    format_sources,
+    merge_info,
+    select_schema_fields,
+    split_schema_fields,
+)
+
+
+def test_select_schema_fields_keeps_only_missing_fields() -> None:
+    schema = select_schema_fields(
+        DEFAULT_EXTRACTION_SCHEMA, ["company_name", "funding_summary", "ceo"]
+    )
+
+    assert list(schema["properties"]) == ["company_name", "funding_summary"]
+    assert schema["required"] == ["company_name"]
+    assert schema["title"] == DEFAULT_EXTRACTION_SCHEMA["title"]
+
+
+def test_select_schema_fields_falls_back_to_full_schema() -> None:
+    assert select_schema_fields(DEFAULT_EXTRACTION_SCHEMA, ["ceo"]) is (
+        DEFAULT_EXTRACTION_SCHEMA
+    )
+
+
+def test_merge_info_keeps_existing_values_over_empty_ones() -> None:
+    info = {"company_name": "Acme", "founding_year": 1999}
+    update = {"founding_year": None, "founder_names": ["Ada"], "funding_summary": ""}
+
+    assert merge_info(info, update) == {
+        "company_name": "Acme",
+        "founding_year": 1999,
+        "founder_names": ["Ada"],
+        "funding_summary": "",
+    }
+
+
+def test_filter_new_sources() -> None:
+    sources = [{"url": "https://a"}, {"url": "https://b"}]
+    assert filter_new_sources(sources, ["https://a"]) == [{"url": "https://b"}]
+
+
+def _source(title: str, content: str, raw_content: str) -> dict:
+    return {
+        "title": title,
+        "url": f"https://{title}",
+        "content": content,
+        "raw_content": raw_content,
+    }
+
+
+def test_format_sources_ranks_by_schema_relevance_and_keeps_budget() -> None:
+    filler = "\n".join(
+        f"Cookie banner line {i} about site navigation." for i in range(200)
+    )
+    sources = [
+        _source("blog", "Ten tips for remote work", filler),
+        _source(
+            "about",
+            "About Acme",
+            filler
+            + "\nAcme was founded in 1999 by Ada Lovelace. Its funding totals $10M.",
+        ),
+    ]
+
+    text = format_sources(
+        sources,
+        max_tokens_per_source=200,
+        schema=DEFAULT_EXTRACTION_SCHEMA,
+        token_budget=500,
+    )
+
+    assert count_tokens(text) <= 500
+    # The relevant source comes first and its relevant passage is kept even
+    # though it sits at the very end of the raw content
+    assert text.index("https://about") < text.index("https://blog")
+    assert "founded in 1999" in text
+
+
+def test_format_sources_without_schema_keeps_order_and_prefix() -> None:
+    raw = "\n".join(f"line {i}" for i in range(1000))
+    text = format_sources(
+        [_source("a", "x", raw), _source("b", "y", raw)], max_tokens_per_source=50
+    )
+
+    assert text.index("https://a") < text.index("https://b")
+    assert "line 0" in text and "line 999" not in text
+
+
+def test_format_sources_without_schema_takes_a_contiguous_prefix() -> None:
+    raw = "first line\n" + "long " * 400 + "\nlast line"
+    text = format_sources([_source("a", "x", raw)], max_tokens_per_source=50)
+
+    assert "first line" in text
+    assert "long long" in text
+    assert "last line" not in text
+
+
+def test_split_schema_fields() -> None:
+    groups = split_schema_fields(DEFAULT_EXTRACTION_SCHEMA, 2)
+
+    assert [list(group["properties"]) for group in groups] == [
+        ["company_name", "founding_year"],
+        ["founder_names", "product_description"],
+        ["funding_summary"],
+    ]
+    assert [group["required"] for group in groups] == [["company_name"], [], []]
+    assert split_schema_fields(DEFAULT_EXTRACTION_SCHEMA, 10) == [
+        DEFAULT_EXTRACTION_SCHEMA
+    ]
@@ -1,41 +1,128 @@
 """
 Data Ingestion Pipeline for RAG (Retrieval-Augmented Generation) System
 
-This module provides a modularized approach to ingesting documents into a Pinecone vector database.
+This module provides a modularized approach to ingesting documents into a Pinecone vector database
+(or, with VECTOR_BACKEND=local, into a LocalVectorStore directory).
 The design follows object-oriented principles and includes the following main components:
 
 1. Config: Configuration management for environment variables
-2. DocumentProcessor: Abstract base class for document processing (with PDFProcessor implementation)
-3. EmbeddingService: Service for creating and managing embeddings
-4. VectorStoreService: Service for vector store operations with Pinecone
-5. DocumentIngestionPipeline: Main orchestration class that combines all services
+2. DocumentProcessor: Abstract base class for document processing (with PDF, text,
+   CSV and HTML implementations), dispatched by file type through ProcessorRegistry
+3. DocumentChunker: Splits documents into chunks with deterministic ids
+   NearDuplicateDetector: MinHash/LSH detection of exact and near-duplicate documents
+4. EmbeddingService: Service for creating and managing embeddings
+5. VectorStoreService: Service for batched, rate-limited vector store upserts
+6. IngestionManifest: SQLite record of ingested files and their vector ids
+7. DocumentIngestionPipeline: Main orchestration class that combines all services
+8. RunReport: Live counters, stage timings and throughput of an ingestion run
+9. StreamingIngestion: Bounded-memory staged runner used by
+   DocumentIngestionPipeline.stream_from_directory
 
 Key Features:
 - Modular design with clear separation of concerns
 - Error handling and validation
-- Support for different document types (extensible via DocumentProcessor)
+- Support for different document types (extensible via DocumentProcessor);
+  mixed directories are ingested in one walk, each file dispatched by extension
 - Configurable embedding models and dimensions
 - Batch processing of documents
+- Parallel text extraction with a process pool, splitting very large PDFs by page range
+- Chunked, batched and rate-limited upserts with retries; re-runs overwrite
+  chunks by id instead of duplicating them
+- Incremental ingestion: with a manifest, only new or changed files are
+  extracted and embedded, and vectors of removed files are deleted
+- Streaming mode: discover, extract, chunk, embed and upsert run concurrently,
+  connected by bounded queues, so peak memory does not grow with the corpus
+- Near-duplicate collapsing: with a dedup threshold, documents that are exact
+  or near copies of an already ingested one are not embedded or stored
+- Optional summaries: with a SummaryService, each document's summary is
+  stored in its chunks' metadata so the search UI needs no LLM call
+- Optional structured metadata (e.g. years of experience, skills, titles)
+  extracted once per document for metadata-filtered search
+- Run reports: files, pages, characters, chunks, embedding tokens and vectors
+  with per-stage wall time and throughput, printed as JSON after each run
 
 Usage:
     pipeline = DocumentIngestionPipeline()
     pipeline.ingest_from_directory("path/to/pdf/directory")
+    
+    # Large directories: stream with bounded memory
+    pipeline.stream_from_directory("path/to/pdf/directory")
 """
 
 import os
+import csv
+import json
+import time
+import hashlib
+import io
+import mimetypes
+import queue
+import random
+import re
+import sqlite3
+import threading
+import zlib
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from dataclasses import dataclass
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from dataclasses import dataclass, field, replace
+from html.parser import HTMLParser
+from itertools import islice
 
+import tiktoken
 from dotenv import load_dotenv
 from pypdf import PdfReader
 
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 from langchain.schema import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.embeddings import Embeddings
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from langchain_core.vectorstores import VectorStore
 from langchain_pinecone import PineconeVectorStore
 
+from local_vector_store import LocalVectorStore
+from resume_metadata import extract_resume_metadata
+from summaries import SummaryService
+
 load_dotenv()
 
+INGESTION_STAGES = ("discover", "extract", "dedup", "chunk", "embed", "upsert")
+
+_token_encoding = None
+_token_encoding_lock = threading.Lock()
+
+
+def count_tokens(texts: List[str]) -> int:
+    """Count the embedding tokens of texts.
+    
+    Uses the cl100k_base encoding of the text-embedding-3 models. The
+    encoding is loaded once per process; if it cannot be loaded (tiktoken
+    downloads it on first use, which fails offline), tokens are estimated
+    at 4 characters each.
+    
+    Args:
+        texts (List[str]): Texts sent to the embeddings API
+        
+    Returns:
+        int: Total number of tokens
+    """
+    global _token_encoding
+    with _token_encoding_lock:
+        if _token_encoding is None:
+            try:
+                _token_encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                print(f"Warning: tiktoken encoding unavailable ({e}), estimating token counts.")
+                _token_encoding = False
+    
+    if _token_encoding is False:
+        return sum(-(-len(text) // 4) for text in texts)
+    
+    return sum(len(tokens) for tokens in _token_encoding.encode_batch(texts, disallowed_special=()))
+
 
 @dataclass
 class Config:
@@ -48,6 +135,10 @@ class Config:
         openai_api_key (str): API key for OpenAI services
         pinecone_api_key (str): API key for Pinecone vector database
         pinecone_index_name (str): Name of the Pinecone index to use
+        vector_backend (str): "pinecone" (default) or "local"
+        local_vector_store_path (str): Directory of the local vector store
+        local_vector_index (str): Index type of the local store ("flat",
+                                 "ivf" or "hnsw")
     
     Raises:
         ValueError: If any required environment variable is not set
@@ -65,6 +156,9 @@ class Config:
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.pinecone_api_key = os.getenv("PINECONE_API_KEY")
         self.pinecone_index_name = os.getenv("PINECONE_INDEX_NAME")
+        self.vector_backend = os.getenv("VECTOR_BACKEND", "pinecone").lower()
+        self.local_vector_store_path = os.getenv("LOCAL_VECTOR_STORE_PATH", "local-vector-store")
+        self.local_vector_index = os.getenv("LOCAL_VECTOR_INDEX", "flat")
         
         self._validate_config()
     
@@ -77,12 +171,19 @@ class Config:
         
         Raises:
             ValueError: If OPENAI_API_KEY is not set
-            ValueError: If PINECONE_API_KEY is not set  
-            ValueError: If PINECONE_INDEX_NAME is not set
+            ValueError: If VECTOR_BACKEND is neither "pinecone" nor "local"
+            ValueError: If PINECONE_API_KEY is not set (Pinecone backend only)
+            ValueError: If PINECONE_INDEX_NAME is not set (Pinecone backend only)
         """
         if not self.openai_api_key:
             raise ValueError("OPENAI_API_KEY environment variable is not set.")
         
+        if self.vector_backend not in ("pinecone", "local"):
+            raise ValueError(f"VECTOR_BACKEND must be 'pinecone' or 'local', got '{self.vector_backend}'.")
+        
+        if self.vector_backend == "local":
+            return
+        
         if not self.pinecone_api_key:
             raise ValueError("PINECONE_API_KEY environment variable is not set.")
         
@@ -141,6 +242,39 @@ class DocumentProcessor(ABC):
             NotImplementedError: If not implemented by concrete class
         """
         pass
+    
+    def count_pages(self, file_path: str) -> int:
+        """Count the independently extractable pages of a document.
+        
+        Processors for paged formats override this so that very large files
+        can be split into page ranges and extracted in parallel. The default
+        treats the whole document as a single page.
+        
+        Args:
+            file_path (str): Absolute path to the document file
+            
+        Returns:
+            int: Number of pages in the document
+        """
+        return 1
+    
+    def extract_pages(self, file_path: str, start: int = 0, 
+                      stop: Optional[int] = None) -> List[str]:
+        """Extract the text of a range of pages.
+        
+        The default implementation ignores the range and returns the full
+        text from extract_text() as a single page.
+        
+        Args:
+            file_path (str): Absolute path to the document file
+            start (int): Index of the first page to extract
+            stop (Optional[int]): Index one past the last page to extract.
+                                If None, extracts through the last page
+            
+        Returns:
+            List[str]: Extracted text, one entry per page
+        """
+        return [self.extract_text(file_path)]
 
 
 class PDFProcessor(DocumentProcessor):
@@ -150,15 +284,17 @@ class PDFProcessor(DocumentProcessor):
     It uses the pypdf library to extract text content from PDF documents and
     creates Document objects with comprehensive metadata.
     
-    The processor handles multi-page PDFs by concatenating text from all pages
+    The processor handles multi-page PDFs by joining text from all pages
     and includes file system metadata in the resulting Document objects.
+    Page ranges can be extracted independently, which lets the pipeline
+    spread a single large PDF across several worker processes.
     """
     
     def extract_text(self, file_path: str) -> str:
         """Extract text from a PDF document.
         
         Reads a PDF file and extracts text content from all pages.
-        The text from multiple pages is concatenated with newline separators.
+        The text from multiple pages is joined with newline separators.
         
         Args:
             file_path (str): Absolute path to the PDF file
@@ -171,16 +307,52 @@ class PDFProcessor(DocumentProcessor):
             FileNotFoundError: If the PDF file doesn't exist at the specified path
             Exception: For PDF reading or text extraction errors
         """
+        return "\n".join(self.extract_pages(file_path)).strip()
+    
+    def count_pages(self, file_path: str) -> int:
+        """Count the pages of a PDF document.
+        
+        Args:
+            file_path (str): Absolute path to the PDF file
+            
+        Returns:
+            int: Number of pages in the PDF
+            
+        Raises:
+            FileNotFoundError: If the PDF file doesn't exist at the specified path
+        """
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"PDF file {file_path} does not exist.")
         
-        text = ""
-        pdf_reader = PdfReader(file_path)
+        return len(PdfReader(file_path).pages)
+    
+    def extract_pages(self, file_path: str, start: int = 0, 
+                      stop: Optional[int] = None) -> List[str]:
+        """Extract the text of a range of PDF pages.
+        
+        Opens the PDF independently, so separate ranges of the same file can
+        be extracted concurrently in different processes.
+        
+        Args:
+            file_path (str): Absolute path to the PDF file
+            start (int): Index of the first page to extract
+            stop (Optional[int]): Index one past the last page to extract.
+                                If None, extracts through the last page
+            
+        Returns:
+            List[str]: Extracted text, one entry per page
+            
+        Raises:
+            FileNotFoundError: If the PDF file doesn't exist at the specified path
+            Exception: For PDF reading or text extraction errors
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"PDF file {file_path} does not exist.")
         
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
+        pdf_reader = PdfReader(file_path)
+        pages = pdf_reader.pages[start:stop]
         
-        return text.strip()
+        return [page.extract_text() or "" for page in pages]
     
     def create_document(self, file_path: str, text: str) -> Document:
         """Create a Document object with metadata.
@@ -212,221 +384,1863 @@ class PDFProcessor(DocumentProcessor):
         )
 
 
-class EmbeddingService:
-    """Service class for creating embeddings.
-    
-    This service manages the creation and configuration of OpenAI embeddings
-    for document vectorization. It implements lazy initialization to avoid
-    unnecessary API calls and provides a consistent interface for embedding
-    generation across the pipeline.
+class TextProcessor(DocumentProcessor):
+    """Processor for plain text files.
     
-    The service uses OpenAI's text-embedding-3-large model with 1024 dimensions
-    for high-quality document embeddings suitable for semantic search.
+    Also serves as the base for the other text-based processors: subclasses
+    only change how text is extracted and which file_type is recorded.
     
     Attributes:
-        config (Config): Configuration object containing API credentials
-        _embeddings (OpenAIEmbeddings): Cached embeddings instance
+        file_type (str): Document type recorded in the metadata
+        encoding (str): Encoding used to read files; undecodable bytes
+                        are replaced rather than failing the file
     """
     
-    def __init__(self, config: Config):
-        """Initialize the embedding service with configuration.
+    file_type = "txt"
+    
+    def __init__(self, encoding: str = "utf-8"):
+        """Initialize the processor.
         
         Args:
-            config (Config): Configuration object containing OpenAI API key
-                           and other necessary settings
+            encoding (str): Encoding used to read files
         """
-        self.config = config
-        self._embeddings = None
+        self.encoding = encoding
     
-    def get_embeddings(self) -> OpenAIEmbeddings:
-        """Get or create OpenAI embeddings instance.
+    def extract_text(self, file_path: str) -> str:
+        """Read a text file.
         
-        Implements lazy initialization pattern - creates the embeddings instance
-        only when first requested and caches it for subsequent calls. This
-        approach optimizes performance and resource usage.
+        Args:
+            file_path (str): Absolute path to the text file
+            
+        Returns:
+            str: File content with leading/trailing whitespace removed
+            
+        Raises:
+            FileNotFoundError: If the file doesn't exist at the specified path
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File {file_path} does not exist.")
+        
+        with open(file_path, encoding=self.encoding, errors="replace") as f:
+            return f.read().strip()
+    
+    def create_document(self, file_path: str, text: str) -> Document:
+        """Create a Document object with metadata.
         
+        Args:
+            file_path (str): Path to the source file
+            text (str): Extracted text content
+            
         Returns:
-            OpenAIEmbeddings: Configured OpenAI embeddings instance using
-                            text-embedding-3-large model with 1024 dimensions
-                            
-        Note:
-            The embeddings are cached after first creation to avoid
-            unnecessary reinitialization on repeated calls.
+            Document: LangChain Document object with the same metadata keys
+                     as PDFProcessor and this processor's file_type
         """
-        if self._embeddings is None:
-            self._embeddings = OpenAIEmbeddings(
-                model="text-embedding-3-large",
-                dimensions=1024,
-                openai_api_key=self.config.openai_api_key
-            )
-        return self._embeddings
+        return Document(
+            page_content=text,
+            metadata={
+                "source": file_path,
+                "created_at": os.path.getctime(file_path),
+                "created_by": "Data Ingestion Script",
+                "file_type": self.file_type
+            }
+        )
 
 
-class VectorStoreService:
-    """Service class for vector store operations.
-    
-    This service handles all interactions with the Pinecone vector database,
-    including document insertion and validation. It provides a clean interface
-    for storing vectorized documents and manages the connection to Pinecone
-    using the provided configuration.
+class CSVProcessor(TextProcessor):
+    """Processor for CSV files, streamed in batches of rows.
     
-    The service includes comprehensive input validation to ensure data integrity
-    and proper error handling for robust operation in production environments.
+    Rows are read one at a time and rendered as "column: value" lines, so
+    every chunk stays self-describing. Each batch of rows_per_page rows is
+    one page: large CSVs are split into row ranges and extracted in
+    parallel just like large PDFs, without loading the file up front.
+    Rows are counted and located by a raw byte scan of the lines, so
+    counting pages does not parse the file and each range is parsed once,
+    starting at its byte offset.
     
     Attributes:
-        config (Config): Configuration object containing Pinecone credentials
-                        and index information
+        rows_per_page (int): Rows rendered per page
     """
     
-    def __init__(self, config: Config):
-        """Initialize the vector store service with configuration.
+    file_type = "csv"
+    
+    def __init__(self, rows_per_page: int = 200, encoding: str = "utf-8"):
+        """Initialize the processor.
         
         Args:
-            config (Config): Configuration object containing Pinecone API key,
-                           index name, and other necessary settings
+            rows_per_page (int): Rows rendered per page
+            encoding (str): Encoding used to read files
         """
-        self.config = config
+        super().__init__(encoding)
+        self.rows_per_page = rows_per_page
     
-    def push_documents(self, documents: List[Document], embeddings: OpenAIEmbeddings, 
-                      index_name: Optional[str] = None) -> None:
-        """Push documents to Pinecone vector store.
-        
-        Validates inputs, creates a Pinecone vector store connection, and
-        adds the provided documents to the specified index. The documents
-        are automatically vectorized using the provided embeddings service.
+    def extract_text(self, file_path: str) -> str:
+        """Render all rows of a CSV file as text.
         
         Args:
-            documents (List[Document]): List of LangChain Document objects
-                                      to be stored in the vector database
-            embeddings (OpenAIEmbeddings): Configured embeddings service
-                                         for document vectorization
-            index_name (Optional[str]): Specific index name to use.
-                                      If None, uses the index from config
-                                      
-        Raises:
-            ValueError: If documents list is empty, embeddings is None,
-                       or no valid index name is available
-                       
-        Note:
-            The function prints a success message indicating the number
-            of documents successfully stored in Pinecone.
+            file_path (str): Absolute path to the CSV file
+            
+        Returns:
+            str: Rendered rows, separated by blank lines
         """
-        self._validate_inputs(documents, embeddings, index_name)
-        
-        actual_index_name = index_name or self.config.pinecone_index_name
-        
-        vector_store = PineconeVectorStore(
-            index_name=actual_index_name,
-            embedding=embeddings,
-            pinecone_api_key=self.config.pinecone_api_key,
-        )
-        
-        vector_store.add_documents(documents)
-        print(f"Successfully pushed {len(documents)} documents to Pinecone.")
+        return "\n\n".join(self.extract_pages(file_path)).strip()
     
-    def _validate_inputs(self, documents: List[Document], embeddings: OpenAIEmbeddings, 
-                        index_name: Optional[str]) -> None:
-        """Validate input parameters.
-        
-        Performs comprehensive validation of all input parameters to ensure
-        they meet the requirements for successful vector store operations.
+    def count_pages(self, file_path: str) -> int:
+        """Count the row batches of a CSV file.
         
         Args:
-            documents (List[Document]): Documents list to validate
-            embeddings (OpenAIEmbeddings): Embeddings service to validate
-            index_name (Optional[str]): Index name to validate
+            file_path (str): Absolute path to the CSV file
             
-        Raises:
-            ValueError: If documents list is empty
-            ValueError: If embeddings is None
-            ValueError: If no valid index name is available (neither provided
-                       nor configured in environment)
+        Returns:
+            int: Number of pages of rows_per_page rows
         """
-        if not documents:
-            raise ValueError("Documents list cannot be empty.")
+        rows = sum(1 for _ in self._row_offsets(file_path)) - 1
+        return max(1, -(-rows // self.rows_per_page))
+    
+    def extract_pages(self, file_path: str, start: int = 0, 
+                      stop: Optional[int] = None) -> List[str]:
+        """Render a range of row batches.
         
-        if embeddings is None:
-            raise ValueError("Embeddings must be provided.")
+        Args:
+            file_path (str): Absolute path to the CSV file
+            start (int): Index of the first page to extract
+            stop (Optional[int]): Index one past the last page to extract.
+                                If None, extracts through the last page
+            
+        Returns:
+            List[str]: Rendered rows, one entry per page
+        """
+        first = start * self.rows_per_page
+        count = None if stop is None else (stop - start) * self.rows_per_page
+        
+        pages = []
+        page = []
+        for row in islice(self._rows(file_path, first), count):
+            page.append("\n".join(f"{column}: {value}" for column, value in row.items()))
+            if len(page) == self.rows_per_page:
+                pages.append("\n\n".join(page))
+                page = []
+        if page:
+            pages.append("\n\n".join(page))
+        
+        return pages
+    
+    def _rows(self, file_path: str, first: int = 0) -> Iterator[dict]:
+        """Stream the rows of a CSV file from row index first, as dicts keyed by column name."""
+        offset = next(islice(self._row_offsets(file_path), first + 1, None), None)
+        if offset is None:
+            return
+        
+        with open(file_path, encoding=self.encoding, errors="replace", newline="") as f:
+            header = next(csv.reader(f))
+        
+        with open(file_path, "rb") as f:
+            f.seek(offset)
+            text = io.TextIOWrapper(f, encoding=self.encoding, errors="replace", newline="")
+            yield from csv.DictReader(text, fieldnames=header)
+    
+    def _row_offsets(self, file_path: str) -> Iterator[int]:
+        """Yield the byte offset of every record, the header first.
         
-        if not index_name and not self.config.pinecone_index_name:
-            raise ValueError("Index name must be provided or set in environment variables.")
+        Scans raw lines without parsing them: a newline ends a record unless
+        it follows an odd number of quotes, i.e. is inside a quoted field.
+        Blank lines are skipped, as csv.DictReader skips them.
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"CSV file {file_path} does not exist.")
+        
+        offset = 0
+        quoted = False
+        
+        with open(file_path, "rb") as f:
+            for line in f:
+                if not quoted and line not in (b"\n", b"\r\n"):
+                    yield offset
+                if line.count(b'"') % 2:
+                    quoted = not quoted
+                offset += len(line)
 
 
-class DocumentIngestionPipeline:
-    """Main pipeline class for document ingestion.
+class _HTMLTextParser(HTMLParser):
+    """Collects the visible text of an HTML document."""
     
-    This class orchestrates the entire document ingestion process, from reading
-    files through processing and storing them in the vector database. It combines
-    all the service components and provides high-level methods for different
-    ingestion workflows.
+    SKIPPED_TAGS = {"script", "style", "noscript", "template"}
     
-    The pipeline supports both directory-based batch processing and individual
-    file processing, with comprehensive error handling and progress reporting.
-    It's designed to be flexible and extensible for different document types
-    and processing requirements.
+    def __init__(self):
+        super().__init__()
+        self.parts: List[str] = []
+        self._skipping = 0
     
-    Attributes:
-        config (Config): Configuration object with all necessary settings
-        processor (DocumentProcessor): Document processor for text extraction
-        embedding_service (EmbeddingService): Service for creating embeddings
-        vector_store_service (VectorStoreService): Service for vector operations
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED_TAGS:
+            self._skipping += 1
+    
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED_TAGS and self._skipping:
+            self._skipping -= 1
+    
+    def handle_data(self, data):
+        if not self._skipping and data.strip():
+            self.parts.append(data.strip())
+
+
+class HTMLProcessor(TextProcessor):
+    """Processor for HTML files.
+    
+    Uses the standard library HTML parser to keep only visible text,
+    dropping scripts and styles, which is much faster than a full DOM.
     """
     
-    def __init__(self, config: Optional[Config] = None):
-        """Initialize the document ingestion pipeline.
-        
-        Sets up all necessary services and components for document processing.
-        Uses default configuration if none provided, and initializes with
-        PDF processor as the default document handler.
+    file_type = "html"
+    
+    def extract_text(self, file_path: str) -> str:
+        """Extract the visible text of an HTML file.
         
         Args:
-            config (Optional[Config]): Configuration object. If None, creates
-                                     a new Config instance with default settings
+            file_path (str): Absolute path to the HTML file
+            
+        Returns:
+            str: Visible text, one text node per line
         """
-        self.config = config or Config()
-        self.processor = PDFProcessor()
-        self.embedding_service = EmbeddingService(self.config)
-        self.vector_store_service = VectorStoreService(self.config)
+        parser = _HTMLTextParser()
+        parser.feed(super().extract_text(file_path))
+        parser.close()
+        
+        return "\n".join(parser.parts)
+
+
+class ProcessorRegistry:
+    """Maps file extensions and MIME types to document processors.
     
-    def process_documents(self, file_paths: List[str]) -> List[Document]:
-        """Process a list of file paths into Document objects.
+    Files are looked up by extension first and by MIME type (guessed from
+    the file name) second, so e.g. ".htm" files reach the HTML processor
+    without being registered explicitly.
+    """
+    
+    def __init__(self):
+        self._by_extension: Dict[str, DocumentProcessor] = {}
+        self._by_mime_type: Dict[str, DocumentProcessor] = {}
+    
+    @classmethod
+    def default(cls) -> "ProcessorRegistry":
+        """Create a registry with the built-in PDF, text, CSV and HTML processors.
         
-        Iterates through the provided file paths, extracts text from each file,
-        and creates Document objects with metadata. Includes error handling
-        for individual files to ensure that processing failures don't stop
-        the entire batch.
+        Returns:
+            ProcessorRegistry: Registry with the default processors
+        """
+        registry = cls()
+        registry.register(PDFProcessor(), [".pdf"], ["application/pdf"])
+        registry.register(TextProcessor(), [".txt", ".md"], ["text/plain", "text/markdown"])
+        registry.register(CSVProcessor(), [".csv"], ["text/csv"])
+        registry.register(HTMLProcessor(), [".html", ".htm"], ["text/html"])
+        return registry
+    
+    def register(self, processor: DocumentProcessor, extensions: List[str],
+                 mime_types: Optional[List[str]] = None) -> None:
+        """Register a processor for extensions and MIME types.
         
         Args:
-            file_paths (List[str]): List of absolute file paths to process
-            
-        Returns:
-            List[Document]: List of successfully processed Document objects.
-                          May be shorter than input list if some files failed
-                          
-        Note:
-            Prints warnings for files that couldn't be processed and continues
-            with remaining files. Errors are logged but don't halt processing.
+            processor (DocumentProcessor): Processor to register
+            extensions (List[str]): Extensions including the dot, e.g. [".txt"]
+            mime_types (Optional[List[str]]): MIME types, e.g. ["text/plain"]
         """
-        documents = []
+        for extension in extensions:
+            self._by_extension[extension.lower()] = processor
+        for mime_type in mime_types or []:
+            self._by_mime_type[mime_type] = processor
+    
+    def get(self, file_path: str) -> Optional[DocumentProcessor]:
+        """Find the processor for a file.
         
-        for file_path in file_paths:
-            try:
-                text = self.processor.extract_text(file_path)
-                
-                if text:
-                    document = self.processor.create_document(file_path, text)
-                    documents.append(document)
-                else:
-                    print(f"Warning: No text extracted from {file_path}")
+        Args:
+            file_path (str): Path of the file
             
-            except Exception as e:
-                print(f"Error processing {file_path}: {e}")
-                continue
+        Returns:
+            Optional[DocumentProcessor]: Matching processor, or None
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension in self._by_extension:
+            return self._by_extension[extension]
         
-        return documents
+        mime_type, _ = mimetypes.guess_type(file_path)
+        return self._by_mime_type.get(mime_type)
     
-    def ingest_from_directory(self, directory_path: str, 
-                            file_extension: str = ".pdf") -> None:
+    def extensions(self) -> Tuple[str, ...]:
+        """Return the registered extensions.
+        
+        Returns:
+            Tuple[str, ...]: Registered extensions, including the dot
+        """
+        return tuple(self._by_extension)
+    
+    def mime_types(self) -> Tuple[str, ...]:
+        """Return the registered MIME types.
+        
+        Returns:
+            Tuple[str, ...]: Registered MIME types
+        """
+        return tuple(self._by_mime_type)
+
+
+@dataclass
+class ExtractionResult:
+    """Outcome of extracting text from a single file.
+    
+    Collected for every file the pipeline processes so that slow or failing
+    files can be identified after a run.
+    
+    Attributes:
+        file_path (str): Path of the processed file
+        text (str): Extracted text, empty if extraction failed
+        pages (int): Number of pages extracted
+        elapsed (float): Seconds spent extracting, summed across workers
+                        when the file was split into page ranges
+        error (Optional[str]): Error message if extraction failed
+    """
+    
+    file_path: str
+    text: str = ""
+    pages: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+def _extract_page_range(processor: DocumentProcessor, file_path: str, start: int = 0,
+                        stop: Optional[int] = None) -> Tuple[List[str], float]:
+    """Extract a range of pages and time it.
+    
+    Module-level so it can be pickled and run in a worker process.
+    
+    Args:
+        processor (DocumentProcessor): Processor used for extraction
+        file_path (str): Path of the file to extract
+        start (int): Index of the first page to extract
+        stop (Optional[int]): Index one past the last page, or None for all
+        
+    Returns:
+        Tuple[List[str], float]: Page texts and the seconds spent extracting them
+    """
+    started = time.perf_counter()
+    pages = processor.extract_pages(file_path, start, stop)
+    return pages, time.perf_counter() - started
+
+
+class DocumentChunker:
+    """Splits documents into overlapping chunks with deterministic ids.
+    
+    Whole documents are too long to embed as a single vector, so they are
+    split before upserting. Each chunk id is derived from the source path and
+    the chunk's position, which makes re-ingesting a file overwrite its
+    existing vectors instead of adding duplicates.
+    
+    Attributes:
+        splitter (RecursiveCharacterTextSplitter): Splitter used for chunking
+    """
+    
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 150):
+        """Initialize the chunker.
+        
+        Args:
+            chunk_size (int): Maximum chunk size in characters
+            chunk_overlap (int): Characters shared between neighbouring chunks
+        """
+        self.splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap
+        )
+    
+    def split_documents(self, documents: List[Document]) -> List[Document]:
+        """Split documents into chunks.
+        
+        Every chunk keeps its document's metadata and gains chunk_index and
+        chunk_id entries.
+        
+        Args:
+            documents (List[Document]): Documents to split
+            
+        Returns:
+            List[Document]: Chunks of all documents, in document order
+        """
+        chunks = []
+        
+        for document in documents:
+            source = document.metadata.get("source", "")
+            for index, text in enumerate(self.splitter.split_text(document.page_content)):
+                chunks.append(Document(
+                    page_content=text,
+                    metadata={
+                        **document.metadata,
+                        "chunk_index": index,
+                        "chunk_id": self.chunk_id(source, index)
+                    }
+                ))
+        
+        return chunks
+    
+    @staticmethod
+    def chunk_id(source: str, index: int) -> str:
+        """Build the deterministic id of a chunk.
+        
+        Args:
+            source (str): Source path of the chunk's document
+            index (int): Position of the chunk within the document
+            
+        Returns:
+            str: Stable id of the form <source hash>-<index>
+        """
+        return f"{DocumentChunker.source_key(source)}-{index:05d}"
+    
+    @staticmethod
+    def source_key(source: str) -> str:
+        """Build the id prefix shared by all chunks of a source.
+        
+        Args:
+            source (str): Source path of a document
+            
+        Returns:
+            str: Short hash of the source path
+        """
+        return hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+
+
+class NearDuplicateDetector:
+    """Detects exact and near-duplicate documents with MinHash and LSH.
+    
+    Each document is reduced to the set of its word shingles and summarized
+    by a MinHash signature, whose agreement rate estimates the Jaccard
+    similarity of two documents. Signatures are indexed in LSH bands so a new
+    document is only compared against candidates sharing at least one band.
+    Exact duplicates (same normalized text) are caught by a hash lookup first.
+    
+    Not thread-safe; check documents from a single thread.
+    
+    Attributes:
+        threshold (float): Estimated Jaccard similarity from which a document
+                          counts as a duplicate
+        num_perm (int): Number of MinHash permutations
+        shingle_size (int): Words per shingle
+        bands (int): Number of LSH bands
+        signatures (Dict[str, Tuple[str, List[int]]]): Text hash and signature
+                                                      of every indexed original
+        collapsed (List[dict]): Documents found to be duplicates, each with
+                               file, duplicate_of and similarity
+    """
+    
+    _PRIME = (1 << 61) - 1
+    
+    def __init__(self, threshold: float = 0.9, num_perm: int = 128,
+                 shingle_size: int = 5, seed: int = 1):
+        """Initialize the detector.
+        
+        Args:
+            threshold (float): Similarity from which documents are duplicates
+            num_perm (int): Number of MinHash permutations
+            shingle_size (int): Words per shingle
+            seed (int): Seed of the permutations; signatures are only
+                       comparable between detectors with the same seed
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands = self._choose_bands(threshold, num_perm)
+        self.signatures: Dict[str, Tuple[str, List[int]]] = {}
+        self.collapsed: List[dict] = []
+        
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randrange(1, self._PRIME), rng.randrange(0, self._PRIME)) for _ in range(num_perm)
+        ]
+        self._buckets: Dict[Tuple[int, tuple], List[str]] = {}
+        self._exact: Dict[str, str] = {}
+    
+    @staticmethod
+    def _choose_bands(threshold: float, num_perm: int) -> int:
+        """Pick the fewest LSH bands that miss at most 1% of pairs at the threshold."""
+        for bands in range(1, num_perm + 1):
+            if num_perm % bands:
+                continue
+            rows = num_perm // bands
+            if (1 - threshold ** rows) ** bands <= 0.01:
+                return bands
+        return num_perm
+    
+    def _words(self, text: str) -> List[str]:
+        return re.findall(r"\w+", text.lower())
+    
+    def text_hash(self, text: str) -> str:
+        """Hash the normalized text of a document.
+        
+        Args:
+            text (str): Document text
+            
+        Returns:
+            str: SHA-1 of the lower-cased words, ignoring punctuation and spacing
+        """
+        return hashlib.sha1(" ".join(self._words(text)).encode("utf-8")).hexdigest()
+    
+    def signature(self, text: str) -> List[int]:
+        """Compute the MinHash signature of a document.
+        
+        Args:
+            text (str): Document text
+            
+        Returns:
+            List[int]: num_perm minimum hash values
+        """
+        words = self._words(text)
+        size = self.shingle_size
+        shingles = {" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+        hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles]
+        
+        return [min((a * h + b) % self._PRIME for h in hashes) for a, b in self._permutations]
+    
+    @staticmethod
+    def similarity(first: List[int], second: List[int]) -> float:
+        """Estimate the Jaccard similarity of two documents from their signatures.
+        
+        Args:
+            first (List[int]): Signature of the first document
+            second (List[int]): Signature of the second document
+            
+        Returns:
+            float: Fraction of agreeing signature values
+        """
+        return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+    
+    def _band_keys(self, signature: List[int]) -> List[Tuple[int, tuple]]:
+        rows = self.num_perm // self.bands
+        return [(band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(self.bands)]
+    
+    def add(self, key: str, text_hash: str, signature: List[int]) -> None:
+        """Index a document as an original that later documents are compared to.
+        
+        Args:
+            key (str): Document key, e.g. its absolute path
+            text_hash (str): text_hash() of the document
+            signature (List[int]): signature() of the document
+        """
+        self.discard(key)
+        self.signatures[key] = (text_hash, signature)
+        self._exact.setdefault(text_hash, key)
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, []).append(key)
+    
+    def discard(self, key: str) -> None:
+        """Remove a document from the index, if present.
+        
+        Args:
+            key (str): Document key
+        """
+        if key not in self.signatures:
+            return
+        
+        text_hash, signature = self.signatures.pop(key)
+        if self._exact.get(text_hash) == key:
+            del self._exact[text_hash]
+        for band_key in self._band_keys(signature):
+            self._buckets[band_key].remove(key)
+    
+    def query(self, text_hash: str, signature: List[int]) -> Optional[Tuple[str, float]]:
+        """Find the indexed document most similar to a document, above the threshold.
+        
+        Args:
+            text_hash (str): text_hash() of the document
+            signature (List[int]): signature() of the document
+            
+        Returns:
+            Optional[Tuple[str, float]]: Key of the original and the estimated
+                                       similarity, or None if not a duplicate
+        """
+        if text_hash in self._exact:
+            return self._exact[text_hash], 1.0
+        
+        candidates = {key for band_key in self._band_keys(signature)
+                      for key in self._buckets.get(band_key, ())}
+        best = max(
+            ((key, self.similarity(signature, self.signatures[key][1])) for key in candidates),
+            key=lambda match: match[1],
+            default=None
+        )
+        
+        return best if best and best[1] >= self.threshold else None
+    
+    def check(self, key: str, text: str) -> Optional[Tuple[str, float]]:
+        """Check a document against the index, indexing it if it is an original.
+        
+        A document checked again under the same key (e.g. a changed file)
+        replaces its previous signature rather than matching it.
+        
+        Args:
+            key (str): Document key, e.g. its absolute path
+            text (str): Document text
+            
+        Returns:
+            Optional[Tuple[str, float]]: Key of the original and the estimated
+                                       similarity if the document is a duplicate,
+                                       otherwise None
+        """
+        self.discard(key)
+        text_hash = self.text_hash(text)
+        signature = self.signature(text)
+        match = self.query(text_hash, signature)
+        
+        if match:
+            self.collapsed.append({"file": key, "duplicate_of": match[0], "similarity": round(match[1], 3)})
+            return match
+        
+        self.add(key, text_hash, signature)
+        return None
+
+
+class EmbeddingService:
+    """Service class for creating embeddings.
+    
+    This service manages the creation and configuration of OpenAI embeddings
+    for document vectorization. It implements lazy initialization to avoid
+    unnecessary API calls and provides a consistent interface for embedding
+    generation across the pipeline.
+    
+    The service uses OpenAI's text-embedding-3-large model with 1024 dimensions
+    for high-quality document embeddings suitable for semantic search.
+    
+    Attributes:
+        config (Config): Configuration object containing API credentials
+        _embeddings (OpenAIEmbeddings): Cached embeddings instance
+    """
+    
+    def __init__(self, config: Config):
+        """Initialize the embedding service with configuration.
+        
+        Args:
+            config (Config): Configuration object containing OpenAI API key
+                           and other necessary settings
+        """
+        self.config = config
+        self._embeddings = None
+    
+    def get_embeddings(self) -> OpenAIEmbeddings:
+        """Get or create OpenAI embeddings instance.
+        
+        Implements lazy initialization pattern - creates the embeddings instance
+        only when first requested and caches it for subsequent calls. This
+        approach optimizes performance and resource usage.
+        
+        Returns:
+            OpenAIEmbeddings: Configured OpenAI embeddings instance using
+                            text-embedding-3-large model with 1024 dimensions
+                            
+        Note:
+            The embeddings are cached after first creation to avoid
+            unnecessary reinitialization on repeated calls.
+        """
+        if self._embeddings is None:
+            self._embeddings = OpenAIEmbeddings(
+                model="text-embedding-3-large",
+                dimensions=1024,
+                openai_api_key=self.config.openai_api_key
+            )
+        return self._embeddings
+
+
+class PrecomputedEmbeddings(Embeddings):
+    """Embeddings adapter that hands a vector store vectors computed earlier.
+    
+    Lets the streaming pipeline embed and upsert in separate stages while
+    still writing through the vector store's add_documents API. Vectors are
+    set per thread right before the store asks for them.
+    """
+    
+    def __init__(self):
+        self._local = threading.local()
+    
+    def set_vectors(self, vectors: List[List[float]]) -> None:
+        """Set the vectors returned by the next embed_documents call in this thread.
+        
+        Args:
+            vectors (List[List[float]]): One vector per text, in text order
+        """
+        self._local.vectors = vectors
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self._local.vectors
+        
+        if len(vectors) != len(texts):
+            raise ValueError(f"Expected {len(texts)} precomputed vectors, got {len(vectors)}.")
+        
+        return vectors
+    
+    def embed_query(self, text: str) -> List[float]:
+        raise NotImplementedError("PrecomputedEmbeddings only supports upserts.")
+
+
+class VectorStoreService:
+    """Service class for vector store operations.
+    
+    This service handles all interactions with the Pinecone vector database,
+    including document insertion and validation. It provides a clean interface
+    for storing vectorized documents and manages the connection to Pinecone
+    using the provided configuration.
+    
+    Documents are chunked before upserting and the chunks are sent in batches
+    of batch_size, each batch being one embedding request and one upsert.
+    Batches run concurrently on a thread pool, paced by a shared rate limiter
+    and retried with exponential backoff on failure.
+    
+    The service includes comprehensive input validation to ensure data integrity
+    and proper error handling for robust operation in production environments.
+    
+    Attributes:
+        config (Config): Configuration object containing Pinecone credentials
+                        and index information
+        chunker (DocumentChunker): Chunker applied before upserting
+        vector_store (Optional[VectorStore]): Store used instead of Pinecone,
+                                            e.g. an InMemoryVectorStore in tests
+        batch_size (int): Number of chunks embedded and upserted per request
+        max_concurrency (int): Number of batches in flight at once
+        max_retries (int): Retries per batch before giving up
+        rate_limiter (InMemoryRateLimiter): Limiter shared by all batches
+    """
+    
+    def __init__(self, config: Config, chunker: Optional[DocumentChunker] = None,
+                 vector_store: Optional[VectorStore] = None, batch_size: int = 64,
+                 max_concurrency: int = 4, requests_per_second: float = 2.0,
+                 max_retries: int = 3):
+        """Initialize the vector store service with configuration.
+        
+        Args:
+            config (Config): Configuration object containing Pinecone API key,
+                           index name, and other necessary settings
+            chunker (Optional[DocumentChunker]): Chunker applied before upserting.
+                                               If None, uses default chunk sizes
+            vector_store (Optional[VectorStore]): Store to write to instead of
+                                                 the configured Pinecone index
+            batch_size (int): Number of chunks per embedding/upsert request
+            max_concurrency (int): Maximum number of batches upserted concurrently
+            requests_per_second (float): Rate limit for batch requests
+            max_retries (int): Retries per failed batch, with exponential backoff
+        """
+        self.config = config
+        self.chunker = chunker or DocumentChunker()
+        self.vector_store = vector_store
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.rate_limiter = InMemoryRateLimiter(
+            requests_per_second=requests_per_second,
+            check_every_n_seconds=0.1,
+            max_bucket_size=max_concurrency,
+        )
+        self.precomputed_embeddings = PrecomputedEmbeddings()
+        self._embedded_stores: Dict[str, VectorStore] = {}
+        self._embedded_stores_lock = threading.Lock()
+    
+    def push_documents(self, documents: List[Document], embeddings: OpenAIEmbeddings, 
+                      index_name: Optional[str] = None,
+                      report: Optional["RunReport"] = None) -> List[str]:
+        """Chunk documents and push them to Pinecone vector store.
+        
+        Validates inputs, splits the documents into chunks and upserts the
+        chunks in batches (see upsert_chunks). The chunks are automatically
+        vectorized using the provided embeddings service.
+        
+        Args:
+            documents (List[Document]): List of LangChain Document objects
+                                      to be stored in the vector database
+            embeddings (OpenAIEmbeddings): Configured embeddings service
+                                         for document vectorization
+            index_name (Optional[str]): Specific index name to use.
+                                      If None, uses the index from config
+            report (Optional[RunReport]): Run report to add chunk, token and
+                                        vector counts and stage timings to
+                                      
+        Returns:
+            List[str]: Ids of the vectors written
+                                      
+        Raises:
+            ValueError: If documents list is empty, embeddings is None,
+                       or no valid index name is available
+                       
+        Note:
+            The function prints a success message indicating the number
+            of documents and chunks successfully stored in Pinecone.
+        """
+        self._validate_inputs(documents, embeddings, index_name)
+        
+        started = time.perf_counter()
+        chunks = self.chunker.split_documents(documents)
+        
+        if report:
+            report.add(chunks=len(chunks))
+            report.add_stage("chunk", started, len(chunks))
+        
+        started = time.perf_counter()
+        ids = self.upsert_chunks(chunks, embeddings, index_name, report)
+        
+        if report:
+            report.add_stage("upsert", started, len(ids))
+        
+        print(f"Successfully pushed {len(documents)} documents ({len(ids)} chunks) to the vector store.")
+        return ids
+    
+    def upsert_chunks(self, chunks: List[Document], embeddings: OpenAIEmbeddings,
+                      index_name: Optional[str] = None,
+                      report: Optional["RunReport"] = None) -> List[str]:
+        """Embed and upsert chunks in concurrent, rate-limited batches.
+        
+        Args:
+            chunks (List[Document]): Chunks produced by DocumentChunker
+            embeddings (OpenAIEmbeddings): Embeddings service for vectorization
+            index_name (Optional[str]): Specific index name to use.
+                                      If None, uses the index from config
+            report (Optional[RunReport]): Run report to add embedding token
+                                        and upserted vector counts to
+            
+        Returns:
+            List[str]: Ids of the vectors written, in chunk order
+            
+        Raises:
+            Exception: The last error of a batch that failed after all retries
+        """
+        vector_store = self._get_vector_store(embeddings, index_name)
+        batches = [chunks[i:i + self.batch_size] for i in range(0, len(chunks), self.batch_size)]
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            results = executor.map(lambda batch: self._upsert_batch(vector_store, batch, report), batches)
+            return [chunk_id for batch_ids in results for chunk_id in batch_ids]
+    
+    def _upsert_batch(self, vector_store: VectorStore, batch: List[Document],
+                      report: Optional["RunReport"] = None) -> List[str]:
+        """Upsert one batch, retrying with exponential backoff.
+        
+        Args:
+            vector_store (VectorStore): Store to write to
+            batch (List[Document]): Chunks to embed and upsert
+            report (Optional[RunReport]): Run report to add embedding token
+                                        and upserted vector counts to
+            
+        Returns:
+            List[str]: Ids of the vectors written
+            
+        Raises:
+            Exception: The last error if all attempts fail
+        """
+        ids = [chunk.metadata["chunk_id"] for chunk in batch]
+        written = self._with_retries(f"Upsert of {len(batch)} chunks",
+                                     lambda: vector_store.add_documents(batch, ids=ids))
+        
+        if report:
+            report.add(vectors_upserted=len(written),
+                       embedding_tokens=count_tokens([chunk.page_content for chunk in batch]))
+        return written
+    
+    def _with_retries(self, description: str, call: Callable[[], Any]) -> Any:
+        """Run one rate-limited request, retrying with exponential backoff.
+        
+        Args:
+            description (str): What the request does, for the retry message
+            call (Callable[[], Any]): The request
+            
+        Returns:
+            Any: The request's result
+            
+        Raises:
+            Exception: The last error if all attempts fail
+        """
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                return call()
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = 2 ** attempt
+                print(f"{description} failed ({e}), retrying in {delay}s...")
+                time.sleep(delay)
+    
+    @property
+    def embeds_on_upsert(self) -> bool:
+        """Whether the store embeds chunks itself, so precomputed vectors are not used.
+        
+        True for an injected vector_store, which writes through its own
+        embedding function and has no API for precomputed vectors.
+        """
+        return self.vector_store is not None
+    
+    def embed_batch(self, texts: List[str], embeddings: Embeddings) -> List[List[float]]:
+        """Embed one batch of texts, paced and retried like upserts.
+        
+        Args:
+            texts (List[str]): Texts to embed
+            embeddings (Embeddings): Embeddings service for vectorization
+            
+        Returns:
+            List[List[float]]: One vector per text, in text order
+            
+        Raises:
+            Exception: The last error if all attempts fail
+        """
+        return self._with_retries(f"Embedding of {len(texts)} chunks",
+                                  lambda: embeddings.embed_documents(texts))
+    
+    def upsert_embedded(self, batch: List[Document], vectors: Optional[List[List[float]]],
+                        index_name: Optional[str] = None) -> List[str]:
+        """Upsert chunks whose vectors were already computed.
+        
+        Reuses one store connection per index and retries like upsert_chunks.
+        Stores that embed on upsert (see embeds_on_upsert) take the chunks
+        without vectors, so they are embedded exactly once.
+        
+        Args:
+            batch (List[Document]): Chunks produced by DocumentChunker
+            vectors (Optional[List[List[float]]]): One vector per chunk, in
+                                                 chunk order; None if the
+                                                 store embeds on upsert
+            index_name (Optional[str]): Specific index name to use.
+                                      If None, uses the index from config
+            
+        Returns:
+            List[str]: Ids of the vectors written
+        """
+        if self.embeds_on_upsert:
+            return self._upsert_batch(self.vector_store, batch)
+        
+        key = index_name or self.config.pinecone_index_name
+        
+        with self._embedded_stores_lock:
+            if key not in self._embedded_stores:
+                self._embedded_stores[key] = self._get_vector_store(self.precomputed_embeddings, index_name)
+        
+        self.precomputed_embeddings.set_vectors(vectors)
+        return self._upsert_batch(self._embedded_stores[key], batch)
+    
+    def delete_vectors(self, ids: List[str], embeddings: OpenAIEmbeddings,
+                       index_name: Optional[str] = None,
+                       report: Optional["RunReport"] = None) -> None:
+        """Delete vectors by id.
+        
+        Args:
+            ids (List[str]): Ids of the vectors to delete
+            embeddings (OpenAIEmbeddings): Embeddings service of the store
+            index_name (Optional[str]): Specific index name to use.
+                                      If None, uses the index from config
+            report (Optional[RunReport]): Run report to add the count to
+        """
+        if not ids:
+            return
+        
+        for i in range(0, len(ids), self.batch_size):
+            self.rate_limiter.acquire()
+            self._get_vector_store(embeddings, index_name).delete(ids=ids[i:i + self.batch_size])
+        
+        if report:
+            report.add(vectors_deleted=len(ids))
+        
+        print(f"Deleted {len(ids)} vectors from the vector store.")
+    
+    def _get_vector_store(self, embeddings: OpenAIEmbeddings,
+                          index_name: Optional[str] = None) -> VectorStore:
+        """Return the injected store, the local store or the Pinecone index.
+        
+        Args:
+            embeddings (OpenAIEmbeddings): Embeddings service for vectorization
+            index_name (Optional[str]): Specific index name to use.
+                                      If None, uses the index from config
+            
+        Returns:
+            VectorStore: Store the chunks are written to
+        """
+        if self.vector_store is not None:
+            return self.vector_store
+        
+        if self.config.vector_backend == "local":
+            return LocalVectorStore(self.config.local_vector_store_path, embeddings,
+                                    index=self.config.local_vector_index)
+        
+        return PineconeVectorStore(
+            index_name=index_name or self.config.pinecone_index_name,
+            embedding=embeddings,
+            pinecone_api_key=self.config.pinecone_api_key,
+        )
+    
+    def _validate_inputs(self, documents: List[Document], embeddings: OpenAIEmbeddings, 
+                        index_name: Optional[str]) -> None:
+        """Validate input parameters.
+        
+        Performs comprehensive validation of all input parameters to ensure
+        they meet the requirements for successful vector store operations.
+        
+        Args:
+            documents (List[Document]): Documents list to validate
+            embeddings (OpenAIEmbeddings): Embeddings service to validate
+            index_name (Optional[str]): Index name to validate
+            
+        Raises:
+            ValueError: If documents list is empty
+            ValueError: If embeddings is None
+            ValueError: If no valid index name is available (neither provided
+                       nor configured in environment)
+        """
+        if not documents:
+            raise ValueError("Documents list cannot be empty.")
+        
+        if embeddings is None:
+            raise ValueError("Embeddings must be provided.")
+        
+        if not index_name and not self.config.pinecone_index_name and self.config.vector_backend == "pinecone":
+            raise ValueError("Index name must be provided or set in environment variables.")
+
+
+def _raise(error: Exception) -> None:
+    """os.walk error handler that propagates the error instead of skipping."""
+    raise error
+
+
+@dataclass
+class ManifestEntry:
+    """Manifest record of one ingested file.
+    
+    Attributes:
+        file_path (str): Absolute path of the file
+        size (int): File size in bytes when ingested
+        mtime (float): File modification time when ingested
+        content_hash (str): SHA-256 of the file content
+        vector_ids (List[str]): Ids of the vectors written for the file
+    """
+    
+    file_path: str
+    size: int
+    mtime: float
+    content_hash: str
+    vector_ids: List[str] = field(default_factory=list)
+
+
+class IngestionManifest:
+    """SQLite manifest of ingested files for incremental ingestion.
+    
+    Records, for every ingested file, its size, modification time, content
+    hash and the ids of the vectors written for it. On the next run only new
+    or changed files need to be extracted and embedded, and the vectors of
+    files that disappeared can be deleted. Size and mtime are checked first,
+    so unchanged files are never re-hashed. With near-duplicate detection,
+    the MinHash signatures of original documents and the original of every
+    collapsed duplicate are kept too, so duplicates are found across runs.
+    
+    Attributes:
+        path (str): Path of the SQLite database file
+    """
+    
+    def __init__(self, path: str):
+        """Open the manifest, creating the database if needed.
+        
+        Args:
+            path (str): Path of the SQLite database file
+        """
+        self.path = path
+        
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS files (
+                    file_path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    vector_ids TEXT NOT NULL
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS signatures (
+                    file_path TEXT PRIMARY KEY,
+                    text_hash TEXT,
+                    signature TEXT,
+                    duplicate_of TEXT
+                )"""
+            )
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one transaction and close it afterwards."""
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def get(self, file_path: str) -> Optional[ManifestEntry]:
+        """Look up the entry of a file.
+        
+        Args:
+            file_path (str): Path of the file
+            
+        Returns:
+            Optional[ManifestEntry]: The entry, or None if never ingested
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM files WHERE file_path = ?", (os.path.abspath(file_path),)
+            ).fetchone()
+        
+        return self._to_entry(row) if row else None
+    
+    def entries(self) -> List[ManifestEntry]:
+        """Return all entries of the manifest.
+        
+        Returns:
+            List[ManifestEntry]: Entries ordered by file path
+        """
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM files ORDER BY file_path").fetchall()
+        
+        return [self._to_entry(row) for row in rows]
+    
+    def record(self, entry: ManifestEntry) -> None:
+        """Insert or replace the entry of a file.
+        
+        Args:
+            entry (ManifestEntry): Entry to store
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                (entry.file_path, entry.size, entry.mtime, entry.content_hash,
+                 json.dumps(entry.vector_ids))
+            )
+    
+    def remove(self, file_path: str) -> None:
+        """Remove the entry of a file.
+        
+        Args:
+            file_path (str): Path of the file
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM files WHERE file_path = ?", (os.path.abspath(file_path),))
+            conn.execute("DELETE FROM signatures WHERE file_path = ?", (os.path.abspath(file_path),))
+    
+    def record_signature(self, file_path: str, text_hash: Optional[str] = None,
+                         signature: Optional[List[int]] = None,
+                         duplicate_of: Optional[str] = None) -> None:
+        """Store the MinHash signature of an original, or the original of a duplicate.
+        
+        Args:
+            file_path (str): Path of the file
+            text_hash (Optional[str]): Normalized text hash of an original
+            signature (Optional[List[int]]): MinHash signature of an original
+            duplicate_of (Optional[str]): Absolute path of the original, if
+                                        the file was collapsed as a duplicate
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO signatures VALUES (?, ?, ?, ?)",
+                (os.path.abspath(file_path), text_hash,
+                 json.dumps(signature) if signature else None, duplicate_of)
+            )
+    
+    def signatures(self) -> List[Tuple[str, str, List[int]]]:
+        """Return the signatures of all recorded originals.
+        
+        Returns:
+            List[Tuple[str, str, List[int]]]: (file path, text hash, signature)
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT file_path, text_hash, signature FROM signatures WHERE duplicate_of IS NULL"
+            ).fetchall()
+        
+        return [(file_path, text_hash, json.loads(signature)) for file_path, text_hash, signature in rows]
+    
+    def release_duplicates(self, file_paths: List[str], keep: Tuple[str, ...] = ()) -> List[str]:
+        """Forget the files recorded as duplicates of the given originals.
+        
+        Used when an original changes or disappears: its duplicates have no
+        vectors of their own, so they must be ingested again.
+        
+        Args:
+            file_paths (List[str]): Paths of the originals
+            keep (Tuple[str, ...]): Absolute paths of duplicates to keep,
+                                  e.g. those found by the current run
+            
+        Returns:
+            List[str]: Paths of the released duplicates
+        """
+        originals = [os.path.abspath(file_path) for file_path in file_paths]
+        released = []
+        
+        with self._connect() as conn:
+            for start in range(0, len(originals), 500):
+                batch = originals[start:start + 500]
+                released.extend(row[0] for row in conn.execute(
+                    f"SELECT file_path FROM signatures WHERE duplicate_of IN ({','.join('?' * len(batch))})",
+                    batch
+                ))
+            released = [file_path for file_path in released if file_path not in keep]
+            for file_path in released:
+                conn.execute("DELETE FROM files WHERE file_path = ?", (file_path,))
+                conn.execute("DELETE FROM signatures WHERE file_path = ?", (file_path,))
+        
+        return released
+    
+    def find_changed(self, file_paths: List[str]) -> List[ManifestEntry]:
+        """Find the files that are new or changed since they were recorded.
+        
+        Files whose size and mtime match their entry are unchanged. Otherwise
+        the content is hashed; if only the mtime moved (e.g. the file was
+        touched or copied), the entry is refreshed and the file is skipped.
+        
+        Args:
+            file_paths (List[str]): Paths of the files currently present
+            
+        Returns:
+            List[ManifestEntry]: Pending entries for new or changed files,
+                               in input order, carrying the current size,
+                               mtime and hash and the previously written
+                               vector ids (empty for new files)
+        """
+        pending = []
+        
+        for file_path in file_paths:
+            stat = os.stat(file_path)
+            entry = self.get(file_path)
+            
+            if entry and entry.size == stat.st_size and entry.mtime == stat.st_mtime:
+                continue
+            
+            current = ManifestEntry(
+                file_path=os.path.abspath(file_path),
+                size=stat.st_size,
+                mtime=stat.st_mtime,
+                content_hash=self.file_hash(file_path),
+                vector_ids=entry.vector_ids if entry else []
+            )
+            
+            if entry and entry.content_hash == current.content_hash:
+                self.record(current)
+                continue
+            
+            pending.append(current)
+        
+        return pending
+    
+    def find_removed(self, directory_path: str, file_extensions: Union[str, Tuple[str, ...]],
+                     file_paths: List[str], recursive: bool = False) -> List[ManifestEntry]:
+        """Find recorded files of a directory that no longer exist.
+        
+        Args:
+            directory_path (str): Directory that was scanned
+            file_extensions (Union[str, Tuple[str, ...]]): Extension(s) the
+                                                          scan was filtered by
+            file_paths (List[str]): Paths of the files currently present
+            recursive (bool): Whether subdirectories were scanned too
+            
+        Returns:
+            List[ManifestEntry]: Entries of the removed files
+        """
+        directory = os.path.abspath(directory_path)
+        present = {os.path.abspath(file_path) for file_path in file_paths}
+        
+        def in_scope(file_path: str) -> bool:
+            if recursive:
+                return file_path.startswith(directory + os.sep)
+            return os.path.dirname(file_path) == directory
+        
+        return [
+            entry for entry in self.entries()
+            if in_scope(entry.file_path)
+            and entry.file_path.lower().endswith(file_extensions)
+            and entry.file_path not in present
+        ]
+    
+    @staticmethod
+    def file_hash(file_path: str) -> str:
+        """Compute the SHA-256 of a file's content.
+        
+        Args:
+            file_path (str): Path of the file
+            
+        Returns:
+            str: Hex digest of the content
+        """
+        digest = hashlib.sha256()
+        
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        
+        return digest.hexdigest()
+    
+    @staticmethod
+    def _to_entry(row: tuple) -> ManifestEntry:
+        file_path, size, mtime, content_hash, vector_ids = row
+        return ManifestEntry(file_path, size, mtime, content_hash, json.loads(vector_ids))
+
+
+@dataclass
+class StageStats:
+    """Counters of one ingestion stage.
+    
+    Attributes:
+        name (str): Stage name
+        items (int): Items the stage has emitted (files or chunks)
+        busy (float): Seconds the stage spent working, excluding queue waits
+        errors (int): Items the stage failed on
+    """
+    
+    name: str
+    items: int = 0
+    busy: float = 0.0
+    errors: int = 0
+    
+    def throughput(self, elapsed: float) -> float:
+        """Items per second of wall time.
+        
+        Args:
+            elapsed (float): Wall time of the run in seconds
+            
+        Returns:
+            float: Throughput in items per second
+        """
+        return self.items / elapsed if elapsed > 0 else 0.0
+
+
+@dataclass
+class RunReport:
+    """Live report of an ingestion run.
+    
+    Counters are updated by every stage while the run is in progress, so
+    the report can be read (or streamed) at any time; they are guarded by
+    a lock because streaming stages update them from several threads.
+    
+    Attributes:
+        files_discovered (int): Files found by the directory walk / given
+        files_skipped (int): Files skipped as unchanged by the manifest
+        files_failed (int): Files whose extraction failed
+        files_duplicate (int): Files collapsed as near duplicates, not embedded
+        pages (int): Pages extracted
+        characters (int): Characters extracted
+        chunks (int): Chunks produced
+        embedding_tokens (int): Tokens sent to the embeddings API
+        vectors_upserted (int): Vectors written to the vector store
+        vectors_deleted (int): Stale or removed vectors deleted
+        duplicates (List[dict]): Collapsed files with their original and
+                                estimated similarity
+        stages (Dict[str, StageStats]): Items and busy time per stage
+        started (float): perf_counter value at the start of the run
+        finished (Optional[float]): perf_counter value at the end of the run
+    """
+    
+    files_discovered: int = 0
+    files_skipped: int = 0
+    files_failed: int = 0
+    files_duplicate: int = 0
+    pages: int = 0
+    characters: int = 0
+    chunks: int = 0
+    embedding_tokens: int = 0
+    vectors_upserted: int = 0
+    vectors_deleted: int = 0
+    duplicates: List[dict] = field(default_factory=list)
+    stages: Dict[str, StageStats] = field(
+        default_factory=lambda: {name: StageStats(name) for name in INGESTION_STAGES}
+    )
+    started: float = field(default_factory=time.perf_counter)
+    finished: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    
+    def add(self, **counters: int) -> None:
+        """Increment counters by name.
+        
+        Args:
+            **counters (int): Amounts to add, e.g. add(chunks=12, pages=3)
+        """
+        with self._lock:
+            for name, amount in counters.items():
+                setattr(self, name, getattr(self, name) + amount)
+    
+    def add_duplicate(self, collapsed: dict) -> None:
+        """Record a file collapsed as a duplicate.
+        
+        Args:
+            collapsed (dict): Entry of NearDuplicateDetector.collapsed
+        """
+        with self._lock:
+            self.files_duplicate += 1
+            self.duplicates.append(collapsed)
+    
+    def add_stage(self, name: str, started: float, items: int = 1, errors: int = 0) -> None:
+        """Add emitted items and the time since started to a stage.
+        
+        Args:
+            name (str): Stage name
+            started (float): perf_counter value when the work began
+            items (int): Items the work emitted
+            errors (int): Items the work failed on
+        """
+        with self._lock:
+            stage = self.stages[name]
+            stage.items += items
+            stage.errors += errors
+            stage.busy += time.perf_counter() - started
+    
+    def elapsed(self) -> float:
+        """Wall time of the run so far, or in total once finished.
+        
+        Returns:
+            float: Seconds since the run started
+        """
+        return (self.finished or time.perf_counter()) - self.started
+    
+    def finish(self) -> None:
+        """Mark the run as finished."""
+        self.finished = time.perf_counter()
+    
+    def to_dict(self) -> dict:
+        """Render the report with derived throughput figures.
+        
+        Returns:
+            dict: Counters, overall pages/s and chunks/s, and per stage the
+                 items, busy wall time, failures and items per busy second
+        """
+        elapsed = self.elapsed()
+        
+        with self._lock:
+            return {
+                "finished": self.finished is not None,
+                "elapsed_seconds": round(elapsed, 3),
+                "files_discovered": self.files_discovered,
+                "files_skipped": self.files_skipped,
+                "files_failed": self.files_failed,
+                "files_duplicate": self.files_duplicate,
+                "pages": self.pages,
+                "characters": self.characters,
+                "chunks": self.chunks,
+                "embedding_tokens": self.embedding_tokens,
+                "vectors_upserted": self.vectors_upserted,
+                "vectors_deleted": self.vectors_deleted,
+                "pages_per_second": round(self.pages / elapsed, 2) if elapsed else 0.0,
+                "chunks_per_second": round(self.chunks / elapsed, 2) if elapsed else 0.0,
+                "duplicates": list(self.duplicates),
+                "stages": {
+                    name: {
+                        "items": stage.items,
+                        "errors": stage.errors,
+                        "busy_seconds": round(stage.busy, 3),
+                        "items_per_second": round(stage.items / stage.busy, 2) if stage.busy else 0.0,
+                    }
+                    for name, stage in self.stages.items()
+                },
+            }
+    
+    def to_json(self) -> str:
+        """Render the report as JSON.
+        
+        Returns:
+            str: JSON document of to_dict()
+        """
+        return json.dumps(self.to_dict(), indent=2)
+
+
+class DocumentIngestionPipeline:
+    """Main pipeline class for document ingestion.
+    
+    This class orchestrates the entire document ingestion process, from reading
+    files through processing and storing them in the vector database. It combines
+    all the service components and provides high-level methods for different
+    ingestion workflows.
+    
+    The pipeline supports both directory-based batch processing and individual
+    file processing, with comprehensive error handling and progress reporting.
+    It's designed to be flexible and extensible for different document types
+    and processing requirements.
+    
+    Attributes:
+        config (Config): Configuration object with all necessary settings
+        processor (DocumentProcessor): Fallback processor for files that no
+                                      registered processor handles
+        registry (ProcessorRegistry): Processors by file extension / MIME type
+        embedding_service (EmbeddingService): Service for creating embeddings
+        vector_store_service (VectorStoreService): Service for vector operations
+        max_workers (int): Number of extraction processes (1 extracts in-process)
+        page_split_threshold (int): Page count from which a single file is
+                                   split into page ranges across workers
+        extraction_results (List[ExtractionResult]): Per-file timings and
+                                                    errors of the last run
+        manifest (Optional[IngestionManifest]): Manifest enabling incremental
+                                              ingestion, if configured
+        report (RunReport): Live report of the current or last run
+        report_path (Optional[str]): JSON lines file the report is streamed to
+        dedup_threshold (Optional[float]): Similarity from which documents are
+                                         collapsed as near duplicates, if enabled
+        summary_service (Optional[SummaryService]): Service precomputing document
+                                                  summaries, if enabled
+        metadata_extractor (Optional[Callable[[str], dict]]): Function deriving
+                                                            structured metadata
+                                                            from document text
+    """
+    
+    def __init__(self, config: Optional[Config] = None, max_workers: Optional[int] = 1,
+                 page_split_threshold: int = 200, manifest_path: Optional[str] = None,
+                 report_path: Optional[str] = None, dedup_threshold: Optional[float] = None,
+                 summary_service: Optional[SummaryService] = None,
+                 metadata_extractor: Optional[Callable[[str], dict]] = None):
+        """Initialize the document ingestion pipeline.
+        
+        Sets up all necessary services and components for document processing.
+        Uses default configuration if none provided, and initializes with
+        the built-in PDF, text, CSV and HTML processors, falling back to the
+        PDF processor for unregistered file types.
+        
+        Args:
+            config (Optional[Config]): Configuration object. If None, creates
+                                     a new Config instance with default settings
+            max_workers (Optional[int]): Number of worker processes used for
+                                       text extraction. 1 (default) extracts
+                                       sequentially in-process; None uses one
+                                       process per CPU core
+            page_split_threshold (int): In process-pool mode, files with at
+                                      least this many pages are split into
+                                      page ranges extracted in parallel
+            manifest_path (Optional[str]): Path of the SQLite ingestion manifest.
+                                         If set, runs only ingest new or changed
+                                         files and delete vectors of removed ones
+            report_path (Optional[str]): If set, run report snapshots are
+                                       appended to this file as JSON lines
+                                       during each run and at its end
+            dedup_threshold (Optional[float]): If set, documents whose estimated
+                                             Jaccard similarity to an already
+                                             ingested document reaches this
+                                             value are not embedded or stored
+            summary_service (Optional[SummaryService]): If set, every document
+                                                      is summarized before chunking
+                                                      and the summary is stored in
+                                                      its chunks' metadata
+            metadata_extractor (Optional[Callable[[str], dict]]): If set, called
+                                                                with each document's
+                                                                text; the returned
+                                                                fields are added to
+                                                                its chunks' metadata
+                                                                (e.g. extract_resume_metadata)
+        """
+        self.config = config or Config()
+        self.processor = PDFProcessor()
+        self.registry = ProcessorRegistry.default()
+        self.embedding_service = EmbeddingService(self.config)
+        self.vector_store_service = VectorStoreService(self.config)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.page_split_threshold = page_split_threshold
+        self.extraction_results: List[ExtractionResult] = []
+        self.manifest = IngestionManifest(manifest_path) if manifest_path else None
+        self.report = RunReport()
+        self.report_path = report_path
+        self.dedup_threshold = dedup_threshold
+        self.summary_service = summary_service
+        self.metadata_extractor = metadata_extractor
+    
+    def processor_for(self, file_path: str) -> DocumentProcessor:
+        """Select the processor for a file.
+        
+        Args:
+            file_path (str): Path of the file
+            
+        Returns:
+            DocumentProcessor: Registered processor for the file's type,
+                             or the fallback processor
+        """
+        return self.registry.get(file_path) or self.processor
+    
+    def discover_files(self, directory_path: str,
+                       file_extension: Optional[Union[str, Tuple[str, ...]]] = None,
+                       recursive: bool = False) -> Iterator[str]:
+        """Lazily list the files of a directory that should be ingested.
+        
+        Args:
+            directory_path (str): Directory to walk
+            file_extension (Optional[Union[str, Tuple[str, ...]]]): Extension(s)
+                to include. If None, includes every registered extension
+            recursive (bool): Whether to descend into subdirectories
+            
+        Yields:
+            str: Paths of the matching files, in walk order
+            
+        Raises:
+            OSError: If a directory cannot be listed, so that its files are
+                    never mistaken for removed ones
+        """
+        extensions = self._extensions(file_extension)
+        
+        for root, dirs, files in os.walk(directory_path, onerror=_raise):
+            dirs.sort()
+            for file in sorted(files):
+                if file.lower().endswith(extensions):
+                    yield os.path.join(root, file)
+            if not recursive:
+                return
+    
+    def _extensions(self, file_extension: Optional[Union[str, Tuple[str, ...]]]) -> Tuple[str, ...]:
+        """Normalize an extension filter to a lower-case tuple."""
+        if file_extension is None:
+            return self.registry.extensions()
+        if isinstance(file_extension, str):
+            return (file_extension.lower(),)
+        return tuple(extension.lower() for extension in file_extension)
+    
+    def extract_files(self, file_paths: List[str]) -> List[ExtractionResult]:
+        """Extract text from files, in parallel when max_workers > 1.
+        
+        With a single worker, files are extracted one after another in the
+        current process. Otherwise extraction runs in a process pool, one task
+        per file, except that files with at least page_split_threshold pages
+        are split into one page range per worker so a single large PDF does
+        not serialize the run. Each file is handled by the processor registered
+        for its type. Failures are captured per file.
+        
+        Args:
+            file_paths (List[str]): List of absolute file paths to extract
+            
+        Returns:
+            List[ExtractionResult]: One result per input file, in input order
+        """
+        if self.max_workers == 1:
+            return [self._collect(file_path, [(_extract_page_range, (self.processor_for(file_path), file_path))])
+                    for file_path in file_paths]
+        
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            submitted = [
+                (file_path, [executor.submit(_extract_page_range, self.processor_for(file_path),
+                                             file_path, start, stop)
+                             for start, stop in self._page_ranges(file_path)])
+                for file_path in file_paths
+            ]
+            return [self._collect(file_path, [(future.result, ()) for future in futures])
+                    for file_path, futures in submitted]
+    
+    def _page_ranges(self, file_path: str) -> List[Tuple[int, Optional[int]]]:
+        """Split a file into page ranges, one per worker for large files.
+        
+        Args:
+            file_path (str): Path of the file to split
+            
+        Returns:
+            List[Tuple[int, Optional[int]]]: (start, stop) page ranges. A single
+                                           (0, None) range for files below the
+                                           split threshold or that can't be counted
+        """
+        try:
+            page_count = self.processor_for(file_path).count_pages(file_path)
+        except Exception:
+            return [(0, None)]
+        
+        if page_count < self.page_split_threshold:
+            return [(0, None)]
+        
+        step = -(-page_count // self.max_workers)
+        return [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    
+    @staticmethod
+    def _collect(file_path: str, parts: list) -> ExtractionResult:
+        """Assemble the page ranges of one file into an ExtractionResult.
+        
+        Args:
+            file_path (str): Path of the extracted file
+            parts (list): (callable, args) pairs each returning the page texts
+                         and elapsed seconds of one range, in page order
+            
+        Returns:
+            ExtractionResult: Joined text and timing, or the captured error
+        """
+        pages: List[str] = []
+        elapsed = 0.0
+        
+        try:
+            for call, args in parts:
+                part_pages, part_elapsed = call(*args)
+                pages.extend(part_pages)
+                elapsed += part_elapsed
+        except Exception as e:
+            return ExtractionResult(file_path=file_path, elapsed=elapsed, error=str(e))
+        
+        return ExtractionResult(
+            file_path=file_path,
+            text="\n".join(pages).strip(),
+            pages=len(pages),
+            elapsed=elapsed,
+        )
+    
+    def process_documents(self, file_paths: List[str]) -> List[Document]:
+        """Process a list of file paths into Document objects.
+        
+        Extracts text from the provided file paths (see extract_files) and
+        creates Document objects with metadata. Includes error handling
+        for individual files to ensure that processing failures don't stop
+        the entire batch. Per-file timings are printed and kept in
+        extraction_results.
+        
+        Args:
+            file_paths (List[str]): List of absolute file paths to process
+            
+        Returns:
+            List[Document]: List of successfully processed Document objects.
+                          May be shorter than input list if some files failed
+                          
+        Note:
+            Prints warnings for files that couldn't be processed and continues
+            with remaining files. Errors are logged but don't halt processing.
+        """
+        documents = []
+        started = time.perf_counter()
+        self.extraction_results = self.extract_files(file_paths)
+        
+        failed = sum(1 for result in self.extraction_results if result.error)
+        self.report.add(
+            files_failed=failed,
+            pages=sum(result.pages for result in self.extraction_results),
+            characters=sum(len(result.text) for result in self.extraction_results)
+        )
+        self.report.add_stage("extract", started, len(file_paths) - failed, failed)
+        
+        for result in self.extraction_results:
+            if result.error:
+                print(f"Error processing {result.file_path}: {result.error}")
+                continue
+            
+            print(f"Extracted {result.pages} pages from {result.file_path} in {result.elapsed:.2f}s")
+            
+            if result.text:
+                document = self.processor_for(result.file_path).create_document(result.file_path, result.text)
+                documents.append(document)
+            else:
+                print(f"Warning: No text extracted from {result.file_path}")
+        
+        print(f"Extracted {len(file_paths) - failed}/{len(file_paths)} files with "
+              f"{self.max_workers} worker(s) in {time.perf_counter() - started:.2f}s.")
+        
+        return documents
+    
+    def duplicate_detector(self) -> Optional[NearDuplicateDetector]:
+        """Create the near-duplicate detector of a run.
+        
+        With a manifest, the detector is seeded with the signatures of the
+        originals ingested by earlier runs.
+        
+        Returns:
+            Optional[NearDuplicateDetector]: The detector, or None if dedup_threshold
+                                           is not set
+        """
+        if self.dedup_threshold is None:
+            return None
+        
+        detector = NearDuplicateDetector(self.dedup_threshold)
+        
+        if self.manifest:
+            for file_path, text_hash, signature in self.manifest.signatures():
+                detector.add(file_path, text_hash, signature)
+        
+        return detector
+    
+    def collapse_duplicates(self, documents: List[Document],
+                            detector: Optional[NearDuplicateDetector]) -> List[Document]:
+        """Drop documents that duplicate an earlier document or ingested file.
+        
+        Args:
+            documents (List[Document]): Extracted documents, in input order
+            detector (Optional[NearDuplicateDetector]): Detector of the run;
+                                                      None keeps all documents
+            
+        Returns:
+            List[Document]: The documents that are not duplicates
+        """
+        if not detector:
+            return documents
+        
+        started = time.perf_counter()
+        originals = []
+        
+        for document in documents:
+            source = os.path.abspath(document.metadata["source"])
+            match = detector.check(source, document.page_content)
+            if match:
+                print(f"Skipping {document.metadata['source']}: duplicate of {match[0]} "
+                      f"(similarity {match[1]:.2f})")
+                self.report.add_duplicate(detector.collapsed[-1])
+            else:
+                originals.append(document)
+        
+        self.report.add_stage("dedup", started, len(originals), 0)
+        print(f"Collapsed {len(documents) - len(originals)} duplicate documents, "
+              f"{len(originals)} left to embed.")
+        
+        return originals
+    
+    def extract_metadata(self, documents: List[Document]) -> None:
+        """Add structured metadata to each document, if enabled.
+        
+        Every chunk inherits the fields, so the vector store can filter on
+        them. Values must be strings, numbers, booleans or lists of strings.
+        
+        Args:
+            documents (List[Document]): Documents to enrich in place
+            
+        Note:
+            Documents whose extraction fails are ingested without the fields.
+        """
+        if not self.metadata_extractor:
+            return
+        
+        for document in documents:
+            try:
+                document.metadata.update(self.metadata_extractor(document.page_content))
+            except Exception as e:
+                print(f"Warning: Metadata extraction failed for {document.metadata.get('source')}: {e}")
+    
+    def summarize_documents(self, documents: List[Document]) -> None:
+        """Store a summary of each document in its metadata, if enabled.
+        
+        The summary and the model that wrote it are kept in the "summary"
+        and "summary_model" metadata, which every chunk inherits. Summaries
+        are generated concurrently and cached by the summary service.
+        
+        Args:
+            documents (List[Document]): Documents to summarize in place
+            
+        Note:
+            A failed summarization is reported and the documents are ingested
+            without summaries; the UI then summarizes them on demand.
+        """
+        if not self.summary_service or not documents:
+            return
+        
+        try:
+            summaries = self.summary_service.summarize_many(documents)
+        except Exception as e:
+            print(f"Warning: Summarizing {len(documents)} documents failed: {e}")
+            return
+        
+        for document, summary in zip(documents, summaries):
+            document.metadata["summary"] = summary
+            document.metadata["summary_model"] = self.summary_service.model
+    
+    @contextmanager
+    def _reporting(self):
+        """Start a fresh run report and emit it when the run ends, even on errors."""
+        self.report = RunReport()
+        try:
+            yield self.report
+        finally:
+            self.report.finish()
+            self.emit_report()
+            print(self.report.to_json())
+    
+    def emit_report(self) -> None:
+        """Append a snapshot of the run report to report_path, if configured."""
+        if not self.report_path:
+            return
+        
+        with open(self.report_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.report.to_dict()) + "\n")
+    
+    def ingest_from_directory(self, directory_path: str, 
+                            file_extension: Optional[Union[str, Tuple[str, ...]]] = ".pdf",
+                            recursive: bool = False) -> None:
         """Ingest all files with specified extension from a directory.
         
         Scans the specified directory for files matching the given extension,
@@ -436,8 +2250,11 @@ class DocumentIngestionPipeline:
         
         Args:
             directory_path (str): Absolute path to the directory containing files
-            file_extension (str): File extension to filter by (default: ".pdf").
-                                Must include the dot (e.g., ".pdf", ".txt")
+            file_extension (Optional[Union[str, Tuple[str, ...]]]): File extension(s)
+                to filter by (default: ".pdf"). Must include the dot
+                (e.g., ".pdf", ".txt"). If None, ingests every file type with a
+                registered processor, mixed types in a single pass
+            recursive (bool): Whether to include files in subdirectories
                                 
         Raises:
             FileNotFoundError: If the specified directory doesn't exist
@@ -447,31 +2264,32 @@ class DocumentIngestionPipeline:
         Note:
             Prints progress information including number of files found
             and completion status. All files are processed as a batch
-            for efficient vector store operations.
+            for efficient vector store operations. With a manifest, vectors
+            of files removed from the directory are deleted and unchanged
+            files are skipped. Nothing is deleted when no files are found.
         """
         if not os.path.exists(directory_path):
             raise FileNotFoundError(f"Directory {directory_path} does not exist.")
         
-        files = os.listdir(directory_path)
-        file_paths = [
-            os.path.join(directory_path, file)
-            for file in files if file.endswith(file_extension)
-        ]
-        
-        if not file_paths:
-            raise ValueError(f"No {file_extension} files found in {directory_path}.")
-        
-        print(f"Found {len(file_paths)} {file_extension} files in {directory_path}.")
-        
-        documents = self.process_documents(file_paths)
-        
-        if not documents:
-            raise ValueError("No documents were created from the files.")
-        
-        embeddings = self.embedding_service.get_embeddings()
-        self.vector_store_service.push_documents(documents, embeddings)
-        
-        print("Data ingestion completed successfully.")
+        with self._reporting() as report:
+            started = time.perf_counter()
+            extensions = self._extensions(file_extension)
+            file_paths = list(self.discover_files(directory_path, extensions, recursive))
+            report.add_stage("discover", started, len(file_paths))
+            
+            # Checked before pruning: an empty or unmounted directory must not
+            # delete every recorded vector
+            if not file_paths:
+                raise ValueError(f"No {'/'.join(extensions)} files found in {directory_path}.")
+            
+            if self.manifest:
+                self._delete_removed(
+                    self.manifest.find_removed(directory_path, extensions, file_paths, recursive)
+                )
+            
+            print(f"Found {len(file_paths)} {'/'.join(extensions)} files in {directory_path}.")
+            
+            self._ingest(file_paths)
     
     def ingest_files(self, file_paths: List[str]) -> None:
         """Ingest specific files.
@@ -490,33 +2308,191 @@ class DocumentIngestionPipeline:
             Each file in the list is processed individually, with error handling
             ensuring that failures in individual files don't stop the entire batch.
         """
+        with self._reporting():
+            self._ingest(file_paths)
+    
+    def _ingest(self, file_paths: List[str]) -> None:
+        """Process, embed and store files, skipping unchanged ones with a manifest.
+        
+        Args:
+            file_paths (List[str]): Paths of the files to ingest
+            
+        Raises:
+            ValueError: If no documents were successfully created from the files
+        """
+        pending: Dict[str, ManifestEntry] = {}
+        self.report.add(files_discovered=len(file_paths))
+        
+        if self.manifest:
+            pending = {entry.file_path: entry for entry in self.manifest.find_changed(file_paths)}
+            skipped = len(file_paths) - len(pending)
+            self.report.add(files_skipped=skipped)
+            file_paths = [fp for fp in file_paths if os.path.abspath(fp) in pending]
+            
+            print(f"{len(file_paths)} new or changed files, {skipped} unchanged files skipped.")
+            
+            if not file_paths:
+                print("Data ingestion completed successfully, nothing to update.")
+                return
+        
         documents = self.process_documents(file_paths)
+        self.emit_report()
         
         if not documents:
             raise ValueError("No documents were created from the files.")
         
+        detector = self.duplicate_detector()
+        documents = self.collapse_duplicates(documents, detector)
+        self.extract_metadata(documents)
+        self.summarize_documents(documents)
+        
         embeddings = self.embedding_service.get_embeddings()
-        self.vector_store_service.push_documents(documents, embeddings)
+        ids = []
+        if documents:
+            ids = self.vector_store_service.push_documents(documents, embeddings, report=self.report)
+        
+        if self.manifest:
+            self._record_ingested(pending, ids, embeddings, detector)
         
         print("Data ingestion completed successfully.")
     
-    def set_processor(self, processor: DocumentProcessor) -> None:
+    def _record_ingested(self, pending: Dict[str, ManifestEntry], ids: List[str],
+                         embeddings: OpenAIEmbeddings,
+                         detector: Optional[NearDuplicateDetector] = None) -> None:
+        """Record successfully extracted files and drop their stale vectors.
+        
+        Chunks beyond a changed file's new chunk count keep their old ids, so
+        they are deleted here; so are all vectors of a file that is now a
+        duplicate. Files that failed extraction are not recorded and will be
+        retried on the next run.
+        
+        Args:
+            pending (Dict[str, ManifestEntry]): Pending entries by absolute path
+            ids (List[str]): Ids written by this run
+            embeddings (OpenAIEmbeddings): Embeddings service of the store
+            detector (Optional[NearDuplicateDetector]): Detector of the run,
+                                                      whose signatures and
+                                                      duplicates are recorded
+        """
+        stale = []
+        # Chunk ids are derived from the source path as given, which may be relative
+        sources = {os.path.abspath(result.file_path): result.file_path
+                   for result in self.extraction_results if not result.error}
+        recorded = list(sources)
+        
+        if detector:
+            released = self.manifest.release_duplicates(recorded)
+            if released:
+                print(f"{len(released)} duplicates of changed files will be re-ingested on the next run.")
+            duplicates = {entry["file"]: entry["duplicate_of"] for entry in detector.collapsed}
+        
+        for file_path in recorded:
+            entry = pending[file_path]
+            prefix = DocumentChunker.source_key(sources[file_path]) + "-"
+            vector_ids = [vector_id for vector_id in ids if vector_id.startswith(prefix)]
+            
+            stale.extend(set(entry.vector_ids) - set(vector_ids))
+            self.manifest.record(replace(entry, vector_ids=vector_ids))
+            
+            if detector and file_path in duplicates:
+                self.manifest.record_signature(file_path, duplicate_of=duplicates[file_path])
+            elif detector and file_path in detector.signatures:
+                self.manifest.record_signature(file_path, *detector.signatures[file_path])
+        
+        self.vector_store_service.delete_vectors(sorted(stale), embeddings, report=self.report)
+    
+    def _delete_removed(self, removed: List[ManifestEntry]) -> None:
+        """Delete the vectors and manifest entries of removed files.
+        
+        Args:
+            removed (List[ManifestEntry]): Entries of files no longer present
+        """
+        if not removed:
+            return
+        
+        print(f"{len(removed)} files were removed since the last run.")
+        
+        embeddings = self.embedding_service.get_embeddings()
+        self.vector_store_service.delete_vectors(
+            [vector_id for entry in removed for vector_id in entry.vector_ids], embeddings,
+            report=self.report
+        )
+        
+        for entry in removed:
+            self.manifest.remove(entry.file_path)
+        
+        released = self.manifest.release_duplicates([entry.file_path for entry in removed])
+        if released:
+            print(f"{len(released)} duplicates of removed files were released for re-ingestion.")
+    
+    def stream_from_directory(self, directory_path: str,
+                              file_extension: Optional[Union[str, Tuple[str, ...]]] = ".pdf",
+                              recursive: bool = False, queue_size: int = 8,
+                              progress_interval: float = 5.0) -> dict:
+        """Ingest a directory through the bounded-memory streaming pipeline.
+        
+        Unlike ingest_from_directory, documents are never all held in memory:
+        discover, extract, chunk, embed and upsert run concurrently and are
+        connected by queues of at most queue_size items, so a slow stage
+        blocks the ones before it. Vectors are written while later files are
+        still being parsed. Honours max_workers and the manifest.
+        
+        Args:
+            directory_path (str): Path to the directory containing files
+            file_extension (Optional[Union[str, Tuple[str, ...]]]): File extension(s)
+                to filter by (default: ".pdf"). If None, every registered type
+            recursive (bool): Whether to include files in subdirectories
+            queue_size (int): Capacity of each queue between stages
+            progress_interval (float): Seconds between progress reports
+            
+        Returns:
+            dict: Per-stage StageStats keyed by stage name; the full run
+                 report is in self.report
+            
+        Raises:
+            FileNotFoundError: If the specified directory doesn't exist
+        """
+        if not os.path.exists(directory_path):
+            raise FileNotFoundError(f"Directory {directory_path} does not exist.")
+        
+        with self._reporting():
+            streaming = StreamingIngestion(self, queue_size=queue_size,
+                                           progress_interval=progress_interval)
+            return streaming.run(directory_path, self._extensions(file_extension), recursive)
+    
+    def set_processor(self, processor: DocumentProcessor,
+                      extensions: Optional[List[str]] = None,
+                      mime_types: Optional[List[str]] = None) -> None:
         """Set a custom document processor.
         
         Allows swapping the document processor to handle different file types
         or processing requirements. The processor must implement the
         DocumentProcessor interface.
         
+        With extensions (and optionally MIME types), the processor is
+        registered for those file types only and other types keep their
+        processors. Without them, it replaces every processor and handles
+        all files, as before the registry existed; the registered file types
+        stay registered, so discovery with no extension filter still finds them.
+        
         Args:
             processor (DocumentProcessor): New processor instance that implements
                                          the DocumentProcessor abstract class
+            extensions (Optional[List[str]]): Extensions to register it for,
+                                            including the dot (e.g. [".docx"])
+            mime_types (Optional[List[str]]): MIME types to register it for
                                          
         Example:
             pipeline = DocumentIngestionPipeline()
             custom_processor = CustomTextProcessor()
-            pipeline.set_processor(custom_processor)
+            pipeline.set_processor(custom_processor, extensions=[".log"])
         """
+        if extensions or mime_types:
+            self.registry.register(processor, extensions or [], mime_types)
+            return
+        
         self.processor = processor
+        self.registry.register(processor, list(self.registry.extensions()), list(self.registry.mime_types()))
     
     def get_statistics(self) -> dict:
         """Get statistics about the current configuration.
@@ -531,14 +2507,29 @@ class DocumentIngestionPipeline:
                 - embedding_dimensions: Dimensionality of the embeddings
                 - vector_store: Type of vector store being used
                 - index_name: Name of the vector store index
-                - processor_type: Class name of the current document processor
+                - processor_type: Class name of the fallback document processor
+                - registered_extensions: Extensions with a registered processor
+                - max_workers: Number of extraction worker processes
+                - upsert_batch_size: Chunks per embedding/upsert request
+                - upsert_concurrency: Upsert batches in flight at once
+                - dedup_threshold: Near-duplicate similarity threshold, or None
+                - run: RunReport.to_dict() of the current or last run - files
+                  discovered/skipped/failed/duplicate (with what was collapsed), pages, characters, chunks,
+                  embedding tokens, vectors upserted/deleted, pages/s,
+                  chunks/s and per-stage wall time and throughput
         """
         return {
             "embedding_model": "text-embedding-3-large",
             "embedding_dimensions": 1024,
-            "vector_store": "Pinecone",
+            "vector_store": "Local" if self.config.vector_backend == "local" else "Pinecone",
             "index_name": self.config.pinecone_index_name,
-            "processor_type": type(self.processor).__name__
+            "processor_type": type(self.processor).__name__,
+            "registered_extensions": list(self.registry.extensions()),
+            "max_workers": self.max_workers,
+            "upsert_batch_size": self.vector_store_service.batch_size,
+            "upsert_concurrency": self.vector_store_service.max_concurrency,
+            "dedup_threshold": self.dedup_threshold,
+            "run": self.report.to_dict()
         }
     
     @staticmethod
@@ -559,6 +2550,7 @@ class DocumentIngestionPipeline:
         3. Custom configuration setup
         4. Processing documents without immediate storage
         5. Using individual services independently
+        6. Writing to a local stand-in store instead of Pinecone
         
         Note:
             This is a static method meant for demonstration purposes.
@@ -588,12 +2580,460 @@ class DocumentIngestionPipeline:
         
         embeddings = embedding_service.get_embeddings()
         # vector_store_service.push_documents(documents, embeddings)
+        
+        # Example 6: Write to a local in-memory store instead of Pinecone
+        # from langchain_core.vectorstores import InMemoryVectorStore
+        # local_service = VectorStoreService(
+        #     custom_config, vector_store=InMemoryVectorStore(embeddings), batch_size=16
+        # )
+        # local_service.push_documents(documents, embeddings)
+
+
+_STOP = object()
+
+
+def _drain(q: queue.Queue) -> None:
+    """Discard every item currently in a queue."""
+    while True:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            return
+
+
+class StreamingIngestion:
+    """Staged, bounded-memory ingestion of a directory.
+    
+    Runs discover -> extract -> chunk -> embed -> upsert, each stage in its
+    own thread (upsert in max_concurrency threads, extraction optionally on
+    a process pool), connected by bounded queues. Full queues block the
+    producing stage, so memory holds at most a few queues' worth of items
+    regardless of corpus size. Progress and per-stage throughput are printed
+    every progress_interval seconds, and the pipeline's run report is kept
+    up to date (and streamed to its report_path) while the stages run.
+    
+    With a manifest, unchanged files are skipped during discovery, a file is
+    recorded once all of its chunks are upserted, and vectors of removed
+    files are deleted once the whole directory has been walked; files that
+    could not be checked count as present, and an incomplete walk deletes
+    nothing. With a dedup threshold, the chunk stage drops near-duplicate
+    files before splitting.
+    
+    Failed files and batches are counted and skipped. Any other error in a
+    stage (e.g. the manifest cannot be written) aborts the run: every stage
+    stops, the queues are drained and run() raises.
+    
+    Attributes:
+        pipeline (DocumentIngestionPipeline): Pipeline providing the services
+        queue_size (int): Capacity of each queue between stages
+        progress_interval (float): Seconds between progress reports
+        report (RunReport): The pipeline's report of the current run
+        stats (Dict[str, StageStats]): Counters per stage, shared with report
+    """
+    
+    def __init__(self, pipeline: "DocumentIngestionPipeline", queue_size: int = 8,
+                 progress_interval: float = 5.0):
+        """Initialize the streaming runner.
+        
+        Args:
+            pipeline (DocumentIngestionPipeline): Pipeline providing the processor,
+                                                services and manifest
+            queue_size (int): Capacity of each queue between stages
+            progress_interval (float): Seconds between progress reports
+        """
+        self.pipeline = pipeline
+        self.queue_size = queue_size
+        self.progress_interval = progress_interval
+        self.report = pipeline.report
+        self.stats = self.report.stages
+        self._lock = threading.Lock()
+        self._seen: List[str] = []
+        self._pending: Dict[str, ManifestEntry] = {}
+        self._remaining: Dict[str, int] = {}
+        self._file_ids: Dict[str, List[str]] = {}
+        self._failed = set()
+        self._embeddings = None
+        self._detector: Optional[NearDuplicateDetector] = None
+        self._duplicates: Dict[str, str] = {}
+        self._queues: Dict[str, queue.Queue] = {}
+        self._walk_complete = False
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+    
+    def run(self, directory_path: str, file_extensions: Tuple[str, ...] = (".pdf",),
+            recursive: bool = False) -> Dict[str, StageStats]:
+        """Run all stages to completion.
+        
+        Args:
+            directory_path (str): Directory to ingest
+            file_extensions (Tuple[str, ...]): File extensions to include
+            recursive (bool): Whether to include files in subdirectories
+            
+        Returns:
+            Dict[str, StageStats]: Counters per stage
+            
+        Raises:
+            RuntimeError: If a stage failed and the run was aborted
+        """
+        self._embeddings = self.pipeline.embedding_service.get_embeddings()
+        self._detector = self.pipeline.duplicate_detector()
+        upsert_workers = self.pipeline.vector_store_service.max_concurrency
+        
+        files, results, chunks, batches = (queue.Queue(maxsize=self.queue_size) for _ in range(4))
+        self._queues = {"files": files, "results": results, "chunks": chunks, "batches": batches}
+        
+        stages = [
+            (self._discover, (directory_path, file_extensions, recursive, files)),
+            (self._extract, (files, results)),
+            (self._chunk, (results, chunks)),
+            (self._embed, (chunks, batches, upsert_workers)),
+        ] + [(self._upsert, (batches,))] * upsert_workers
+        threads = [threading.Thread(target=self._run_stage, args=stage) for stage in stages]
+        
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        
+        alive = threads
+        last_report = started
+        while alive:
+            alive[0].join(max(0.0, last_report + self.progress_interval - time.perf_counter()))
+            alive = [thread for thread in threads if thread.is_alive()]
+            if alive and time.perf_counter() - last_report >= self.progress_interval:
+                last_report = time.perf_counter()
+                self._report(last_report - started)
+                self.pipeline.emit_report()
+        
+        # An empty walk (empty or unmounted directory) must not delete every recorded vector
+        if self.pipeline.manifest and self._walk_complete and self._seen and self._error is None:
+            self.pipeline._delete_removed(
+                self.pipeline.manifest.find_removed(directory_path, file_extensions, self._seen, recursive)
+            )
+        
+        self._report(time.perf_counter() - started, final=True)
+        
+        if self._error is not None:
+            raise RuntimeError(f"Streaming ingestion aborted: {self._error}") from self._error
+        return self.stats
+    
+    def _run_stage(self, stage: Callable, args: tuple) -> None:
+        """Run a stage in its thread, aborting the run if it raises."""
+        try:
+            stage(*args)
+        except Exception as e:
+            self._abort(e)
+    
+    def _abort(self, error: Exception) -> None:
+        """Stop every stage after a fatal error and unblock their queues."""
+        with self._lock:
+            if self._error is None:
+                self._error = error
+                print(f"Error in streaming ingestion, stopping all stages: {error!r}")
+        
+        self._stop.set()
+        for q in self._queues.values():
+            _drain(q)
+    
+    def _items(self, inbox: queue.Queue) -> Iterator:
+        """Yield queued items until the end marker, or until the run is aborted."""
+        while not self._stop.is_set():
+            try:
+                item = inbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _STOP:
+                return
+            yield item
+    
+    def _put(self, out: queue.Queue, item) -> None:
+        """Queue an item for the next stage; once the run is aborted, items are dropped."""
+        while not self._stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+    
+    def _stage(self, name: str, started: float, items: int = 1, errors: int = 0) -> None:
+        """Add emitted items, failures and busy time to a stage's counters."""
+        self.report.add_stage(name, started, items, errors)
+    
+    def _discover(self, directory_path: str, file_extensions: Tuple[str, ...],
+                  recursive: bool, out: queue.Queue) -> None:
+        """Walk the directory lazily and queue new or changed files.
+        
+        A file that cannot be stat-ed or hashed is counted as failed but
+        still as present. If the walk itself fails, the files found so far
+        are ingested and removed files are not deleted.
+        """
+        manifest = self.pipeline.manifest
+        
+        try:
+            started = time.perf_counter()
+            for file_path in self.pipeline.discover_files(directory_path, file_extensions, recursive):
+                if self._stop.is_set():
+                    return
+                
+                self._seen.append(file_path)
+                self.report.add(files_discovered=1)
+                
+                if manifest:
+                    try:
+                        changed = manifest.find_changed([file_path])
+                    except OSError as e:
+                        print(f"Error checking {file_path}: {e}")
+                        self.report.add(files_failed=1)
+                        self._stage("discover", started, 0, errors=1)
+                        started = time.perf_counter()
+                        continue
+                    if not changed:
+                        self.report.add(files_skipped=1)
+                        continue
+                    self._pending[changed[0].file_path] = changed[0]
+                
+                self._stage("discover", started)
+                self._put(out, file_path)
+                started = time.perf_counter()
+            self._walk_complete = True
+        except OSError as e:
+            print(f"Error walking {directory_path}: {e}. Removed files will not be deleted in this run.")
+        finally:
+            self._put(out, _STOP)
+    
+    def _extract(self, inbox: queue.Queue, out: queue.Queue) -> None:
+        """Extract queued files, keeping at most max_workers files in flight."""
+        pipeline = self.pipeline
+        
+        def emit(file_path: str, parts: list, started: float) -> None:
+            result = pipeline._collect(file_path, parts)
+            if result.error:
+                print(f"Error processing {file_path}: {result.error}")
+                self.report.add(files_failed=1)
+                self._stage("extract", started, 0, errors=1)
+            else:
+                self.report.add(pages=result.pages, characters=len(result.text))
+                self._stage("extract", started)
+            self._put(out, result)
+        
+        try:
+            if pipeline.max_workers == 1:
+                for file_path in self._items(inbox):
+                    started = time.perf_counter()
+                    emit(file_path, [(_extract_page_range, (pipeline.processor_for(file_path), file_path))], started)
+                return
+            
+            in_flight = deque()
+            with ProcessPoolExecutor(max_workers=pipeline.max_workers) as executor:
+                for file_path in self._items(inbox):
+                    futures = [executor.submit(_extract_page_range, pipeline.processor_for(file_path),
+                                               file_path, start, stop)
+                               for start, stop in pipeline._page_ranges(file_path)]
+                    in_flight.append((file_path, futures, time.perf_counter()))
+                    
+                    while len(in_flight) >= pipeline.max_workers:
+                        file_path, futures, started = in_flight.popleft()
+                        emit(file_path, [(future.result, ()) for future in futures], started)
+                
+                while in_flight and not self._stop.is_set():
+                    file_path, futures, started = in_flight.popleft()
+                    emit(file_path, [(future.result, ()) for future in futures], started)
+        finally:
+            self._put(out, _STOP)
+    
+    def _chunk(self, inbox: queue.Queue, out: queue.Queue) -> None:
+        """Drop duplicate files and turn the others into chunks, registering their chunk ids."""
+        pipeline = self.pipeline
+        chunker = pipeline.vector_store_service.chunker
+        
+        try:
+            for result in self._items(inbox):
+                if result.error:
+                    continue
+                
+                if not result.text:
+                    print(f"Warning: No text extracted from {result.file_path}")
+                    self._file_done(result.file_path, [])
+                    continue
+                
+                if self._detector and self._is_duplicate(result):
+                    self._file_done(result.file_path, [])
+                    continue
+                
+                started = time.perf_counter()
+                
+                try:
+                    document = pipeline.processor_for(result.file_path).create_document(result.file_path, result.text)
+                    pipeline.extract_metadata([document])
+                    pipeline.summarize_documents([document])
+                    file_chunks = chunker.split_documents([document])
+                except Exception as e:
+                    print(f"Error chunking {result.file_path}: {e}")
+                    self._stage("chunk", started, 0, errors=1)
+                    continue
+                
+                with self._lock:
+                    self._remaining[result.file_path] = len(file_chunks)
+                    self._file_ids[result.file_path] = [c.metadata["chunk_id"] for c in file_chunks]
+                
+                self.report.add(chunks=len(file_chunks))
+                self._stage("chunk", started, len(file_chunks))
+                for chunk in file_chunks:
+                    self._put(out, chunk)
+        finally:
+            self._put(out, _STOP)
+    
+    def _is_duplicate(self, result: ExtractionResult) -> bool:
+        """Check an extracted file against the files seen so far."""
+        started = time.perf_counter()
+        file_path = os.path.abspath(result.file_path)
+        match = self._detector.check(file_path, result.text)
+        
+        if not match:
+            self._stage("dedup", started)
+            return False
+        
+        print(f"Skipping {result.file_path}: duplicate of {match[0]} (similarity {match[1]:.2f})")
+        self.report.add_duplicate(self._detector.collapsed[-1])
+        self._stage("dedup", started, 0)
+        with self._lock:
+            self._duplicates[file_path] = match[0]
+        return True
+    
+    def _embed(self, inbox: queue.Queue, out: queue.Queue, consumers: int) -> None:
+        """Group chunks into batches and embed each batch in one request.
+        
+        Requests are rate-limited and retried like upserts. For stores that
+        embed on upsert the batches are passed on without vectors.
+        """
+        batch_size = self.pipeline.vector_store_service.batch_size
+        batch: List[Document] = []
+        
+        service = self.pipeline.vector_store_service
+        
+        def flush() -> None:
+            started = time.perf_counter()
+            texts = [chunk.page_content for chunk in batch]
+            if service.embeds_on_upsert:
+                # The store embeds while upserting; embedding here would do it twice
+                self.report.add(embedding_tokens=count_tokens(texts))
+                self._put(out, (list(batch), None))
+                return
+            try:
+                vectors = service.embed_batch(texts, self._embeddings)
+            except Exception as e:
+                print(f"Embedding of {len(batch)} chunks failed: {e}")
+                self._batch_failed(batch, "embed", started)
+                return
+            self.report.add(embedding_tokens=count_tokens(texts))
+            self._stage("embed", started, len(batch))
+            self._put(out, (list(batch), vectors))
+        
+        try:
+            for chunk in self._items(inbox):
+                batch.append(chunk)
+                if len(batch) >= batch_size:
+                    flush()
+                    batch = []
+            if batch and not self._stop.is_set():
+                flush()
+        finally:
+            for _ in range(consumers):
+                self._put(out, _STOP)
+    
+    def _upsert(self, inbox: queue.Queue) -> None:
+        """Upsert embedded batches; several of these run concurrently.
+        
+        A failed upsert only fails its files. Errors while recording upserted
+        files (manifest, stale vector deletion) propagate and abort the run.
+        """
+        service = self.pipeline.vector_store_service
+        
+        for batch, vectors in self._items(inbox):
+            started = time.perf_counter()
+            try:
+                written = service.upsert_embedded(batch, vectors)
+            except Exception as e:
+                print(f"Upsert of {len(batch)} chunks failed: {e}")
+                self._batch_failed(batch, "upsert", started)
+                continue
+            
+            self.report.add(vectors_upserted=len(written))
+            self._stage("upsert", started, len(batch))
+            for chunk in batch:
+                self._chunk_done(chunk.metadata["source"])
+    
+    def _batch_failed(self, batch: List[Document], stage: str, started: float) -> None:
+        """Count a failed batch and keep its files out of the manifest."""
+        self._stage(stage, started, 0, errors=len(batch))
+        with self._lock:
+            self._failed.update(chunk.metadata["source"] for chunk in batch)
+    
+    def _chunk_done(self, file_path: str) -> None:
+        """Count an upserted chunk, finishing its file after the last one."""
+        with self._lock:
+            self._remaining[file_path] -= 1
+            if self._remaining[file_path] or file_path in self._failed:
+                return
+            del self._remaining[file_path]
+            ids = self._file_ids.pop(file_path)
+        
+        self._file_done(file_path, ids)
+    
+    def _file_done(self, file_path: str, ids: List[str]) -> None:
+        """Record a fully upserted file in the manifest and drop its stale vectors."""
+        manifest = self.pipeline.manifest
+        if not manifest:
+            return
+        
+        entry = self._pending[os.path.abspath(file_path)]
+        stale = sorted(set(entry.vector_ids) - set(ids))
+        
+        self.pipeline.vector_store_service.delete_vectors(stale, self._embeddings, report=self.report)
+        manifest.record(replace(entry, vector_ids=ids))
+        
+        if not self._detector:
+            return
+        
+        with self._lock:
+            duplicate_of = self._duplicates.get(entry.file_path)
+            keep = tuple(self._duplicates)
+        
+        if duplicate_of:
+            manifest.record_signature(entry.file_path, duplicate_of=duplicate_of)
+            return
+        
+        manifest.release_duplicates([entry.file_path], keep=keep)
+        if entry.file_path in self._detector.signatures:
+            manifest.record_signature(entry.file_path, *self._detector.signatures[entry.file_path])
+    
+    def _report(self, elapsed: float, final: bool = False) -> None:
+        """Print per-stage counts, throughput and queue depths."""
+        stages = " | ".join(
+            f"{stats.name} {stats.items} ({stats.throughput(elapsed):.1f}/s)"
+            + (f" {stats.errors} failed" if stats.errors else "")
+            for stats in list(self.stats.values())
+        )
+        
+        if final:
+            print(f"Streaming ingestion finished in {elapsed:.1f}s: {stages}")
+            return
+        
+        depths = " ".join(f"{name}={q.qsize()}" for name, q in self._queues.items())
+        print(f"[{elapsed:7.1f}s] {stages} | queued: {depths}")
 
 
 if __name__ == "__main__":
     try:
-        # Initialize the ingestion pipeline
-        pipeline = DocumentIngestionPipeline()
+        # Initialize the ingestion pipeline, extracting PDFs on all CPU cores
+        # and only re-ingesting files that changed since the last run; each
+        # run's report is appended to ingestion-report.jsonl. Re-uploaded or
+        # lightly edited resumes are collapsed instead of being embedded again,
+        # and experience, skills and titles are stored for filtered search
+        pipeline = DocumentIngestionPipeline(
+            max_workers=None, manifest_path="ingestion-manifest.sqlite",
+            report_path="ingestion-report.jsonl", dedup_threshold=0.9,
+            metadata_extractor=extract_resume_metadata
+        )
         
         # Define the directory path for PDF files
         directory_path = "../../sony-blr-agentic-ai-practices/lc-training-data/rag-docs"
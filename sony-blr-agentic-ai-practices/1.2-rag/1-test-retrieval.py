@@ -1,53 +1,10 @@
-import os
+from retrieval_service import get_retrieval_service
 
-from dotenv import load_dotenv
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain_pinecone import PineconeVectorStore
 
-load_dotenv()
+def search_similar_documents(query, no_of_results=3, index_name=None):
+    service = get_retrieval_service(index_name)
 
-openai_api_key = os.getenv("OPENAI_API_KEY")
-
-if not openai_api_key:
-    raise ValueError("OPENAI_API_KEY environment variable is not set.")
-
-pinecone_api_key = os.getenv("PINECONE_API_KEY")
-
-if not pinecone_api_key:
-    raise ValueError("PINECONE_API_KEY environment variable is not set.")
-
-pinecone_index_name = os.getenv("PINECONE_INDEX_NAME")
-
-if not pinecone_index_name:
-    raise ValueError("PINECONE_INDEX_NAME environment variable is not set.")
-
-
-def create_embeddings():
-    embeddings = OpenAIEmbeddings(
-        model="text-embedding-3-large",
-        dimensions=1024,
-        openai_api_key=openai_api_key
-    )
-
-    return embeddings
-
-
-def search_similar_documents(query, no_of_results=3, index_name=None, embeddings=None):
-    if query is None or query.strip() == "":
-        raise ValueError("Query must be a non-empty string.")
-
-    if index_name is None:
-        index_name = pinecone_index_name
-
-    if embeddings is None:
-        embeddings = create_embeddings()
-
-    vector_store = PineconeVectorStore(
-        index_name=pinecone_index_name,
-        embedding=embeddings
-    )
-
-    results = vector_store.similarity_search_with_score(query, k=no_of_results)
+    results = service.search_resumes(query, no_of_results)
 
     return results
 
@@ -61,11 +18,9 @@ if __name__ == "__main__":
         Understanding of Computer Architecture, User Interfacing Technologies and Programming Languages
     """
 
-    embeddings = create_embeddings()
     no_of_results = 3
 
-    results = search_similar_documents(
-        query, no_of_results, pinecone_index_name, embeddings)
+    results = search_similar_documents(query, no_of_results)
 
     print(f"Query: {query}")
     print(f"Number of results: {len(results)}")
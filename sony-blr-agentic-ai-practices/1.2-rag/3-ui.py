@@ -1,61 +1,39 @@
 import os
 import streamlit as st
 from dotenv import load_dotenv
-from langchain_pinecone import PineconeVectorStore
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain.chains.summarize import load_summarize_chain
 
+from retrieval_service import RetrievalService, vector_backend
+from summaries import SummaryCache, SummaryService, content_hash
 
-def create_embeddings():
-    openai_api_key = os.getenv("OPENAI_API_KEY")
 
-    if not openai_api_key:
-        raise ValueError("OPENAI_API_KEY environment variable is not set.")
+@st.cache_resource
+def load_retrieval_service(index_name):
+    # One store connection and embedding client per process, shared by all sessions
+    service = RetrievalService(index_name)
+    service.warm_up()
 
-    embeddings = OpenAIEmbeddings(
-        model="text-embedding-3-large",
-        dimensions=1024,
-        openai_api_key=openai_api_key
-    )
+    return service
 
-    return embeddings
 
+@st.cache_resource
+def load_summary_service():
+    # Summaries are cached per (source, content hash, model) across sessions and restarts
+    cache = SummaryCache(os.getenv("SUMMARY_CACHE", "summary-cache.sqlite"))
 
-def search_similar_documents(query, no_of_results=3, index_name=None, embeddings=None):
-    if query is None or query.strip() == "":
-        raise ValueError("Query must be a non-empty string.")
+    return SummaryService(cache=cache, max_concurrency=4)
 
+
+def search_similar_documents(query, no_of_results=3, index_name=None):
     if index_name is None:
         index_name = os.getenv("PINECONE_INDEX_NAME")
 
-    if embeddings is None:
-        embeddings = create_embeddings()
-
-    vector_store = PineconeVectorStore(
-        index_name=index_name,
-        embedding=embeddings
-    )
-
-    results = vector_store.similarity_search_with_score(query, k=no_of_results)
+    results = load_retrieval_service(index_name).search_resumes(query, no_of_results)
 
     return results
 
 
 def get_summary_from_llm(resume_document):
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-
-    if not openai_api_key:
-        raise ValueError("OPENAI_API_KEY environment variable is not set.")
-
-    llm = ChatOpenAI(
-        model="gpt-4o",
-        temperature=0.0,
-        openai_api_key=openai_api_key
-    )
-
-    chain = load_summarize_chain(llm, chain_type="map_reduce")
-
-    summary = chain.invoke([resume_document])
+    summary = load_summary_service().summarize(resume_document)
 
     return summary
 
@@ -65,14 +43,12 @@ def main():
         load_dotenv()
 
         index_name = os.getenv("PINECONE_INDEX_NAME")
-        if not index_name:
+        if not index_name and vector_backend() != "local":
             raise ValueError(
                 "PINECONE_INDEX_NAME environment variable is not set.")
-        embeddings = create_embeddings()
-        if not embeddings:
-            raise ValueError("Failed to create embeddings.")
 
         st.set_page_config(page_title="RAG CSAE Study", layout="wide")
+        load_retrieval_service(index_name)
         st.sidebar.title("RAG CSAE Study - Search")
 
         st.title("RAG CSAE Study - UI")
@@ -86,29 +62,48 @@ def main():
         if st.sidebar.button("Search"):
             if query:
                 try:
-                    results = search_similar_documents(
-                        query, no_of_results, index_name, embeddings)
-
-                    if results:
-                        st.sidebar.success(
-                            f"Found {len(results)} similar documents.")
-
-                        for i, (doc, score) in enumerate(results):
-                            st.sidebar.write(
-                                f"**Result {i + 1}:** {doc.metadata['source']} (Score: {score:.4f})")
-
-                            st.subheader(f"Document {i + 1} Content")
-                            st.write("**** FILE *** " + doc.metadata['source'])
-
-                            with st.expander("Show Summary", expanded=False):
-                                summary = get_summary_from_llm(doc)
-                                st.write(summary["output_text"])
-                    else:
-                        st.sidebar.warning("No similar documents found.")
+                    # Kept in the session so toggling a summary does not lose the results
+                    st.session_state["results"] = search_similar_documents(
+                        query, no_of_results, index_name)
                 except Exception as e:
+                    st.session_state.pop("results", None)
                     st.sidebar.error(f"Error during search: {e}")
             else:
                 st.sidebar.error("Please enter a valid query.")
+
+        results = st.session_state.get("results")
+
+        if results is None:
+            return
+
+        if not results:
+            st.sidebar.warning("No similar documents found.")
+            return
+
+        st.sidebar.success(f"Found {len(results)} similar documents.")
+        summary_service = load_summary_service()
+
+        if st.sidebar.button("Summarize all results"):
+            with st.spinner("Summarizing results..."):
+                summary_service.summarize_many([doc for doc, _ in results])
+
+        for i, (doc, score) in enumerate(results):
+            st.sidebar.write(
+                f"**Result {i + 1}:** {doc.metadata['source']} (Score: {score:.4f})")
+
+            st.subheader(f"Document {i + 1} Content")
+            st.write("**** FILE *** " + doc.metadata['source'])
+
+            # Summaries are only generated once a result's toggle is switched on.
+            # The toggle is keyed by document, not position, so a toggle left on
+            # does not summarize whatever a new search puts in its place
+            toggle_key = f"summary-{content_hash(doc.metadata['source'] + doc.page_content)}"
+            if st.toggle("Show Summary", key=toggle_key):
+                summary = summary_service.cached(doc)
+                if summary is None:
+                    with st.spinner("Summarizing..."):
+                        summary = get_summary_from_llm(doc)
+                st.write(summary)
     except Exception as e:
         st.error(f"An error occurred: {e}")
         return
@@ -0,0 +1,95 @@
+"""
+Benchmark the local vector store's ANN indexes against brute force.
+
+Reports, per index type, the build time, recall@k against exact search and
+the p50/p95 query latency. By default the corpus is synthetic (clustered
+random vectors); with --store the vectors of an existing local store are
+used and queries are perturbed copies of stored vectors.
+
+Usage:
+    python benchmark_local_search.py
+    python benchmark_local_search.py -n 200000 -d 1024 -k 10 --index ivf --index hnsw
+    python benchmark_local_search.py --store local-vector-store
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from local_vector_store import INDEX_TYPES, LocalVectorIndex, faiss
+
+
+def synthetic_corpus(n, dimensions, clusters=256, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dimensions))
+    return (centers[rng.integers(0, clusters, n)] + 0.5 * rng.normal(size=(n, dimensions))).astype(np.float32)
+
+
+def queries_from(vectors, count, seed=1):
+    rng = np.random.default_rng(seed)
+    picked = vectors[rng.choice(len(vectors), count, replace=False)]
+    return picked + 0.1 * rng.normal(size=picked.shape).astype(np.float32)
+
+
+def run(index, queries, k):
+    latencies = []
+    results = []
+    for query in queries:
+        started = time.perf_counter()
+        results.append({row for row, _ in index.search(query, k)})
+        latencies.append(time.perf_counter() - started)
+    return results, np.array(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=50000, help="synthetic corpus size")
+    parser.add_argument("-d", type=int, default=256, help="synthetic vector dimensions")
+    parser.add_argument("-k", type=int, default=10, help="neighbours per query")
+    parser.add_argument("-q", "--queries", type=int, default=200, help="number of queries")
+    parser.add_argument("--index", action="append", choices=INDEX_TYPES[1:], help="ANN index to compare (repeatable)")
+    parser.add_argument("--nprobe", type=int, default=8, help="IVF clusters probed per query")
+    parser.add_argument("--store", help="existing local store directory to benchmark instead")
+    args = parser.parse_args()
+
+    indexes = args.index or [name for name in INDEX_TYPES[1:] if name != "hnsw" or faiss is not None]
+    workdir = None
+
+    if args.store:
+        path = args.store
+        exact = LocalVectorIndex(path)
+        exact.refresh()
+        vectors = np.asarray(exact._matrix[exact._live])
+    else:
+        workdir = tempfile.mkdtemp(prefix="local-search-benchmark-")
+        path = workdir
+        vectors = synthetic_corpus(args.n, args.d)
+        exact = LocalVectorIndex(path)
+        exact.add([str(i) for i in range(len(vectors))], vectors, [""] * len(vectors), [{}] * len(vectors))
+
+    try:
+        queries = queries_from(vectors, min(args.queries, len(vectors)))
+        truth, latencies = run(exact, queries, args.k)
+
+        print(f"{len(vectors)} vectors, {vectors.shape[1]} dimensions, {len(queries)} queries, k={args.k}")
+        print(f"{'index':<8}{'build s':>10}{'recall@k':>10}{'p50 ms':>10}{'p95 ms':>10}")
+        print(f"{'flat':<8}{0.0:>10.2f}{1.0:>10.3f}{np.percentile(latencies, 50):>10.2f}{np.percentile(latencies, 95):>10.2f}")
+
+        for name in indexes:
+            index = LocalVectorIndex(path, index=name, nprobe=args.nprobe, flat_threshold=0)
+            started = time.perf_counter()
+            index.refresh()
+            build = time.perf_counter() - started
+
+            found, latencies = run(index, queries, args.k)
+            recall = np.mean([len(f & t) / len(t) for f, t in zip(found, truth)])
+            print(f"{name:<8}{build:>10.2f}{recall:>10.3f}{np.percentile(latencies, 50):>10.2f}{np.percentile(latencies, 95):>10.2f}")
+    finally:
+        if workdir:
+            shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
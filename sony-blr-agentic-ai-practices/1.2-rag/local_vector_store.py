@@ -0,0 +1,466 @@
+"""
+Local vector store for environments without Pinecone.
+
+Vectors live in a memory-mapped float32 matrix, texts and metadata in
+SQLite, all inside one directory. Search is exact (brute force) by default
+and for small stores; larger stores can use an IVF index (built here with
+NumPy k-means) or an HNSW graph (requires faiss-cpu). LocalVectorStore
+implements the LangChain VectorStore interface, so the ingestion pipeline
+writes to it and the retrieval scripts read from it exactly as they do with
+PineconeVectorStore.
+
+Usage:
+    store = LocalVectorStore("local-vector-store", embeddings, index="ivf")
+    store.add_documents(chunks, ids=chunk_ids)
+    results = store.similarity_search_with_score("firmware engineer", k=5)
+"""
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import uuid
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+INDEX_TYPES = ("flat", "ivf", "hnsw")
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def matches_filter(metadata, condition):
+    """
+    Evaluate a Pinecone-style metadata filter ($eq, $ne, $gt, $gte, $lt,
+    $lte, $in, $nin, $and, $or; a bare value means $eq). List values match
+    $eq and $in when any element matches, as in Pinecone.
+    """
+    for key, expected in condition.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, part) for part in expected):
+                return False
+            continue
+        if key == "$or":
+            if not any(matches_filter(metadata, part) for part in expected):
+                return False
+            continue
+
+        operators = expected if isinstance(expected, dict) else {"$eq": expected}
+        value = metadata.get(key)
+        values = value if isinstance(value, list) else [value]
+
+        for operator, operand in operators.items():
+            if operator == "$eq":
+                ok = operand in values
+            elif operator == "$ne":
+                ok = operand not in values
+            elif operator == "$in":
+                ok = any(v in operand for v in values)
+            elif operator == "$nin":
+                ok = not any(v in operand for v in values)
+            elif value is None or isinstance(value, list):
+                ok = False
+            elif operator == "$gt":
+                ok = value > operand
+            elif operator == "$gte":
+                ok = value >= operand
+            elif operator == "$lt":
+                ok = value < operand
+            elif operator == "$lte":
+                ok = value <= operand
+            else:
+                raise ValueError(f"Unsupported filter operator '{operator}'.")
+            if not ok:
+                return False
+
+    return True
+
+
+def kmeans(data, nlist, iterations=10, sample_size=64, seed=0):
+    """
+    Spherical k-means centroids of unit vectors, trained on a sample of
+    at most sample_size vectors per centroid
+    """
+    rng = np.random.default_rng(seed)
+    sample = data[np.sort(rng.choice(len(data), min(len(data), nlist * sample_size), replace=False))]
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        counts = np.bincount(assignment, minlength=nlist)
+        filled = counts > 0
+        centroids[filled] = _normalize(sums[filled])
+
+    return centroids
+
+
+class LocalVectorIndex:
+    """
+    Vectors, texts and metadata of one local store directory.
+
+    vectors.f32 holds unit-normalized float32 rows; it is only ever appended
+    to and is memory-mapped for search. store.sqlite maps every row to its
+    id, text and metadata. Deleting or overwriting an id tombstones its old
+    row. Each write bumps a version number, so readers (including other
+    processes) remap the matrix before their next search.
+
+    Stores with at most flat_threshold live vectors are always searched
+    exactly; above that the configured index is used: "ivf" probes the
+    nprobe nearest of nlist k-means clusters, "hnsw" walks a faiss HNSW
+    graph. Scores are cosine similarities. Filtered searches are exact over
+    the rows whose metadata matches the filter.
+    """
+
+    def __init__(self, path, index="flat", nlist=None, nprobe=8, hnsw_m=32,
+                 ef_search=64, flat_threshold=20000):
+        if index not in INDEX_TYPES:
+            raise ValueError(f"Unknown index '{index}'. Available: {list(INDEX_TYPES)}")
+
+        if index == "hnsw" and faiss is None:
+            raise ImportError("The hnsw index requires faiss: pip install faiss-cpu")
+
+        os.makedirs(path, exist_ok=True)
+
+        self.path = path
+        self.index_type = index
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.hnsw_m = hnsw_m
+        self.ef_search = ef_search
+        self.flat_threshold = flat_threshold
+
+        self._vectors_path = os.path.join(path, "vectors.f32")
+        self._lock = threading.RLock()
+        self._version = None
+        self._dimensions = 0
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._live = np.zeros(0, dtype=bool)
+        self._ann = None
+        self._ann_rows = 0
+        self._metadata = None
+        self._filter_masks = {}
+
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS rows (
+                    row INTEGER PRIMARY KEY,
+                    id TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    metadata TEXT NOT NULL,
+                    deleted INTEGER NOT NULL DEFAULT 0
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS rows_id ON rows (id, deleted)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO meta VALUES ('version', '0')")
+
+        if not os.path.exists(self._vectors_path):
+            open(self._vectors_path, "wb").close()
+
+    def _open(self):
+        return sqlite3.connect(os.path.join(self.path, "store.sqlite"), timeout=30)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """
+        A connection for one transaction, closed afterwards
+        """
+        conn = self._open()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _bump_version(conn):
+        conn.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version'")
+
+    def add(self, ids, vectors, texts, metadatas):
+        """
+        Append vectors; ids that already exist are overwritten
+        """
+        if not ids:
+            return
+
+        vectors = _normalize(vectors)
+
+        conn = self._open()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+
+            row = conn.execute("SELECT value FROM meta WHERE key = 'dimensions'").fetchone()
+            if row is None:
+                conn.execute("INSERT INTO meta VALUES ('dimensions', ?)", (str(vectors.shape[1]),))
+            elif int(row[0]) != vectors.shape[1]:
+                raise ValueError(f"Store holds {row[0]}-dimensional vectors, got {vectors.shape[1]}.")
+
+            # Rows written to the file by an interrupted add were never committed
+            start = conn.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+            with open(self._vectors_path, "r+b") as f:
+                f.truncate(start * vectors.shape[1] * 4)
+                f.seek(0, os.SEEK_END)
+                f.write(vectors.tobytes())
+
+            conn.executemany(
+                "UPDATE rows SET deleted = 1 WHERE id = ? AND deleted = 0", [(i,) for i in ids]
+            )
+            conn.executemany(
+                "INSERT INTO rows VALUES (?, ?, ?, ?, 0)",
+                [(start + offset, i, text, json.dumps(metadata))
+                 for offset, (i, text, metadata) in enumerate(zip(ids, texts, metadatas))]
+            )
+            self._bump_version(conn)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def delete(self, ids):
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE rows SET deleted = 1 WHERE id = ? AND deleted = 0", [(i,) for i in ids]
+            )
+            self._bump_version(conn)
+
+    def __len__(self):
+        self.refresh()
+        return int(self._live.sum())
+
+    def refresh(self):
+        """
+        Remap the matrix and update the ANN index if the store changed
+        """
+        with self._lock:
+            with self._connect() as conn:
+                version = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+                if version == self._version:
+                    return
+
+                dimensions = conn.execute("SELECT value FROM meta WHERE key = 'dimensions'").fetchone()
+                deleted = [row[0] for row in conn.execute("SELECT deleted FROM rows ORDER BY row")]
+
+            self._version = version
+            self._metadata = None
+            self._filter_masks = {}
+            self._dimensions = int(dimensions[0]) if dimensions else 0
+            self._live = ~np.array(deleted, dtype=bool)
+
+            if self._live.size:
+                self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r",
+                                         shape=(self._live.size, self._dimensions))
+            else:
+                self._matrix = np.zeros((0, self._dimensions), dtype=np.float32)
+
+            if self.index_type != "flat" and self._live.sum() > self.flat_threshold:
+                self._update_ann()
+
+    def _update_ann(self):
+        rows = len(self._matrix)
+
+        if self.index_type == "hnsw":
+            if self._ann is None:
+                self._ann = faiss.IndexHNSWFlat(self._dimensions, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+                self._ann_rows = 0
+            self._ann.hnsw.efSearch = self.ef_search
+            self._ann.add(np.ascontiguousarray(self._matrix[self._ann_rows:rows]))
+            self._ann_rows = rows
+            return
+
+        # IVF: retrain the centroids whenever the store has doubled, reassign otherwise
+        if self._ann is None or rows > 2 * self._ann["trained_rows"]:
+            live = np.flatnonzero(self._live)
+            nlist = self.nlist or max(1, int(np.sqrt(len(live))))
+            self._ann = {"centroids": kmeans(self._matrix[live], nlist), "trained_rows": rows}
+
+        centroids = self._ann["centroids"]
+        assignment = np.concatenate([
+            np.argmax(self._matrix[start:start + 65536] @ centroids.T, axis=1)
+            for start in range(0, rows, 65536)
+        ])
+        order = np.argsort(assignment, kind="stable")
+        self._ann["order"] = order
+        self._ann["bounds"] = np.searchsorted(assignment[order], np.arange(len(centroids) + 1))
+
+    def _filter_mask(self, condition):
+        key = json.dumps(condition, sort_keys=True)
+
+        if key not in self._filter_masks:
+            if self._metadata is None:
+                with self._connect() as conn:
+                    self._metadata = {
+                        row: json.loads(metadata)
+                        for row, metadata in conn.execute("SELECT row, metadata FROM rows WHERE deleted = 0")
+                    }
+            mask = np.zeros(len(self._live), dtype=bool)
+            for row, metadata in self._metadata.items():
+                if row < len(mask) and matches_filter(metadata, condition):
+                    mask[row] = True
+            self._filter_masks[key] = mask & self._live
+
+        return self._filter_masks[key]
+
+    def search(self, vector, k=4, filter=None):
+        """
+        Return (row, cosine similarity) pairs of the k nearest live vectors
+        whose metadata matches filter
+        """
+        self.refresh()
+
+        with self._lock:
+            live_count = int(self._live.sum())
+            if not live_count:
+                return []
+
+            query = _normalize(vector)
+            k = min(k, live_count)
+
+            if filter:
+                return self._search_rows(query, np.flatnonzero(self._filter_mask(filter)), k)
+
+            if self.index_type == "flat" or live_count <= self.flat_threshold:
+                return self._search_flat(query, k)
+
+            if self.index_type == "ivf":
+                centroid_scores = self._ann["centroids"] @ query
+                probe = np.argsort(-centroid_scores)[:self.nprobe]
+                order, bounds = self._ann["order"], self._ann["bounds"]
+                candidates = np.concatenate([order[bounds[c]:bounds[c + 1]] for c in probe])
+                return self._search_rows(query, candidates[self._live[candidates]], k)
+
+            fetch = k
+            while True:
+                scores, rows = self._ann.search(query[None, :], min(fetch, self._ann_rows))
+                hits = [(int(row), float(score)) for row, score in zip(rows[0], scores[0])
+                        if row >= 0 and self._live[row]]
+                if len(hits) >= k or fetch >= self._ann_rows:
+                    return hits[:k]
+                fetch *= 2
+
+    def _search_flat(self, query, k):
+        scores = np.concatenate([
+            self._matrix[start:start + 65536] @ query for start in range(0, len(self._matrix), 65536)
+        ])
+        scores[~self._live] = -np.inf
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(row), float(scores[row])) for row in top]
+
+    def _search_rows(self, query, rows, k):
+        if not len(rows):
+            return []
+
+        scores = self._matrix[rows] @ query
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(rows[i]), float(scores[i])) for i in top]
+
+    def documents(self, rows):
+        """
+        Load the documents of rows, in the given order
+        """
+        if not rows:
+            return []
+
+        with self._connect() as conn:
+            found = {
+                row: Document(id=doc_id, page_content=text, metadata=json.loads(metadata))
+                for row, doc_id, text, metadata in conn.execute(
+                    f"SELECT row, id, text, metadata FROM rows WHERE row IN ({','.join('?' * len(rows))})",
+                    rows
+                )
+            }
+
+        return [found[row] for row in rows]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def open_local_index(path, **options):
+    """
+    Return the process-wide LocalVectorIndex of a directory and index options
+    """
+    key = (os.path.abspath(path), tuple(sorted(options.items())))
+
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = LocalVectorIndex(path, **options)
+        return _indexes[key]
+
+
+class LocalVectorStore(VectorStore):
+    """
+    LangChain VectorStore over a LocalVectorIndex.
+
+    Instances for the same directory share one index, so every writer and
+    reader in a process sees the same data. Index options (index, nlist,
+    nprobe, hnsw_m, ef_search, flat_threshold) are passed to LocalVectorIndex.
+    """
+
+    def __init__(self, path, embedding, **index_options):
+        self.index = open_local_index(path, **index_options)
+        self._embedding = embedding
+
+    @property
+    def embeddings(self):
+        return self._embedding
+
+    def warm_up(self):
+        """
+        Map the matrix and build the ANN index before the first search
+        """
+        self.index.refresh()
+
+    def add_texts(self, texts, metadatas=None, ids=None, **kwargs):
+        texts = list(texts)
+        ids = list(ids) if ids else [str(uuid.uuid4()) for _ in texts]
+        metadatas = list(metadatas) if metadatas else [{} for _ in texts]
+
+        self.index.add(ids, self._embedding.embed_documents(texts), texts, metadatas)
+
+        return ids
+
+    def delete(self, ids=None, **kwargs):
+        if ids:
+            self.index.delete(list(ids))
+        return True
+
+    def similarity_search_by_vector_with_score(self, embedding, k=4, filter=None, **kwargs):
+        hits = self.index.search(embedding, k, filter)
+        documents = self.index.documents([row for row, _ in hits])
+        return list(zip(documents, [score for _, score in hits]))
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        return self.similarity_search_by_vector_with_score(self._embedding.embed_query(query), k, **kwargs)
+
+    def similarity_search_by_vector(self, embedding, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k, **kwargs)]
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self):
+        return lambda score: (score + 1) / 2
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, ids=None, path="local-vector-store", **kwargs):
+        store = cls(path, embedding, **kwargs)
+        store.add_texts(texts, metadatas, ids)
+        return store
@@ -0,0 +1,226 @@
+"""
+Structured resume metadata, query constraints and local re-ranking.
+
+extract_resume_metadata() pulls years of experience, skills and job titles
+out of a resume once, at ingestion time; they are stored in every chunk's
+metadata. At search time parse_query_constraints() reads the same fields
+from a job description, build_filter() turns them into a Pinecone-style
+metadata filter for the vector query, and rerank() reorders the filtered
+candidates by combining vector similarity with how well each resume meets
+the constraints.
+
+Usage:
+    metadata = extract_resume_metadata(resume_text)
+    constraints = parse_query_constraints(job_description)
+    results = store.similarity_search_with_score(job_description, k=20, filter=build_filter(constraints))
+    top = rerank(results, constraints, top_k=3)
+"""
+import re
+from datetime import date
+
+SKILLS = {
+    "python": ["python"],
+    "java": ["java"],
+    "c++": ["c++", "cpp"],
+    "c#": ["c#", ".net"],
+    "embedded c": ["embedded c"],
+    "javascript": ["javascript", "js"],
+    "typescript": ["typescript"],
+    "go": ["golang"],
+    "rust": ["rust"],
+    "sql": ["sql", "mysql", "postgresql", "postgres"],
+    "embedded systems": ["embedded systems", "embedded system", "embedded software"],
+    "firmware": ["firmware"],
+    "rtos": ["rtos", "freertos", "real-time operating system"],
+    "microcontrollers": ["microcontroller", "microcontrollers", "mcu", "stm32", "avr", "pic"],
+    "arm": ["arm cortex", "arm"],
+    "linux": ["linux", "embedded linux"],
+    "device drivers": ["device driver", "device drivers"],
+    "computer architecture": ["computer architecture"],
+    "fpga": ["fpga"],
+    "verilog": ["verilog", "systemverilog"],
+    "vhdl": ["vhdl"],
+    "i2c": ["i2c"],
+    "spi": ["spi"],
+    "uart": ["uart"],
+    "can": ["can bus", "canbus"],
+    "iot": ["iot", "internet of things"],
+    "networking": ["networking", "tcp/ip"],
+    "machine learning": ["machine learning", "ml"],
+    "deep learning": ["deep learning"],
+    "nlp": ["nlp", "natural language processing"],
+    "computer vision": ["computer vision", "opencv"],
+    "tensorflow": ["tensorflow"],
+    "pytorch": ["pytorch"],
+    "data analysis": ["data analysis", "data analytics"],
+    "pandas": ["pandas"],
+    "spark": ["spark", "pyspark"],
+    "tableau": ["tableau"],
+    "power bi": ["power bi"],
+    "excel": ["excel"],
+    "react": ["react", "react.js", "reactjs"],
+    "node.js": ["node.js", "nodejs"],
+    "django": ["django"],
+    "flask": ["flask"],
+    "spring": ["spring boot", "spring framework"],
+    "rest": ["rest api", "restful"],
+    "microservices": ["microservices"],
+    "aws": ["aws", "amazon web services"],
+    "azure": ["azure"],
+    "gcp": ["gcp", "google cloud"],
+    "docker": ["docker"],
+    "kubernetes": ["kubernetes", "k8s"],
+    "ci/cd": ["ci/cd", "jenkins", "github actions"],
+    "git": ["git"],
+    "agile": ["agile", "scrum"],
+    "project management": ["project management"],
+}
+
+TITLES = {
+    "software engineer": ["software engineer", "software developer", "sde"],
+    "firmware engineer": ["firmware engineer", "firmware developer"],
+    "embedded engineer": ["embedded engineer", "embedded software engineer", "embedded developer"],
+    "hardware engineer": ["hardware engineer"],
+    "data scientist": ["data scientist"],
+    "data analyst": ["data analyst"],
+    "data engineer": ["data engineer"],
+    "machine learning engineer": ["machine learning engineer", "ml engineer"],
+    "devops engineer": ["devops engineer", "site reliability engineer", "sre"],
+    "qa engineer": ["qa engineer", "test engineer", "quality assurance engineer"],
+    "web developer": ["web developer", "frontend developer", "backend developer", "full stack developer"],
+    "architect": ["architect", "solution architect", "software architect"],
+    "team lead": ["team lead", "tech lead", "technical lead"],
+    "project manager": ["project manager"],
+    "product manager": ["product manager"],
+    "consultant": ["consultant"],
+    "intern": ["intern", "internship"],
+}
+
+_YEARS = re.compile(r"(\d{1,2}(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)\b", re.IGNORECASE)
+_DATE_RANGE = re.compile(
+    r"\b((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now|till date|today)\b",
+    re.IGNORECASE
+)
+
+
+def _pattern(aliases):
+    alternatives = "|".join(re.escape(alias) for alias in sorted(aliases, key=len, reverse=True))
+    return re.compile(rf"(?<![\w+#.])(?:{alternatives})(?![\w+#])", re.IGNORECASE)
+
+
+_SKILL_PATTERNS = {skill: _pattern(aliases) for skill, aliases in SKILLS.items()}
+_TITLE_PATTERNS = {title: _pattern(aliases) for title, aliases in TITLES.items()}
+
+
+def find_skills(text):
+    return sorted(skill for skill, pattern in _SKILL_PATTERNS.items() if pattern.search(text))
+
+
+def find_titles(text):
+    return sorted(title for title, pattern in _TITLE_PATTERNS.items() if pattern.search(text))
+
+
+def years_of_experience(text):
+    """
+    Largest explicit "N years" figure, or else the total length of the
+    (merged) date ranges of the resume; None if neither is present
+    """
+    explicit = [float(match) for match in _YEARS.findall(text) if float(match) <= 50]
+    if explicit:
+        return max(explicit)
+
+    current = date.today().year
+    ranges = sorted(
+        (int(start), current if not end.isdigit() else int(end))
+        for start, end in _DATE_RANGE.findall(text)
+    )
+    total = 0
+    covered_until = None
+    for start, end in ranges:
+        if end < start:
+            continue
+        if covered_until is not None and start < covered_until:
+            start = covered_until
+        total += max(0, end - start)
+        covered_until = max(end, covered_until or end)
+
+    return float(total) if ranges else None
+
+
+def extract_resume_metadata(text):
+    """
+    Metadata stored with every chunk of a resume. Fields that could not be
+    found are left out, since Pinecone metadata values cannot be null.
+    """
+    metadata = {"skills": find_skills(text), "titles": find_titles(text)}
+
+    years = years_of_experience(text)
+    if years is not None:
+        metadata["years_of_experience"] = years
+
+    return metadata
+
+
+def parse_query_constraints(query):
+    """
+    Minimum years of experience, skills and titles asked for by a job description
+    """
+    years = [float(match) for match in _YEARS.findall(query) if float(match) <= 50]
+
+    return {
+        "min_years": min(years) if years else None,
+        "skills": find_skills(query),
+        "titles": find_titles(query),
+    }
+
+
+def build_filter(constraints, require_skills=True):
+    """
+    Pinecone-style metadata filter: at least min_years of experience and,
+    with require_skills, at least one of the requested skills
+    """
+    conditions = []
+
+    if constraints.get("min_years") is not None:
+        conditions.append({"years_of_experience": {"$gte": constraints["min_years"]}})
+
+    if require_skills and constraints.get("skills"):
+        conditions.append({"skills": {"$in": constraints["skills"]}})
+
+    if not conditions:
+        return None
+
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def rerank(results, constraints, top_k=3, weights=(0.6, 0.25, 0.1, 0.05)):
+    """
+    Reorder (document, score) pairs by a weighted sum of vector similarity,
+    share of requested skills present, years of experience against the
+    minimum and title match. Keeps the best chunk per source, so one resume
+    is never listed (or summarized) twice. Returns (document, score) pairs.
+    """
+    similarity_weight, skills_weight, years_weight, title_weight = weights
+    required_skills = set(constraints.get("skills") or [])
+    required_titles = set(constraints.get("titles") or [])
+    min_years = constraints.get("min_years")
+
+    best = {}
+    for doc, score in results:
+        metadata = doc.metadata
+        skills = required_skills & set(metadata.get("skills", []))
+        years = metadata.get("years_of_experience")
+
+        combined = similarity_weight * score
+        if required_skills:
+            combined += skills_weight * len(skills) / len(required_skills)
+        if min_years:
+            combined += years_weight * (min(1.0, years / min_years) if years is not None else 0.0)
+        if required_titles & set(metadata.get("titles", [])):
+            combined += title_weight
+
+        source = metadata.get("source", id(doc))
+        if source not in best or combined > best[source][1]:
+            best[source] = (doc, combined)
+
+    return sorted(best.values(), key=lambda pair: pair[1], reverse=True)[:top_k]
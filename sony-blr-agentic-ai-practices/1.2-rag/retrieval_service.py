@@ -0,0 +1,288 @@
+"""
+Shared retrieval service for the resume search scripts.
+
+Holds one Pinecone index connection (with its HTTP connection pool) and one
+OpenAI embeddings client per process, so a search costs one embedding call
+and one query round trip instead of a client handshake plus a query.
+Query embeddings are cached in memory and on disk by normalized text, so
+re-running a job description skips the embedding call altogether.
+
+With VECTOR_BACKEND=local, searches run against the LocalVectorStore at
+LOCAL_VECTOR_STORE_PATH (index type LOCAL_VECTOR_INDEX) instead of Pinecone.
+
+Usage:
+    service = get_retrieval_service()
+    results = service.search("Embedded firmware engineer, 5+ years", no_of_results=3)
+
+    # Many job descriptions: one batched embedding call, concurrent searches
+    all_results = service.search_many(job_descriptions, k=5)
+
+    # Metadata-filtered candidates, re-ranked locally, one result per resume
+    results = service.search_resumes("5+ years embedded firmware, RTOS", no_of_results=3)
+"""
+import contextlib
+import hashlib
+import os
+import sqlite3
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+from langchain_openai import OpenAIEmbeddings
+from langchain_pinecone import PineconeVectorStore
+from pinecone import Pinecone
+
+from local_vector_store import LocalVectorStore
+from resume_metadata import build_filter, parse_query_constraints, rerank
+
+load_dotenv()
+
+
+def _require_env(name):
+    value = os.getenv(name)
+
+    if not value:
+        raise ValueError(f"{name} environment variable is not set.")
+
+    return value
+
+
+def vector_backend():
+    return os.getenv("VECTOR_BACKEND", "pinecone").lower()
+
+
+def create_embeddings():
+    embeddings = OpenAIEmbeddings(
+        model="text-embedding-3-large",
+        dimensions=1024,
+        openai_api_key=_require_env("OPENAI_API_KEY")
+    )
+
+    return embeddings
+
+
+def normalize_query(text):
+    """
+    Normalize a query so formatting-only differences share a cache entry
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+class QueryEmbeddingCache:
+    """
+    Query embeddings by normalized text: an in-memory LRU in front of SQLite.
+
+    Entries are keyed by the embedding model and the normalized query, so
+    switching models never returns stale vectors. With path=None the cache
+    is memory-only.
+    """
+
+    def __init__(self, path=None, max_entries=1024, model="text-embedding-3-large"):
+        self.path = path
+        self.max_entries = max_entries
+        self.model = model
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        if path:
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS query_embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+                )
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def key(self, query):
+        return hashlib.sha256(f"{self.model}\n{normalize_query(query)}".encode("utf-8")).hexdigest()
+
+    def get(self, query):
+        key = self.key(query)
+
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        row = None
+        if self.path:
+            with self._connect() as conn:
+                row = conn.execute("SELECT vector FROM query_embeddings WHERE key = ?", (key,)).fetchone()
+
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        vector = array("f", row[0]).tolist()
+        self._remember(key, vector)
+        with self._lock:
+            self.hits += 1
+        return vector
+
+    def put(self, query, vector):
+        key = self.key(query)
+        self._remember(key, vector)
+
+        if self.path:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO query_embeddings VALUES (?, ?)",
+                    (key, array("f", vector).tobytes())
+                )
+
+    def _remember(self, key, vector):
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+
+class RetrievalService:
+    """
+    One vector store connection and embedding client, reused for every search.
+
+    The Pinecone index is opened once with a pool of pool_threads
+    connections; warm_up() opens the connections to both APIs up front so
+    the first user search does not pay for the TLS handshakes. Query
+    embeddings go through a QueryEmbeddingCache. With the local backend the
+    index name is ignored and the LocalVectorStore is read instead.
+    """
+
+    def __init__(self, index_name=None, embeddings=None, pool_threads=4, cache=None):
+        self.backend = vector_backend()
+        self.embeddings = embeddings or create_embeddings()
+        self.pool_threads = pool_threads
+        self.cache = cache or QueryEmbeddingCache(
+            os.getenv("QUERY_EMBEDDING_CACHE", "query-embedding-cache.sqlite")
+        )
+
+        if self.backend == "local":
+            self.index_name = index_name
+            self.index = None
+            self.vector_store = LocalVectorStore(
+                os.getenv("LOCAL_VECTOR_STORE_PATH", "local-vector-store"),
+                self.embeddings,
+                index=os.getenv("LOCAL_VECTOR_INDEX", "flat")
+            )
+            return
+
+        self.index_name = index_name or _require_env("PINECONE_INDEX_NAME")
+        client = Pinecone(api_key=_require_env("PINECONE_API_KEY"))
+        self.index = client.Index(self.index_name, pool_threads=pool_threads)
+
+        self.vector_store = PineconeVectorStore(
+            index=self.index,
+            embedding=self.embeddings
+        )
+
+    def warm_up(self):
+        """
+        Open the store and OpenAI connections with two cheap calls
+        """
+        if self.index is None:
+            self.vector_store.warm_up()
+        else:
+            self.index.describe_index_stats()
+        self.embeddings.embed_query("warm-up")
+
+    def embed_queries(self, queries):
+        """
+        Embed queries, sending all cache misses in one batched request
+        """
+        vectors = [self.cache.get(query) for query in queries]
+        missing = list(dict.fromkeys(
+            normalize_query(query) for query, vector in zip(queries, vectors) if vector is None
+        ))
+
+        if missing:
+            embedded = dict(zip(missing, self.embeddings.embed_documents(missing)))
+            for text, vector in embedded.items():
+                self.cache.put(text, vector)
+            vectors = [vector if vector is not None else embedded[normalize_query(query)]
+                       for query, vector in zip(queries, vectors)]
+
+        return vectors
+
+    def search(self, query, no_of_results=3, filter=None):
+        """
+        Return the no_of_results most similar chunks as (document, score) pairs,
+        optionally restricted to chunks whose metadata matches filter
+        """
+        return self.search_many([query], no_of_results, filter=filter)[0]
+
+    def search_many(self, queries, k=3, max_concurrency=None, filter=None):
+        """
+        Search several queries: one embedding call for all uncached queries,
+        then up to max_concurrency (default: pool_threads) concurrent index queries.
+        Returns one list of (document, score) pairs per query, in query order.
+        """
+        for query in queries:
+            if query is None or query.strip() == "":
+                raise ValueError("Query must be a non-empty string.")
+
+        vectors = self.embed_queries(queries)
+
+        with ThreadPoolExecutor(max_workers=max_concurrency or self.pool_threads) as executor:
+            return list(executor.map(
+                lambda vector: self.vector_store.similarity_search_by_vector_with_score(vector, k=k, filter=filter),
+                vectors
+            ))
+
+    def search_resumes(self, query, no_of_results=3, candidates=20):
+        """
+        Search resumes for a job description: the minimum years of experience
+        and requested skills it mentions pre-filter the vector query, the top
+        candidates are re-ranked locally and one result is kept per resume.
+        If the filter leaves too few resumes, the remaining places are filled
+        by relaxing it: first without the skills condition, then unfiltered.
+        """
+        constraints = parse_query_constraints(query)
+        filters = []
+        for metadata_filter in (build_filter(constraints), build_filter(constraints, require_skills=False), None):
+            if metadata_filter not in filters:
+                filters.append(metadata_filter)
+
+        results = []
+        for metadata_filter in filters:
+            seen = {doc.metadata.get("source") for doc, _ in results}
+            ranked = rerank(self.search(query, candidates, metadata_filter), constraints, candidates)
+            results.extend(pair for pair in ranked if pair[0].metadata.get("source") not in seen)
+            if len(results) >= no_of_results:
+                break
+
+        return results[:no_of_results]
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_retrieval_service(index_name=None, warm_up=True):
+    """
+    Return the process-wide RetrievalService of an index, creating it on first use
+    """
+    if vector_backend() != "local":
+        index_name = index_name or _require_env("PINECONE_INDEX_NAME")
+
+    with _services_lock:
+        if index_name not in _services:
+            service = RetrievalService(index_name)
+            if warm_up:
+                service.warm_up()
+            _services[index_name] = service
+
+        return _services[index_name]
@@ -0,0 +1,158 @@
+"""
+Cached, concurrent document summaries for the resume search UI.
+
+Summaries are cached per (document source, content hash, model) in memory
+and in a SQLite file, so a resume is only ever summarized once per model.
+Documents ingested with summaries already carry them in their metadata
+("summary" and "summary_model") and need no LLM call at all.
+
+Usage:
+    service = SummaryService()
+    summaries = service.summarize_many(documents)
+"""
+import contextlib
+import hashlib
+import os
+import sqlite3
+import threading
+
+from langchain.chains.summarize import load_summarize_chain
+from langchain_openai import ChatOpenAI
+
+SUMMARY_MODEL = "gpt-4o"
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def create_summarize_llm(model=SUMMARY_MODEL):
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+
+    if not openai_api_key:
+        raise ValueError("OPENAI_API_KEY environment variable is not set.")
+
+    llm = ChatOpenAI(
+        model=model,
+        temperature=0.0,
+        openai_api_key=openai_api_key
+    )
+
+    return llm
+
+
+class SummaryCache:
+    """
+    Summaries by (source, content hash, model): a dict in front of SQLite.
+
+    With path=None the cache is memory-only.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._memory = {}
+        self._lock = threading.Lock()
+
+        if path:
+            with self._connect() as conn:
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS summaries (
+                        source TEXT NOT NULL,
+                        content_hash TEXT NOT NULL,
+                        model TEXT NOT NULL,
+                        summary TEXT NOT NULL,
+                        PRIMARY KEY (source, content_hash, model)
+                    )"""
+                )
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+
+        if not self.path:
+            return None
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT summary FROM summaries WHERE source = ? AND content_hash = ? AND model = ?", key
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        with self._lock:
+            self._memory[key] = row[0]
+        return row[0]
+
+    def put(self, key, summary):
+        with self._lock:
+            self._memory[key] = summary
+
+        if self.path:
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?)", (*key, summary))
+
+
+class SummaryService:
+    """
+    Map-reduce summaries with caching and bounded concurrency.
+
+    Summaries precomputed at ingestion (metadata["summary"] written with the
+    same model) are used as-is; otherwise the cache is checked, and only the
+    remaining documents are sent to the LLM, up to max_concurrency at a time.
+    """
+
+    def __init__(self, model=SUMMARY_MODEL, llm=None, cache=None, max_concurrency=4):
+        self.model = model
+        self.llm = llm or create_summarize_llm(model)
+        self.cache = cache or SummaryCache()
+        self.max_concurrency = max_concurrency
+        self.chain = load_summarize_chain(self.llm, chain_type="map_reduce")
+
+    def key(self, document):
+        return (document.metadata.get("source", ""), content_hash(document.page_content), self.model)
+
+    def cached(self, document):
+        """
+        Return the precomputed or cached summary of a document, or None
+        """
+        if document.metadata.get("summary") and document.metadata.get("summary_model") == self.model:
+            return document.metadata["summary"]
+
+        return self.cache.get(self.key(document))
+
+    def summarize(self, document):
+        return self.summarize_many([document])[0]
+
+    def summarize_many(self, documents):
+        """
+        Summarize documents concurrently, skipping precomputed and cached ones.
+        Returns one summary per document, in input order.
+        """
+        summaries = [self.cached(document) for document in documents]
+
+        missing = {}
+        for document, summary in zip(documents, summaries):
+            if summary is None:
+                missing.setdefault(self.key(document), document)
+
+        if missing:
+            outputs = self.chain.batch(
+                [[document] for document in missing.values()],
+                config={"max_concurrency": self.max_concurrency}
+            )
+            for key, output in zip(missing, outputs):
+                self.cache.put(key, output["output_text"])
+
+        return [summary if summary is not None else self.cache.get(self.key(document))
+                for document, summary in zip(documents, summaries)]
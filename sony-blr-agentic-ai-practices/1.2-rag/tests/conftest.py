@@ -0,0 +1,59 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+RAG_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAG_DIR)
+
+
+@pytest.fixture(scope="session")
+def ingestion():
+    """The 0-data-ingestion.py module, whose file name cannot be imported"""
+    pytest.importorskip("langchain_pinecone")
+
+    spec = importlib.util.spec_from_file_location("data_ingestion", os.path.join(RAG_DIR, "0-data-ingestion.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def make_pipeline(ingestion, monkeypatch, tmp_path):
+    """Build pipelines that write to an in-memory store, with fake embeddings and credentials"""
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    from langchain_core.vectorstores import InMemoryVectorStore
+
+    for name in ("OPENAI_API_KEY", "PINECONE_API_KEY", "PINECONE_INDEX_NAME"):
+        monkeypatch.setenv(name, "test")
+    monkeypatch.delenv("VECTOR_BACKEND", raising=False)
+
+    store = InMemoryVectorStore(DeterministicFakeEmbedding(size=8))
+
+    def make(**options):
+        options.setdefault("manifest_path", str(tmp_path / "manifest.sqlite"))
+        pipeline = ingestion.DocumentIngestionPipeline(**options)
+        pipeline.vector_store_service = ingestion.VectorStoreService(
+            pipeline.config, vector_store=store, batch_size=8, requests_per_second=1000
+        )
+        pipeline.embedding_service.get_embeddings = lambda: store.embeddings
+        return pipeline
+
+    make.store = store
+    return make
+
+
+@pytest.fixture
+def retrieval(monkeypatch, tmp_path):
+    """retrieval_service on the local backend, with a fresh store and no shared services"""
+    pytest.importorskip("langchain_pinecone")
+    pytest.importorskip("pinecone")
+    import retrieval_service
+
+    monkeypatch.setenv("VECTOR_BACKEND", "local")
+    monkeypatch.setenv("LOCAL_VECTOR_STORE_PATH", str(tmp_path / "store"))
+    monkeypatch.setenv("QUERY_EMBEDDING_CACHE", str(tmp_path / "query-cache.sqlite"))
+    monkeypatch.setattr(retrieval_service, "_services", {})
+    return retrieval_service
@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return str(path)
+
+
+def _text(words):
+    return " ".join(f"{word} sentence number {i}." for i, word in enumerate(words))
+
+
+def test_find_changed_skips_unchanged_and_touched_files(ingestion, tmp_path):
+    manifest = ingestion.IngestionManifest(str(tmp_path / "manifest.sqlite"))
+    kept = _write(tmp_path / "docs" / "kept.txt", "kept")
+    touched = _write(tmp_path / "docs" / "touched.txt", "touched")
+    edited = _write(tmp_path / "docs" / "edited.txt", "edited")
+    new = _write(tmp_path / "docs" / "new.txt", "new")
+
+    for entry in manifest.find_changed([kept, touched, edited]):
+        manifest.record(ingestion.ManifestEntry(**{**vars(entry), "vector_ids": [entry.file_path + "#0"]}))
+
+    os.utime(touched, (1, 1))
+    _write(tmp_path / "docs" / "edited.txt", "edited again")
+
+    pending = manifest.find_changed([kept, touched, edited, new])
+
+    assert [entry.file_path for entry in pending] == [os.path.abspath(edited), os.path.abspath(new)]
+    assert pending[0].vector_ids == [os.path.abspath(edited) + "#0"]
+    assert pending[1].vector_ids == []
+    # Only the mtime moved: the entry is refreshed, the file is not pending
+    assert manifest.get(touched).mtime == 1
+
+
+def test_find_removed_respects_directory_extension_and_recursion(ingestion, tmp_path):
+    manifest = ingestion.IngestionManifest(str(tmp_path / "manifest.sqlite"))
+    directory = tmp_path / "docs"
+    paths = [str(directory / "a.pdf"), str(directory / "b.txt"), str(directory / "sub" / "c.pdf"),
+             str(tmp_path / "other" / "d.pdf")]
+    for path in paths:
+        manifest.record(ingestion.ManifestEntry(path, 1, 1.0, "hash", []))
+
+    removed = manifest.find_removed(str(directory), (".pdf",), [])
+    assert [entry.file_path for entry in removed] == [paths[0]]
+
+    removed = manifest.find_removed(str(directory), (".pdf",), [paths[0]], recursive=True)
+    assert [entry.file_path for entry in removed] == [paths[2]]
+
+    manifest.remove(paths[0])
+    assert [entry.file_path for entry in manifest.entries()] == sorted(paths[1:])
+
+
+def test_incremental_ingestion(make_pipeline, monkeypatch, tmp_path):
+    directory = tmp_path / "docs"
+    for name in ("a", "b", "c"):
+        _write(directory / f"{name}.txt", _text([name] * 300))
+
+    make_pipeline().ingest_from_directory(str(directory), ".txt")
+    assert make_pipeline.store.store
+
+    # Nothing changed: nothing is embedded again
+    written = []
+    add_documents = make_pipeline.store.add_documents
+    monkeypatch.setattr(make_pipeline.store, "add_documents",
+                        lambda documents, **kwargs: written.extend(documents) or add_documents(documents, **kwargs))
+    make_pipeline().ingest_from_directory(str(directory), ".txt")
+    assert not written
+
+    os.remove(directory / "a.txt")
+    _write(directory / "b.txt", "b is short now.")
+    pipeline = make_pipeline()
+    pipeline.ingest_from_directory(str(directory), ".txt")
+
+    recorded = {os.path.basename(entry.file_path): entry.vector_ids for entry in pipeline.manifest.entries()}
+    assert {os.path.basename(doc.metadata["source"]) for doc in written} == {"b.txt"}
+    assert set(recorded) == {"b.txt", "c.txt"}
+    assert len(recorded["b.txt"]) == 1
+    # The vectors of a.txt and of the chunks b.txt lost are deleted
+    assert set(make_pipeline.store.store) == set(recorded["b.txt"]) | set(recorded["c.txt"])
+
+
+def test_empty_directory_prunes_nothing(make_pipeline, tmp_path):
+    directory = tmp_path / "docs"
+    _write(directory / "a.txt", _text(["a"] * 50))
+    make_pipeline().ingest_from_directory(str(directory), ".txt")
+    stored = set(make_pipeline.store.store)
+
+    os.remove(directory / "a.txt")
+    pipeline = make_pipeline()
+    with pytest.raises(ValueError):
+        pipeline.ingest_from_directory(str(directory), ".txt")
+
+    assert set(make_pipeline.store.store) == stored
+    assert len(pipeline.manifest.entries()) == 1
@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from local_vector_store import LocalVectorIndex, LocalVectorStore, matches_filter
+
+
+class WordEmbeddings(Embeddings):
+    """One dimension per vocabulary word, counted in the text"""
+
+    vocabulary = ["python", "java", "firmware", "linux", "sql"]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        words = text.lower().split()
+        return [float(words.count(word)) + 0.01 for word in self.vocabulary]
+
+
+def _random_vectors(count, dimensions=16, seed=0):
+    return np.random.default_rng(seed).normal(size=(count, dimensions)).astype(np.float32)
+
+
+@pytest.mark.parametrize("metadata, condition, expected", [
+    ({"years": 5}, {"years": {"$gte": 5}}, True),
+    ({"years": 5}, {"years": {"$gt": 5}}, False),
+    ({"skills": ["python", "sql"]}, {"skills": "sql"}, True),
+    ({"skills": ["python", "sql"]}, {"skills": {"$in": ["java", "python"]}}, True),
+    ({"skills": ["python"]}, {"skills": {"$nin": ["python"]}}, False),
+    ({"skills": ["python"]}, {"years": {"$gte": 1}}, False),
+    ({"years": 3, "skills": ["java"]}, {"$or": [{"years": {"$gte": 5}}, {"skills": "java"}]}, True),
+    ({"years": 3, "skills": ["java"]}, {"$and": [{"years": {"$gte": 5}}, {"skills": "java"}]}, False),
+])
+def test_matches_filter(metadata, condition, expected):
+    assert matches_filter(metadata, condition) is expected
+
+
+def test_matches_filter_rejects_unknown_operators():
+    with pytest.raises(ValueError):
+        matches_filter({"years": 1}, {"years": {"$near": 1}})
+
+
+def test_flat_search_is_exact(tmp_path):
+    vectors = _random_vectors(200)
+    index = LocalVectorIndex(str(tmp_path))
+    index.add([str(i) for i in range(200)], vectors, ["text"] * 200, [{}] * 200)
+
+    query = vectors[17] + 0.01
+    hits = index.search(query, k=5)
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+    assert [row for row, _ in hits] == list(expected)
+    assert hits[0][1] == pytest.approx(1.0, abs=1e-3)
+
+
+def test_overwrite_and_delete_tombstone_old_rows(tmp_path):
+    vectors = _random_vectors(3)
+    index = LocalVectorIndex(str(tmp_path))
+    index.add(["a", "b", "c"], vectors, ["a1", "b1", "c1"], [{}] * 3)
+    index.add(["a"], vectors[2:3], ["a2"], [{}])
+    index.delete(["b"])
+
+    assert len(index) == 2
+    hits = index.search(vectors[2], k=3)
+    assert sorted(doc.id for doc in index.documents([row for row, _ in hits])) == ["a", "c"]
+    assert "a2" in [doc.page_content for doc in index.documents([row for row, _ in hits])]
+
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    index = LocalVectorIndex(str(tmp_path))
+    index.add(["a"], _random_vectors(1, 8), ["a"], [{}])
+
+    with pytest.raises(ValueError):
+        index.add(["b"], _random_vectors(1, 4), ["b"], [{}])
+
+
+def test_filtered_search_only_returns_matching_rows(tmp_path):
+    vectors = _random_vectors(100)
+    metadatas = [{"years": i % 10} for i in range(100)]
+    index = LocalVectorIndex(str(tmp_path))
+    index.add([str(i) for i in range(100)], vectors, ["text"] * 100, metadatas)
+
+    hits = index.search(vectors[0], k=20, filter={"years": {"$gte": 8}})
+
+    assert len(hits) == 20
+    assert all(metadatas[row]["years"] >= 8 for row, _ in hits)
+
+
+def test_ivf_search_finds_the_exact_neighbours(tmp_path):
+    vectors = _random_vectors(2000, 32)
+    ids = [str(i) for i in range(2000)]
+    flat = LocalVectorIndex(str(tmp_path / "flat"))
+    ivf = LocalVectorIndex(str(tmp_path / "ivf"), index="ivf", nlist=8, nprobe=8, flat_threshold=100)
+    for index in (flat, ivf):
+        index.add(ids, vectors, ["text"] * 2000, [{}] * 2000)
+
+    # Probing every cluster visits every row, so the results are exact
+    for query in vectors[:10]:
+        assert [row for row, _ in ivf.search(query, k=10)] == [row for row, _ in flat.search(query, k=10)]
+
+
+def test_local_vector_store(tmp_path):
+    store = LocalVectorStore(str(tmp_path), WordEmbeddings())
+    ids = store.add_texts(
+        ["python python sql", "java linux", "firmware linux"],
+        metadatas=[{"source": "a"}, {"source": "b"}, {"source": "c"}],
+    )
+
+    results = store.similarity_search_with_score("firmware", k=2)
+    assert results[0][0].metadata == {"source": "c"}
+    assert results[0][1] > results[1][1]
+
+    filtered = store.similarity_search("firmware", k=2, filter={"source": {"$in": ["a", "b"]}})
+    assert {doc.metadata["source"] for doc in filtered} == {"a", "b"}
+
+    store.delete([ids[2]])
+    assert store.similarity_search("firmware", k=1)[0].metadata["source"] != "c"
+
+    # Stores on the same directory share one index
+    assert LocalVectorStore(str(tmp_path), WordEmbeddings()).index is store.index
@@ -0,0 +1,72 @@
+import os
+import random
+
+import pytest
+
+WORDS = [f"word{i}" for i in range(500)]
+
+
+def _document(seed, length=400):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+
+def _edit(text, changes, seed=0):
+    rng = random.Random(seed)
+    words = text.split()
+    for _ in range(changes):
+        words[rng.randrange(len(words))] = "edited"
+    return " ".join(words)
+
+
+def test_signature_similarity_estimates_jaccard(ingestion):
+    detector = ingestion.NearDuplicateDetector(shingle_size=3)
+    original = _document(1)
+
+    assert detector.similarity(detector.signature(original), detector.signature(original)) == 1.0
+    assert detector.similarity(detector.signature(original), detector.signature(_edit(original, 5))) > 0.85
+    assert detector.similarity(detector.signature(original), detector.signature(_document(2))) < 0.1
+
+
+def test_check_collapses_near_and_exact_duplicates(ingestion):
+    detector = ingestion.NearDuplicateDetector(threshold=0.8)
+    original = _document(1)
+
+    assert detector.check("a", original) is None
+    # Case and whitespace do not matter
+    assert detector.check("b", "  " + original.upper().replace(" ", "\n")) == ("a", 1.0)
+    key, similarity = detector.check("c", _edit(original, 3))
+    assert key == "a" and 0.8 <= similarity < 1.0
+    assert detector.check("d", _document(2)) is None
+    assert [entry["file"] for entry in detector.collapsed] == ["b", "c"]
+
+
+def test_rechecking_a_key_replaces_its_signature(ingestion):
+    detector = ingestion.NearDuplicateDetector()
+    original = _document(1)
+    detector.check("a", original)
+
+    assert detector.check("a", original) is None
+    assert detector.check("a", _document(2)) is None
+    assert detector.check("b", original) is None
+
+
+def test_threshold_must_be_a_similarity(ingestion):
+    with pytest.raises(ValueError):
+        ingestion.NearDuplicateDetector(threshold=0.0)
+
+
+def test_duplicates_are_found_across_runs(make_pipeline, tmp_path):
+    directory = tmp_path / "docs"
+    directory.mkdir()
+    original = _document(1)
+    (directory / "a.txt").write_text(original)
+    make_pipeline(dedup_threshold=0.8).ingest_from_directory(str(directory), ".txt")
+    stored = set(make_pipeline.store.store)
+
+    (directory / "b.txt").write_text(_edit(original, 3))
+    pipeline = make_pipeline(dedup_threshold=0.8)
+    pipeline.ingest_from_directory(str(directory), ".txt")
+
+    assert set(make_pipeline.store.store) == stored
+    assert [os.path.basename(entry["file"]) for entry in pipeline.report.duplicates] == ["b.txt"]
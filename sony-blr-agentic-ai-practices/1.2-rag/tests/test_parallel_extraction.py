@@ -0,0 +1,41 @@
+import glob
+import os
+
+import pytest
+
+from conftest import RAG_DIR
+
+PDFS = sorted(glob.glob(os.path.join(RAG_DIR, "..", "lc-training-data", "rag-docs", "*.pdf")))[:3]
+
+
+@pytest.fixture
+def files(tmp_path):
+    csv_path = tmp_path / "people.csv"
+    csv_path.write_text("name,role\n" + "".join(f"person{i},engineer {i}\n" for i in range(50)))
+    return PDFS + [str(csv_path), str(tmp_path / "missing.txt")]
+
+
+def test_process_pool_matches_sequential_extraction(make_pipeline, ingestion, files):
+    sequential = make_pipeline(manifest_path=None, max_workers=1)
+    # A low threshold splits the CSV into page ranges across the workers
+    parallel = make_pipeline(manifest_path=None, max_workers=2, page_split_threshold=2)
+    for pipeline in (sequential, parallel):
+        pipeline.set_processor(ingestion.CSVProcessor(rows_per_page=10), extensions=[".csv"])
+
+    pooled = parallel.extract_files(files)
+    sequential = sequential.extract_files(files)
+
+    assert [result.file_path for result in pooled] == files
+    assert [result.text for result in pooled] == [result.text for result in sequential]
+    assert pooled[-2].pages == 5
+    assert "person49" in pooled[-2].text
+    assert all(result.error is None and result.text for result in pooled[:-1])
+    assert pooled[-1].error and not pooled[-1].text
+
+
+def test_process_documents_skips_failed_files(make_pipeline, files):
+    pipeline = make_pipeline(manifest_path=None, max_workers=2)
+    documents = pipeline.process_documents(files)
+
+    assert [document.metadata["source"] for document in documents] == files[:-1]
+    assert [result.file_path for result in pipeline.extraction_results if result.error] == files[-1:]
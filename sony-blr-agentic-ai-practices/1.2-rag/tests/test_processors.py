@@ -0,0 +1,84 @@
+import csv
+
+import pytest
+
+ROWS = [
+    {"name": "Asha", "skills": "C, C++", "notes": "plain"},
+    {"name": "Ravi", "skills": "Python", "notes": 'multi-line\n"quoted" note\n\nwith a blank line'},
+    {"name": "Meera", "skills": "", "notes": "last"},
+] * 7
+
+
+def _write_csv(path, line_terminator="\n"):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(ROWS[0]), lineterminator=line_terminator)
+        writer.writeheader()
+        for i, row in enumerate(ROWS):
+            writer.writerow(row)
+            if i % 5 == 4:
+                f.write(line_terminator)
+    return str(path)
+
+
+def _render(rows):
+    return "\n\n".join("\n".join(f"{column}: {value}" for column, value in row.items()) for row in rows)
+
+
+@pytest.mark.parametrize("line_terminator", ["\n", "\r\n"])
+def test_csv_pages_match_a_full_parse(ingestion, tmp_path, line_terminator):
+    path = _write_csv(tmp_path / "people.csv", line_terminator)
+    processor = ingestion.CSVProcessor(rows_per_page=4)
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    expected = [_render(rows[start:start + 4]) for start in range(0, len(rows), 4)]
+
+    assert processor.count_pages(path) == len(expected) == 6
+    assert processor.extract_pages(path) == expected
+    # Ranges seek straight to their first row
+    assert processor.extract_pages(path, 2, 4) == expected[2:4]
+    assert processor.extract_pages(path, 5) == expected[5:]
+    assert processor.extract_pages(path, 6) == []
+    assert processor.extract_text(path) == "\n\n".join(expected)
+
+
+def test_csv_without_rows_is_one_empty_page(ingestion, tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_text("name,skills\n")
+    processor = ingestion.CSVProcessor()
+
+    assert processor.count_pages(str(path)) == 1
+    assert processor.extract_pages(str(path)) == []
+
+
+def test_registry_looks_up_extension_then_mime_type(ingestion):
+    registry = ingestion.ProcessorRegistry.default()
+
+    assert isinstance(registry.get("a.PDF"), ingestion.PDFProcessor)
+    assert isinstance(registry.get("a.csv"), ingestion.CSVProcessor)
+    assert isinstance(registry.get("a.htm"), ingestion.HTMLProcessor)
+    # Not registered by extension, found by its guessed MIME type
+    assert type(registry.get("a.text")) is ingestion.TextProcessor
+    assert registry.get("a.docx") is None
+
+
+def test_set_processor(make_pipeline, ingestion):
+    pipeline = make_pipeline(manifest_path=None)
+    custom = ingestion.TextProcessor()
+
+    pipeline.set_processor(custom, extensions=[".log"])
+    assert pipeline.processor_for("a.log") is custom
+    assert isinstance(pipeline.processor_for("a.csv"), ingestion.CSVProcessor)
+
+    pipeline.set_processor(custom)
+    assert pipeline.processor_for("a.csv") is custom
+    assert pipeline.processor_for("a.unknown") is custom
+    assert ".csv" in pipeline.registry.extensions()
+
+
+def test_html_processor_keeps_visible_text(ingestion, tmp_path):
+    path = tmp_path / "page.html"
+    path.write_text("<html><head><style>p {}</style><script>var x;</script></head>"
+                    "<body><h1>Resume</h1><p>Firmware engineer</p></body></html>")
+
+    assert ingestion.HTMLProcessor().extract_text(str(path)) == "Resume\nFirmware engineer"
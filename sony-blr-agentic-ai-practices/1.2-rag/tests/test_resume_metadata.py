@@ -0,0 +1,73 @@
+import pytest
+from langchain_core.documents import Document
+
+from resume_metadata import build_filter, extract_resume_metadata, parse_query_constraints, rerank
+
+RESUME = """
+Senior Firmware Engineer with 7+ years of experience.
+Skills: Embedded C, C++, FreeRTOS, STM32, Linux device drivers, Git.
+Javelin Systems, 2016 - 2023
+"""
+
+
+def test_extract_resume_metadata():
+    metadata = extract_resume_metadata(RESUME)
+
+    assert metadata["years_of_experience"] == 7.0
+    assert {"embedded c", "c++", "rtos", "microcontrollers", "linux", "device drivers", "git"} <= set(
+        metadata["skills"]
+    )
+    # "java" must not match inside "Javelin"
+    assert "java" not in metadata["skills"]
+    assert metadata["titles"] == ["firmware engineer"]
+
+
+def test_years_fall_back_to_merged_date_ranges():
+    metadata = extract_resume_metadata("Acme 2010 - 2014\nInitech 2012 - 2016\nGlobex 2018 to 2020")
+
+    assert metadata["years_of_experience"] == 8.0
+
+
+def test_missing_years_are_left_out():
+    assert "years_of_experience" not in extract_resume_metadata("Python developer")
+
+
+def test_build_filter():
+    constraints = parse_query_constraints("Embedded engineer, 5+ years, C++ and RTOS")
+
+    assert constraints == {"min_years": 5.0, "skills": ["c++", "rtos"], "titles": ["embedded engineer"]}
+    assert build_filter(constraints) == {
+        "$and": [
+            {"years_of_experience": {"$gte": 5.0}},
+            {"skills": {"$in": ["c++", "rtos"]}},
+        ]
+    }
+    assert build_filter(constraints, require_skills=False) == {"years_of_experience": {"$gte": 5.0}}
+    assert build_filter(parse_query_constraints("someone nice")) is None
+
+
+def _result(source, score, **metadata):
+    return Document(page_content=source, metadata={"source": source, **metadata}), score
+
+
+def test_rerank_prefers_resumes_meeting_the_constraints():
+    constraints = {"min_years": 5.0, "skills": ["c++", "rtos"], "titles": ["firmware engineer"]}
+    results = [
+        _result("close-but-junior", 0.82, skills=["c++"], years_of_experience=1.0),
+        _result("qualified", 0.78, skills=["c++", "rtos"], titles=["firmware engineer"],
+                years_of_experience=6.0),
+        _result("no-metadata", 0.80),
+    ]
+
+    ranked = rerank(results, constraints, top_k=3)
+
+    assert [doc.metadata["source"] for doc, _ in ranked] == ["qualified", "close-but-junior", "no-metadata"]
+    assert ranked[0][1] == pytest.approx(0.6 * 0.78 + 0.25 + 0.1 + 0.05)
+
+
+def test_rerank_keeps_the_best_chunk_per_resume():
+    results = [_result("a", 0.5), _result("a", 0.9), _result("b", 0.7)]
+
+    ranked = rerank(results, {}, top_k=3)
+
+    assert [(doc.metadata["source"], score) for doc, score in ranked] == [("a", 0.6 * 0.9), ("b", 0.6 * 0.7)]
@@ -0,0 +1,114 @@
+from langchain_core.embeddings import Embeddings
+
+from local_vector_store import LocalVectorStore
+
+
+class CountingEmbeddings(Embeddings):
+    """Bag-of-words embeddings over a fixed vocabulary, counting API calls"""
+
+    vocabulary = ["python", "java", "firmware", "linux", "sql", "rtos"]
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        self.calls.append([text])
+        return self._vector(text)
+
+    def _vector(self, text):
+        words = text.lower().replace(",", " ").split()
+        return [float(words.count(word)) + 0.01 for word in self.vocabulary]
+
+
+def _service(retrieval, monkeypatch, texts=(), metadatas=None):
+    embeddings = CountingEmbeddings()
+    monkeypatch.setattr(retrieval, "create_embeddings", lambda: embeddings)
+    service = retrieval.get_retrieval_service(warm_up=False)
+    if texts:
+        LocalVectorStore(service.vector_store.index.path, embeddings).add_texts(list(texts), metadatas)
+    embeddings.calls.clear()
+    return service, embeddings
+
+
+def test_one_service_per_process(retrieval, monkeypatch):
+    created = []
+    monkeypatch.setattr(retrieval, "create_embeddings", lambda: created.append(1) or CountingEmbeddings())
+
+    service = retrieval.get_retrieval_service(warm_up=False)
+
+    assert retrieval.get_retrieval_service() is service
+    assert created == [1]
+
+
+def test_search_reads_the_local_store(retrieval, monkeypatch):
+    service, _ = _service(retrieval, monkeypatch, ["python sql", "firmware rtos linux", "java"],
+                          [{"source": "a"}, {"source": "b"}, {"source": "c"}])
+
+    results = service.search("firmware engineer", no_of_results=2)
+
+    assert [doc.metadata["source"] for doc, _ in results][0] == "b"
+    assert len(results) == 2
+    assert service.search("firmware", 3, filter={"source": "c"})[0][0].metadata == {"source": "c"}
+
+
+def test_query_cache_normalizes_and_persists(retrieval, tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = retrieval.QueryEmbeddingCache(path)
+    cache.put("Firmware  engineer\n", [0.5, 0.25])
+
+    assert cache.get("firmware engineer") is None
+    assert cache.get(" Firmware engineer ") == [0.5, 0.25]
+
+    reopened = retrieval.QueryEmbeddingCache(path)
+    assert reopened.get("Firmware engineer") == [0.5, 0.25]
+    assert (reopened.hits, reopened.misses) == (1, 0)
+    # Another model never sees these vectors
+    assert retrieval.QueryEmbeddingCache(path, model="other").get("Firmware engineer") is None
+
+
+def test_query_cache_evicts_least_recently_used(retrieval):
+    cache = retrieval.QueryEmbeddingCache(max_entries=2)
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    cache.get("a")
+    cache.put("c", [3.0])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0] and cache.get("c") == [3.0]
+
+
+def test_search_many_embeds_all_misses_in_one_call(retrieval, monkeypatch):
+    service, embeddings = _service(retrieval, monkeypatch, ["python sql", "firmware rtos", "java linux"],
+                                   [{"source": "a"}, {"source": "b"}, {"source": "c"}])
+    queries = ["python", "firmware", " python\n", "java"]
+
+    results = service.search_many(queries, k=1)
+
+    assert embeddings.calls == [["python", "firmware", "java"]]
+    assert [pairs[0][0].metadata["source"] for pairs in results] == ["a", "b", "a", "c"]
+
+    service.search_many(queries, k=1)
+    assert len(embeddings.calls) == 1
+
+
+def test_search_resumes_relaxes_the_filter_to_fill_places(retrieval, monkeypatch):
+    texts = ["firmware rtos", "firmware rtos linux", "firmware", "java sql"]
+    metadatas = [
+        {"source": "senior", "skills": ["rtos"], "years_of_experience": 8.0},
+        {"source": "senior-2", "skills": ["rtos"], "years_of_experience": 8.0},
+        {"source": "no-skills", "skills": [], "years_of_experience": 6.0},
+        {"source": "junior", "skills": ["java"], "years_of_experience": 1.0},
+    ]
+    # Two chunks of the same resume
+    texts.append("rtos rtos firmware")
+    metadatas.append(dict(metadatas[0]))
+    service, _ = _service(retrieval, monkeypatch, texts, metadatas)
+
+    results = service.search_resumes("firmware with rtos, 5+ years", no_of_results=4)
+
+    assert [doc.metadata["source"] for doc, _ in results][:2] in (["senior", "senior-2"], ["senior-2", "senior"])
+    assert [doc.metadata["source"] for doc, _ in results][2:] == ["no-skills", "junior"]
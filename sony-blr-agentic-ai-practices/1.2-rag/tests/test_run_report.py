@@ -0,0 +1,51 @@
+import json
+import threading
+
+
+def test_report_counters_are_thread_safe(ingestion):
+    report = ingestion.RunReport()
+
+    def work():
+        for _ in range(1000):
+            report.add(chunks=1, embedding_tokens=3)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert report.chunks == 4000
+    assert report.embedding_tokens == 12000
+
+
+def test_count_tokens(ingestion):
+    assert ingestion.count_tokens([]) == 0
+    assert ingestion.count_tokens(["hello world", "hello"]) in (3, 5)
+
+
+def test_ingestion_report(make_pipeline, tmp_path):
+    directory = tmp_path / "docs"
+    directory.mkdir()
+    for name in ("a", "b"):
+        (directory / f"{name}.txt").write_text(" ".join(f"{name} sentence {i}." for i in range(300)))
+    (directory / "empty.csv").write_bytes(b"")
+    report_path = tmp_path / "report.jsonl"
+
+    pipeline = make_pipeline(report_path=str(report_path))
+    pipeline.ingest_from_directory(str(directory), (".txt", ".csv"))
+
+    snapshots = [json.loads(line) for line in report_path.read_text().splitlines()]
+    final = snapshots[-1]
+    assert final["finished"] and not any(snapshot["finished"] for snapshot in snapshots[:-1])
+    assert final["files_discovered"] == 3
+    assert final["chunks"] == final["vectors_upserted"] == len(make_pipeline.store.store)
+    assert final["embedding_tokens"] > 0
+    assert {"discover", "extract", "chunk", "upsert"} <= set(final["stages"])
+    assert final == pipeline.get_statistics()["run"] | {"elapsed_seconds": final["elapsed_seconds"]}
+
+    # A second run skips both files and reports nothing upserted
+    pipeline = make_pipeline(report_path=str(report_path))
+    pipeline.ingest_from_directory(str(directory), ".txt")
+    assert pipeline.report.files_skipped == 2
+    assert pipeline.report.vectors_upserted == 0
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def directory(tmp_path):
+    directory = tmp_path / "docs"
+    directory.mkdir()
+    for name in "abcdef":
+        (directory / f"{name}.txt").write_text(" ".join(f"{name} sentence {i}." for i in range(300)))
+    return directory
+
+
+def _recorded(pipeline):
+    return {os.path.basename(entry.file_path): entry.vector_ids for entry in pipeline.manifest.entries()}
+
+
+def test_streaming_writes_what_batch_ingestion_writes(make_pipeline, directory, tmp_path):
+    batch = make_pipeline(manifest_path=str(tmp_path / "batch.sqlite"))
+    batch.ingest_from_directory(str(directory), ".txt")
+    expected = dict(make_pipeline.store.store)
+    make_pipeline.store.store.clear()
+
+    streaming = make_pipeline(max_workers=2)
+    streaming.stream_from_directory(str(directory), ".txt", queue_size=2, progress_interval=0.1)
+
+    assert set(make_pipeline.store.store) == set(expected)
+    assert all(make_pipeline.store.store[i]["text"] == doc["text"] for i, doc in expected.items())
+    assert _recorded(streaming) == _recorded(batch)
+    assert streaming.report.vectors_upserted == len(expected)
+
+
+def test_streaming_skips_unchanged_and_prunes_removed_files(make_pipeline, directory):
+    make_pipeline().stream_from_directory(str(directory), ".txt", progress_interval=0.1)
+
+    os.remove(directory / "a.txt")
+    pipeline = make_pipeline()
+    pipeline.stream_from_directory(str(directory), ".txt", progress_interval=0.1)
+
+    assert pipeline.report.files_skipped == 5
+    assert pipeline.report.vectors_upserted == 0
+    assert set(_recorded(pipeline)) == {f"{name}.txt" for name in "bcdef"}
+    assert set(make_pipeline.store.store) == {i for ids in _recorded(pipeline).values() for i in ids}
+
+
+def test_streaming_empty_directory_prunes_nothing(make_pipeline, directory):
+    make_pipeline().stream_from_directory(str(directory), ".txt", progress_interval=0.1)
+    stored = set(make_pipeline.store.store)
+
+    for name in os.listdir(directory):
+        os.remove(directory / name)
+    pipeline = make_pipeline()
+    pipeline.stream_from_directory(str(directory), ".txt", progress_interval=0.1)
+
+    assert set(make_pipeline.store.store) == stored
+    assert len(pipeline.manifest.entries()) == 6
+
+
+def test_stage_errors_abort_the_run(make_pipeline, directory, monkeypatch):
+    pipeline = make_pipeline()
+
+    def broken(entry):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(pipeline.manifest, "record", broken)
+
+    with pytest.raises(RuntimeError):
+        pipeline.stream_from_directory(str(directory), ".txt", queue_size=1, progress_interval=0.1)
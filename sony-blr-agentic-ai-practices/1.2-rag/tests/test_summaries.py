@@ -0,0 +1,62 @@
+from langchain_core.documents import Document
+from langchain_core.language_models import FakeListLLM
+
+from summaries import SummaryCache, SummaryService
+
+
+class FakeLLM(FakeListLLM):
+    """FakeListLLM that counts its calls, and tokens without the GPT-2 tokenizer"""
+
+    calls: int = 0
+
+    def _call(self, *args, **kwargs):
+        self.calls += 1
+        return super()._call(*args, **kwargs)
+
+    def get_num_tokens(self, text):
+        return len(text.split())
+
+
+def _resume(source, text):
+    return Document(page_content=text, metadata={"source": source})
+
+
+def test_summary_cache_persists(tmp_path):
+    path = str(tmp_path / "summaries.sqlite")
+    key = ("a.pdf", "hash", "model")
+    SummaryCache(path).put(key, "summary")
+
+    assert SummaryCache(path).get(key) == "summary"
+    assert SummaryCache(path).get(("a.pdf", "other hash", "model")) is None
+    assert SummaryCache().get(key) is None
+
+
+def test_summaries_are_only_computed_once(tmp_path):
+    llm = FakeLLM(responses=["summary"])
+    service = SummaryService(model="fake", llm=llm, cache=SummaryCache(str(tmp_path / "summaries.sqlite")))
+    documents = [_resume("a.pdf", "Firmware engineer"), _resume("b.pdf", "Data analyst"),
+                 _resume("a.pdf", "Firmware engineer")]
+
+    assert service.summarize_many(documents) == ["summary"] * 3
+    # A map and a reduce step each for a.pdf and b.pdf; the repeated a.pdf is not sent
+    assert llm.calls == 4
+
+    # A second pass and a new service on the same cache file make no LLM calls
+    fresh = FakeLLM(responses=["other"])
+    again = SummaryService(model="fake", llm=fresh, cache=SummaryCache(str(tmp_path / "summaries.sqlite")))
+    assert service.summarize_many(documents) == again.summarize_many(documents) == ["summary"] * 3
+    assert llm.calls == 4 and fresh.calls == 0
+
+    # Changed content is summarized again
+    assert again.summarize(_resume("a.pdf", "Firmware lead")) == "other"
+
+
+def test_precomputed_summaries_need_no_llm():
+    llm = FakeLLM(responses=["generated"])
+    service = SummaryService(model="fake", llm=llm)
+    document = Document(page_content="Firmware engineer",
+                        metadata={"source": "a.pdf", "summary": "ingested", "summary_model": "fake"})
+    other_model = Document(page_content="Firmware engineer",
+                           metadata={"source": "b.pdf", "summary": "ingested", "summary_model": "gpt-4o"})
+
+    assert service.summarize_many([document, other_model]) == ["ingested", "generated"]
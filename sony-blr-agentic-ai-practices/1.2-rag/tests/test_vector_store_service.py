@@ -0,0 +1,79 @@
+import pytest
+from langchain_core.documents import Document
+
+
+def _documents(count=3, words=600):
+    return [
+        Document(page_content=" ".join(f"doc{d} word{i}" for i in range(words)), metadata={"source": f"doc{d}.txt"})
+        for d in range(count)
+    ]
+
+
+@pytest.fixture
+def service(make_pipeline, ingestion, monkeypatch):
+    monkeypatch.setattr(ingestion.time, "sleep", lambda seconds: None)
+    return make_pipeline(manifest_path=None).vector_store_service
+
+
+def test_chunk_ids_are_deterministic(ingestion):
+    chunker = ingestion.DocumentChunker(chunk_size=200, chunk_overlap=20)
+    chunks = chunker.split_documents(_documents(2))
+
+    assert [chunk.metadata["chunk_id"] for chunk in chunks] == [
+        chunker.chunk_id(chunk.metadata["source"], chunk.metadata["chunk_index"]) for chunk in chunks
+    ]
+    assert len({chunk.metadata["chunk_id"] for chunk in chunks}) == len(chunks)
+    assert [chunk.metadata["chunk_index"] for chunk in chunks if chunk.metadata["source"] == "doc0.txt"] == list(
+        range(len(chunks) // 2)
+    )
+    assert all(len(chunk.page_content) <= 200 for chunk in chunks)
+    assert chunker.split_documents(_documents(2)) == chunks
+
+
+def test_push_documents_upserts_every_chunk_once(service, make_pipeline, ingestion):
+    report = ingestion.RunReport()
+    ids = service.push_documents(_documents(), make_pipeline.store.embeddings, report=report)
+
+    assert ids == [chunk.metadata["chunk_id"] for chunk in service.chunker.split_documents(_documents())]
+    assert len(ids) > service.batch_size
+    assert set(make_pipeline.store.store) == set(ids)
+    assert report.chunks == report.vectors_upserted == len(ids)
+    assert report.embedding_tokens > 0
+
+    # Same ids: pushing again overwrites instead of duplicating
+    service.push_documents(_documents(), make_pipeline.store.embeddings)
+    assert len(make_pipeline.store.store) == len(ids)
+
+
+def test_failed_batches_are_retried(service, make_pipeline, monkeypatch):
+    add_documents = make_pipeline.store.add_documents
+    failures = []
+
+    def flaky(documents, **kwargs):
+        if len(failures) < 2:
+            failures.append(len(documents))
+            raise ConnectionError("rate limited")
+        return add_documents(documents, **kwargs)
+
+    monkeypatch.setattr(make_pipeline.store, "add_documents", flaky)
+    ids = service.push_documents(_documents(1), make_pipeline.store.embeddings)
+
+    assert len(failures) == 2
+    assert set(make_pipeline.store.store) == set(ids)
+
+
+def test_batches_fail_after_the_last_retry(service, make_pipeline, monkeypatch):
+    def failing(documents, **kwargs):
+        raise ConnectionError("down")
+
+    monkeypatch.setattr(make_pipeline.store, "add_documents", failing)
+
+    with pytest.raises(ConnectionError):
+        service.push_documents(_documents(1), make_pipeline.store.embeddings)
+
+
+def test_push_documents_validates_its_inputs(service, make_pipeline):
+    with pytest.raises(ValueError):
+        service.push_documents([], make_pipeline.store.embeddings)
+    with pytest.raises(ValueError):
+        service.push_documents(_documents(1), None)
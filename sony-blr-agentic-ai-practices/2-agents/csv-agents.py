@@ -1,11 +1,121 @@
 import os
 import streamlit as st
-import pandas as pd
 
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langchain_experimental.agents.agent_toolkits import create_pandas_dataframe_agent
 
+from hr_analytics import AnswerCache, answer_directly, create_analytics_tools
+from hr_data import DEFAULT_CSV_PATH, dataset_version, format_profile, load_dataset, profile_dataset
+from hr_out_of_core import create_out_of_core_agent, open_dataset
+from hr_sandbox import SandboxPool, create_sandbox_tool
+
+AGENT_PREFIX = """
+You are working with a pandas dataframe in Python. The name of the dataframe is `df`.
+This is a profile of `df`, computed in advance:
+
+{profile}
+
+Rely on this profile for column names, dtypes, value ranges and categories instead of
+running df.head(), df.columns, df.info() or df.describe(); only run code to compute answers.
+Prefer the attrition_rate_by, average_by, cross_tabulate and top_values tools over
+writing pandas code whenever they can answer the question.
+You should use the tools below to answer the question posed of you:"""
+
+
+@st.cache_resource(show_spinner="Loading HR dataset ...")
+def load_dataframe(csv_path, version, cache_format):
+    # version is part of the cache key, so an updated CSV is reloaded
+    return load_dataset(csv_path, cache_format=cache_format)
+
+
+@st.cache_resource
+def load_profile(csv_path, version, cache_format):
+    profile = format_profile(profile_dataset(load_dataframe(csv_path, version, cache_format)))
+    # The agent prefix becomes part of a prompt template, so braces in values must be escaped
+    return profile.replace("{", "{{").replace("}", "}}")
+
+
+@st.cache_resource(show_spinner="Opening HR dataset ...")
+def load_out_of_core_dataset(csv_path, version):
+    return open_dataset(csv_path, backend=os.getenv("HR_OUT_OF_CORE_ENGINE", "auto"))
+
+
+def sandbox_limits():
+    return dict(
+        workers=int(os.getenv("HR_SANDBOX_WORKERS", "2")),
+        cpu_seconds=int(os.getenv("HR_SANDBOX_CPU_SECONDS", "10")),
+        wall_seconds=int(os.getenv("HR_SANDBOX_WALL_SECONDS", "20")),
+        memory_mb=int(os.getenv("HR_SANDBOX_MEMORY_MB", "2048"))
+    )
+
+
+@st.cache_resource(show_spinner="Starting sandbox workers ...")
+def load_sample_sandbox_pool(csv_path, version, sample_rows=1000):
+    # The out-of-core agent explores a sample, in the same limited workers as the pandas agent
+    sample = load_out_of_core_dataset(csv_path, version).sample(sample_rows)
+    return SandboxPool(sample, name="sample", **sandbox_limits())
+
+
+@st.cache_resource
+def load_out_of_core_agent(csv_path, version, model_name, temperature=0.8, max_tokens=1000):
+    dataset = load_out_of_core_dataset(csv_path, version)
+
+    # Profile a sample; only the row count needs a full scan
+    profile = profile_dataset(dataset.sample(10_000))
+    profile["rows"] = dataset.row_count()
+
+    llm = ChatOpenAI(
+        model=model_name,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        openai_api_key=os.environ["OPENAI_API_KEY"]
+    )
+
+    return create_out_of_core_agent(
+        llm, dataset, format_profile(profile), sandbox=load_sample_sandbox_pool(csv_path, version)
+    )
+
+
+@st.cache_resource
+def load_answer_cache():
+    return AnswerCache(os.getenv("HR_ANSWER_CACHE", "hr-answer-cache.sqlite"))
+
+
+@st.cache_resource(show_spinner="Starting sandbox workers ...")
+def load_sandbox_pool(csv_path, version, cache_format):
+    return SandboxPool(load_dataframe(csv_path, version, cache_format), **sandbox_limits())
+
+
+@st.cache_resource
+def load_agent(csv_path, version, cache_format, model_name, temperature=0.8, max_tokens=1000):
+    df = load_dataframe(csv_path, version, cache_format)
+
+    llm = ChatOpenAI(
+        model=model_name,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        openai_api_key=os.environ["OPENAI_API_KEY"]
+    )
+
+    agent = create_pandas_dataframe_agent(
+        llm,
+        df,
+        extra_tools=create_analytics_tools(df),
+        prefix=AGENT_PREFIX.format(profile=load_profile(csv_path, version, cache_format)),
+        verbose=True,
+        allow_dangerous_code=True,
+    )
+
+    agent.handle_parsing_errors = True
+
+    # Generated code runs in limited worker processes, not in the Streamlit process
+    sandbox_tool = create_sandbox_tool(load_sandbox_pool(csv_path, version, cache_format))
+    agent.tools = [sandbox_tool if tool.name == sandbox_tool.name else tool for tool in agent.tools]
+
+    return agent
+
+
 def main():
     try:
         load_dotenv(override=True)
@@ -26,35 +136,46 @@ def main():
         user_question = st.text_input(
             "Ask your questions about HR Employees Attritioning ...")
         
-        csv_path = "../../sony-blr-agentic-ai-practices\lc-training-data\hr-employees-attritions-internet.csv"
-        df = pd.read_csv(csv_path)
-
+        csv_path = os.getenv("HR_DATASET_PATH", DEFAULT_CSV_PATH)
+        cache_format = os.getenv("HR_DATASET_CACHE_FORMAT", "parquet") or None
         model_name = "gpt-4o"
-        temperature = 0.8
-        max_tokens = 1000
-
-        llm = ChatOpenAI(
-            model=model_name,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            openai_api_key=os.environ["OPENAI_API_KEY"]
-        )
-        
-        agent = create_pandas_dataframe_agent(
-            llm,
-            df,
-            verbose=True,
-            allow_dangerous_code=True,
-        )
+        out_of_core = os.getenv("HR_AGENT_BACKEND", "pandas") == "out-of-core"
+
+        version = dataset_version(csv_path)
+
+        if not user_question:
+            return
+
+        # Only deterministic answers are cached, per dataset version and backend;
+        # agent answers are sampled and may be failed or stopped runs
+        cache = load_answer_cache()
+        cache_version = f"{version}/{'out-of-core' if out_of_core else 'pandas'}"
+        answer = cache.get(cache_version, user_question)
+
+        if answer is None:
+            # HR_AGENT_BACKEND=out-of-core keeps exports larger than memory on disk
+            if out_of_core:
+                data = load_out_of_core_dataset(csv_path, version)
+            else:
+                data = load_dataframe(csv_path, version, cache_format)
 
-        agent.handle_parsing_errors = True
-        answer = agent.invoke(user_question)
+            # Recurring question shapes are answered without the LLM
+            answer = answer_directly(data, user_question)
+            if answer is not None:
+                answer = f"```\n{answer}\n```"
+                cache.put(cache_version, user_question, answer)
+            else:
+                if out_of_core:
+                    agent = load_out_of_core_agent(csv_path, version, model_name)
+                else:
+                    agent = load_agent(csv_path, version, cache_format, model_name)
+                answer = agent.invoke({"input": user_question})["output"]
         
-        st.write(answer["output"])
+        st.write(answer)
     except Exception as e:
         st.error(f"Error loading environment variables: {e}")
         
         return
     
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,268 @@
+"""
+Deterministic analytics for the HR attrition agent.
+
+Recurring questions ("attrition rate by department", "average monthly
+income by job role") do not need the LLM to write fresh pandas code: the
+vectorized aggregations below answer them directly. They are exposed three
+ways:
+  * as functions (rate_by, mean_by, crosstab, top_k),
+  * as LangChain tools registered next to the pandas agent's Python tool,
+  * through answer_directly(), which recognizes common question shapes and
+    answers them without any LLM call.
+
+AnswerCache stores deterministic answers by dataset version and normalized
+question, so a repeated question is served from memory or SQLite in
+milliseconds.
+
+Usage:
+    answer = answer_directly(df, "Attrition rate by department")
+    tools = create_analytics_tools(df)
+    cache = AnswerCache("hr-answer-cache.sqlite")
+"""
+import contextlib
+import hashlib
+import re
+import sqlite3
+import threading
+import unicodedata
+from functools import partial
+
+import pandas as pd
+from langchain_core.tools import StructuredTool
+
+
+def _key(name):
+    return re.sub(r"[^a-z0-9]", "", str(name).lower())
+
+
+def resolve_column(df, name):
+    """
+    Map a loosely written column name ("job role", "income") to a column of
+    df (anything with a columns attribute): exact match ignoring case, spaces
+    and punctuation first, then a unique column containing the name. Raises
+    ValueError otherwise.
+    """
+    wanted = _key(name)
+    columns = {_key(column): column for column in df.columns}
+
+    if wanted in columns:
+        return columns[wanted]
+
+    candidates = [column for key, column in columns.items() if wanted and wanted in key]
+    if len(candidates) == 1:
+        return candidates[0]
+
+    raise ValueError(f"Unknown or ambiguous column {name!r}; columns are {list(df.columns)}")
+
+
+def rate_by(df, group, target="Attrition", positive="Yes"):
+    """
+    Share of rows per group where target equals positive, with group sizes
+    """
+    group, target = resolve_column(df, group), resolve_column(df, target)
+    hits = df[target].eq(positive)
+
+    result = hits.groupby(df[group], observed=True).agg(["size", "sum", "mean"])
+    result.columns = ["employees", positive.lower() if isinstance(positive, str) else "positive", "rate"]
+    result["rate"] = result["rate"].round(4)
+
+    return result.sort_values("rate", ascending=False)
+
+
+def mean_by(df, group, value):
+    """
+    Mean, median and count of a numeric column per group
+    """
+    group, value = resolve_column(df, group), resolve_column(df, value)
+
+    result = df.groupby(group, observed=True)[value].agg(["mean", "median", "count"])
+    result["mean"] = result["mean"].round(2)
+
+    return result.sort_values("mean", ascending=False)
+
+
+def crosstab(df, rows, columns, normalize=False):
+    """
+    Counts (or, with normalize, row shares) of one column against another
+    """
+    rows, columns = resolve_column(df, rows), resolve_column(df, columns)
+
+    result = pd.crosstab(df[rows], df[columns], normalize="index" if normalize else False)
+
+    return result.round(4) if normalize else result
+
+
+def top_k(df, column, k=10, by=None, ascending=False):
+    """
+    The k most frequent values of column or, with by, the k rows with the
+    largest (or smallest, with ascending) values of by
+    """
+    column = resolve_column(df, column)
+
+    if by is None:
+        return df[column].value_counts().head(k).to_frame("employees")
+
+    by = resolve_column(df, by)
+    columns = [column] if column == by else [column, by]
+    return df.nsmallest(k, by)[columns] if ascending else df.nlargest(k, by)[columns]
+
+
+def is_numeric(df, column):
+    """
+    Whether a column of df holds numbers (booleans do not count)
+    """
+    series = df[resolve_column(df, column)]
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def _as_text(result):
+    return result.to_string()
+
+
+def create_analytics_tools(df):
+    """
+    LangChain tools wrapping the aggregations above, bound to df
+    """
+    def attrition_rate_by(group: str, target: str = "Attrition", positive: str = "Yes") -> str:
+        """Rate of target == positive (default: attrition) per value of the group column, with group sizes."""
+        return _as_text(rate_by(df, group, target, positive))
+
+    def average_by(group: str, value: str) -> str:
+        """Mean, median and count of a numeric value column per value of the group column."""
+        return _as_text(mean_by(df, group, value))
+
+    def cross_tabulate(rows: str, columns: str, normalize: bool = False) -> str:
+        """Counts of the rows column against the columns column; normalize=True gives row shares."""
+        return _as_text(crosstab(df, rows, columns, normalize))
+
+    def top_values(column: str, k: int = 10, by: str = None, ascending: bool = False) -> str:
+        """The k most frequent values of column, or the k rows with the largest (ascending=True: smallest) by values."""
+        return _as_text(top_k(df, column, k, by, ascending))
+
+    return [
+        StructuredTool.from_function(function)
+        for function in (attrition_rate_by, average_by, cross_tabulate, top_values)
+    ]
+
+
+_RATE = re.compile(r"^(?:what is the )?(\w[\w ]*?) rate (?:by|per|for each|across) ([\w ]+)$")
+_MEAN = re.compile(r"^(?:what is the )?(?:average|mean) ([\w ]+?) (?:by|per|for each|across) ([\w ]+)$")
+_TOP = re.compile(r"^(?:top|most common) (\d+ )?([\w ]+?)(?: by ([\w ]+))?$")
+
+
+def normalize_question(question):
+    """
+    Lowercase, NFKC-normalize and collapse whitespace and trailing punctuation
+    """
+    text = unicodedata.normalize("NFKC", question).lower()
+    return " ".join(text.split()).strip(" ?.!")
+
+
+def answer_directly(df, question):
+    """
+    Answer a question matching one of the common shapes (rate by group,
+    average by group, top values) with the deterministic aggregations.
+    df is a DataFrame or an out-of-core dataset.
+    Returns the answer text, or None when the question needs the agent.
+
+    "X rate by group" is a rate only when X is a yes/no column containing
+    "Yes"; for a numeric column ("hourly rate by department" names
+    HourlyRate) it is answered as the mean of that column.
+    """
+    text = normalize_question(question)
+
+    if isinstance(df, pd.DataFrame):
+        rate, mean, top = partial(rate_by, df), partial(mean_by, df), partial(top_k, df)
+        numeric = partial(is_numeric, df)
+    else:
+        # Out-of-core datasets (hr_out_of_core) provide the same operations as methods
+        rate, mean, top, numeric = df.rate_by, df.mean_by, df.top_k, df.is_numeric
+
+    try:
+        if match := _RATE.match(text):
+            target, group = match.groups()
+            if numeric(target):
+                return _as_text(mean(group, target))
+
+            result = rate(group, target)
+            if not result.iloc[:, 1].sum():
+                # "Yes" never occurs, so the column is not a yes/no flag
+                return None
+            return _as_text(result)
+
+        if match := _MEAN.match(text):
+            value, group = match.groups()
+            return _as_text(mean(group, value))
+
+        if match := _TOP.match(text):
+            k, column, by = match.groups()
+            return _as_text(top(column, int(k) if k else 10, by))
+    except (ValueError, KeyError, TypeError):
+        return None
+
+    return None
+
+
+class AnswerCache:
+    """
+    Answers by (dataset version, normalized question): a dict in front of SQLite.
+
+    Entries never expire, so only store deterministic answers (e.g. from
+    answer_directly), not sampled LLM output. With path=None the cache is
+    memory-only.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._memory = {}
+        self._lock = threading.Lock()
+
+        if path:
+            with self._connect() as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS answers (key TEXT PRIMARY KEY, answer TEXT NOT NULL)")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def key(self, version, question):
+        return hashlib.sha256(f"{version}\n{normalize_question(question)}".encode("utf-8")).hexdigest()
+
+    def get(self, version, question):
+        key = self.key(version, question)
+
+        with self._lock:
+            if key in self._memory:
+                self.hits += 1
+                return self._memory[key]
+
+        row = None
+        if self.path:
+            with self._connect() as conn:
+                row = conn.execute("SELECT answer FROM answers WHERE key = ?", (key,)).fetchone()
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._memory[key] = row[0]
+
+        return row[0]
+
+    def put(self, version, question, answer):
+        key = self.key(version, question)
+
+        with self._lock:
+            self._memory[key] = answer
+
+        if self.path:
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO answers VALUES (?, ?)", (key, answer))
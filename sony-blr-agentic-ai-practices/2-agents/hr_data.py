@@ -0,0 +1,205 @@
+"""
+Cached, memory-efficient loading of the HR datasets used by the CSV agent.
+
+A CSV is parsed once and low-cardinality string columns become categoricals.
+The optimized frame can be persisted next to the CSV as Parquet or Feather
+(needs pyarrow), so later processes reload it in a fraction of the parse
+time. The cached copy is rebuilt whenever the CSV changes.
+
+Numeric columns are downcast to the smallest type that holds their values
+only in the cache file. The frame handed to the agent always has 64-bit
+numbers, so arithmetic in agent-written code (df.MonthlyIncome * 12) cannot
+overflow a narrow integer type.
+
+profile_dataset() summarizes a frame once (schema, nulls, cardinalities,
+numeric statistics and top categories); format_profile() renders it as text
+for the agent prompt, so the agent does not have to explore the data with
+df.head() or df.describe() before it can answer.
+
+Usage:
+    df = load_dataset(DEFAULT_CSV_PATH, cache_format="parquet")
+    version = dataset_version(DEFAULT_CSV_PATH)
+    prompt_profile = format_profile(profile_dataset(df))
+"""
+import hashlib
+import os
+
+import pandas as pd
+
+DEFAULT_CSV_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "lc-training-data", "hr-employees-attritions-internet.csv"
+)
+
+CACHE_FORMATS = ("parquet", "feather")
+
+
+def dataset_version(csv_path):
+    """
+    Short fingerprint of a CSV file (path, size and modification time)
+    """
+    stat = os.stat(csv_path)
+    fingerprint = f"{os.path.abspath(csv_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:16]
+
+
+def optimize_dtypes(df, max_category_ratio=0.5):
+    """
+    Convert string columns with few distinct values to categoricals.
+    Numeric columns are left alone. Returns a new DataFrame.
+    """
+    optimized = df.copy()
+
+    for column in optimized.columns:
+        series = optimized[column]
+
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+            continue
+        if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            if len(series) and series.nunique(dropna=True) / len(series) <= max_category_ratio:
+                optimized[column] = series.astype("category")
+
+    return optimized
+
+
+def downcast_numeric(df):
+    """
+    Downcast integer and float columns to the smallest type that holds their
+    values, for storage. Returns a new DataFrame.
+    """
+    downcast = df.copy()
+
+    for column in downcast.columns:
+        series = downcast[column]
+
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            downcast[column] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series):
+            downcast[column] = pd.to_numeric(series, downcast="float")
+
+    return downcast
+
+
+def widen_numeric(df):
+    """
+    Upcast integer columns to int64 and float columns to float64, undoing
+    downcast_numeric(). Returns a new DataFrame.
+    """
+    widened = {}
+
+    for column in df.columns:
+        series = df[column]
+
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            widened[column] = "int64"
+        elif pd.api.types.is_float_dtype(series):
+            widened[column] = "float64"
+
+    return df.astype(widened)
+
+
+def cache_path(csv_path, cache_format, cache_dir=None):
+    directory = cache_dir or os.path.dirname(os.path.abspath(csv_path))
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(directory, f"{name}.{dataset_version(csv_path)}.{cache_format}")
+
+
+def _read_cache(path, cache_format):
+    if cache_format == "parquet":
+        return widen_numeric(pd.read_parquet(path))
+    return widen_numeric(pd.read_feather(path))
+
+
+def _write_cache(df, path, cache_format):
+    df = downcast_numeric(df)
+    if cache_format == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.reset_index(drop=True).to_feather(path)
+
+
+def load_dataset(csv_path=DEFAULT_CSV_PATH, cache_format=None, cache_dir=None, max_category_ratio=0.5):
+    """
+    Load a CSV as a dtype-optimized DataFrame.
+
+    With cache_format ("parquet" or "feather") the optimized frame is read
+    from, or written to, a cache file named after the CSV's version; numeric
+    columns are stored downcast and widened to 64 bits again on load. If
+    pyarrow is not installed the cache is skipped and the CSV is parsed.
+    """
+    if cache_format is not None and cache_format not in CACHE_FORMATS:
+        raise ValueError(f"cache_format must be one of {CACHE_FORMATS}, got {cache_format!r}")
+
+    path = cache_path(csv_path, cache_format, cache_dir) if cache_format else None
+
+    if path and os.path.exists(path):
+        try:
+            return _read_cache(path, cache_format)
+        except ImportError:
+            path = None
+
+    # utf-8-sig drops the byte order mark some HR exports start with
+    df = optimize_dtypes(pd.read_csv(csv_path, encoding="utf-8-sig"), max_category_ratio)
+
+    if path:
+        try:
+            _write_cache(df, path, cache_format)
+        except ImportError:
+            pass
+
+    return df
+
+
+def profile_dataset(df, top_categories=5):
+    """
+    Profile of a DataFrame: row count and, per column, dtype, null count,
+    number of distinct values, min/mean/max for numeric columns and the
+    most frequent values for the others
+    """
+    columns = {}
+
+    for column in df.columns:
+        series = df[column]
+        info = {
+            "dtype": str(series.dtype),
+            "nulls": int(series.isna().sum()),
+            "distinct": int(series.nunique(dropna=True)),
+        }
+
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            info.update(
+                min=series.min().item(),
+                mean=round(float(series.mean()), 2),
+                max=series.max().item(),
+            )
+        else:
+            counts = series.value_counts(dropna=True).head(top_categories)
+            info["top"] = {str(value): int(count) for value, count in counts.items()}
+
+        columns[str(column)] = info
+
+    return {"rows": len(df), "columns": columns}
+
+
+def format_profile(profile):
+    """
+    Render a dataset profile as compact text, one line per column
+    """
+    lines = [f"{profile['rows']} rows, {len(profile['columns'])} columns:"]
+
+    for name, info in profile["columns"].items():
+        line = f"- {name} ({info['dtype']}, {info['distinct']} distinct, {info['nulls']} nulls)"
+        if "top" in info:
+            line += ": " + ", ".join(f"{value} ({count})" for value, count in info["top"].items())
+        else:
+            line += f": min {info['min']}, mean {info['mean']}, max {info['max']}"
+        lines.append(line)
+
+    return "\n".join(lines)
+
+
+def memory_usage_mb(df):
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
@@ -0,0 +1,325 @@
+"""
+Out-of-core backend for the HR agent, for exports too large for memory.
+
+The pandas agent needs the whole dataset as one DataFrame. The datasets
+here never load it: DuckDBDataset queries the CSV (or a Parquet copy) in
+place under a memory limit, and ChunkedDataset, used when duckdb is not
+installed, streams the CSV in fixed-size chunks and combines partial
+aggregates. Both offer the same operations:
+  * sample(n): a uniform random sample, for exploratory questions,
+  * rate_by / mean_by / top_k: full-scan aggregates, for final answers,
+  * row_count() and is_numeric(column).
+DuckDBDataset additionally runs read-only SQL (sql()). It copies the file
+once into an on-disk DuckDB table and then disables external access, so
+LLM-written SQL cannot read other files (read_text, read_csv, ...).
+
+create_out_of_core_agent() builds a tool-calling agent on top of a dataset,
+so memory stays bounded by the chunk size or DuckDB's memory limit rather
+than by the file size. Exploration code written by the agent runs in a
+hr_sandbox.SandboxPool over the sample, never in the app process.
+
+Usage:
+    dataset = open_dataset("hr-full-export.parquet")
+    print(dataset.rate_by("Department"))
+    agent = create_out_of_core_agent(llm, dataset, profile_text)
+"""
+import atexit
+import os
+import re
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+from langchain.agents import AgentExecutor, create_tool_calling_agent
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.tools import StructuredTool
+
+from hr_analytics import is_numeric, resolve_column
+from hr_sandbox import SandboxPool
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+BACKENDS = ("auto", "duckdb", "chunked")
+
+_READ_ONLY = re.compile(r"^\s*(select|with|describe|summarize)\b", re.IGNORECASE)
+_NUMERIC_TYPE = re.compile(r"^(u?(tinyint|smallint|integer|bigint|hugeint)|float|double|real|decimal)", re.IGNORECASE)
+
+
+def _quote(identifier):
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def _rate_frame(totals, label):
+    totals.columns = ["employees", label]
+    totals = totals.astype("int64")
+    totals["rate"] = (totals[label] / totals["employees"]).round(4)
+    return totals.sort_values("rate", ascending=False)
+
+
+class ChunkedDataset:
+    """
+    A CSV read in chunks of chunksize rows; only the columns an operation
+    needs are parsed. Column types are inferred from the first chunk.
+    """
+
+    def __init__(self, path, chunksize=100_000):
+        self.path = path
+        self.chunksize = chunksize
+        # No rows are kept, only the inferred dtypes
+        self._empty = pd.read_csv(path, nrows=chunksize, encoding="utf-8-sig").iloc[:0]
+        self.columns = list(self._empty.columns)
+
+    def chunks(self, columns=None):
+        return pd.read_csv(self.path, usecols=columns, chunksize=self.chunksize, encoding="utf-8-sig")
+
+    def row_count(self):
+        return sum(len(chunk) for chunk in self.chunks(self.columns[:1]))
+
+    def is_numeric(self, column):
+        return is_numeric(self._empty, column)
+
+    def sample(self, n=1000, seed=0):
+        """
+        Uniform random sample of n rows: every row draws a random key and
+        the n smallest keys seen so far are kept
+        """
+        rng = np.random.default_rng(seed)
+        kept = None
+
+        for chunk in self.chunks():
+            chunk = chunk.assign(_sample_key=rng.random(len(chunk)))
+            kept = chunk if kept is None else pd.concat([kept, chunk])
+            kept = kept.nsmallest(n, "_sample_key")
+
+        if kept is None:
+            return pd.DataFrame(columns=self.columns)
+
+        return kept.sort_index().drop(columns="_sample_key")
+
+    def rate_by(self, group, target="Attrition", positive="Yes"):
+        group, target = resolve_column(self, group), resolve_column(self, target)
+        totals = None
+
+        for chunk in self.chunks([group, target]):
+            part = chunk[target].eq(positive).groupby(chunk[group]).agg(["size", "sum"])
+            totals = part if totals is None else totals.add(part, fill_value=0)
+
+        label = positive.lower() if isinstance(positive, str) else "positive"
+        if totals is None:
+            return pd.DataFrame(columns=["employees", label, "rate"])
+
+        return _rate_frame(totals.rename_axis(group), label)
+
+    def mean_by(self, group, value):
+        group, value = resolve_column(self, group), resolve_column(self, value)
+        totals = None
+
+        for chunk in self.chunks([group, value]):
+            part = chunk.groupby(group)[value].agg(["sum", "count"])
+            totals = part if totals is None else totals.add(part, fill_value=0)
+
+        if totals is None:
+            return pd.DataFrame(columns=["mean", "count"])
+
+        result = pd.DataFrame({
+            "mean": (totals["sum"] / totals["count"]).round(2),
+            "count": totals["count"].astype("int64"),
+        })
+        return result.sort_values("mean", ascending=False)
+
+    def top_k(self, column, k=10, by=None, ascending=False):
+        column = resolve_column(self, column)
+
+        if by is None:
+            counts = None
+            for chunk in self.chunks([column]):
+                part = chunk[column].value_counts()
+                counts = part if counts is None else counts.add(part, fill_value=0)
+            counts = counts if counts is not None else pd.Series(dtype="int64")
+            return counts.astype("int64").nlargest(k).to_frame("employees")
+
+        by = resolve_column(self, by)
+        columns = [column] if column == by else [column, by]
+        best = None
+
+        for chunk in self.chunks(columns):
+            part = chunk.nsmallest(k, by) if ascending else chunk.nlargest(k, by)
+            best = part if best is None else pd.concat([best, part])
+            best = best.nsmallest(k, by) if ascending else best.nlargest(k, by)
+
+        return best if best is not None else pd.DataFrame(columns=columns)
+
+
+class DuckDBDataset:
+    """
+    A CSV or Parquet file loaded into an on-disk DuckDB database as the
+    table `data`. DuckDB spills to disk rather than exceed memory_limit.
+
+    Once the table is loaded, external access is disabled and the
+    configuration locked, so queries can only read `data`.
+    """
+
+    def __init__(self, path, memory_limit="1GB", max_rows=200):
+        if duckdb is None:
+            raise ImportError("duckdb is not installed; use ChunkedDataset or pip install duckdb")
+
+        self.path = path
+        self.max_rows = max_rows
+        self._directory = tempfile.mkdtemp(prefix="hr-duckdb-")
+        self.connection = duckdb.connect(os.path.join(self._directory, "data.duckdb"))
+        self.connection.execute(f"SET memory_limit = '{memory_limit}'")
+
+        reader = "read_parquet" if path.endswith(".parquet") else "read_csv_auto"
+        escaped = path.replace("'", "''")
+        self.connection.execute(f"CREATE TABLE data AS SELECT * FROM {reader}('{escaped}')")
+        self.connection.execute("SET enable_external_access = false")
+        self.connection.execute("SET lock_configuration = true")
+        described = self.connection.execute("DESCRIBE data").fetchall()
+        self.columns = [row[0] for row in described]
+        self._types = {row[0]: row[1] for row in described}
+
+        atexit.register(self.close)
+
+    def close(self):
+        self.connection.close()
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    def _query(self, query, parameters=None):
+        # A cursor per call: the connection itself must not be shared across threads
+        return self.connection.cursor().execute(query, parameters or []).df()
+
+    def row_count(self):
+        return int(self._query("SELECT COUNT(*) AS n FROM data")["n"][0])
+
+    def is_numeric(self, column):
+        return bool(_NUMERIC_TYPE.match(self._types[resolve_column(self, column)]))
+
+    def sample(self, n=1000, seed=0):
+        return self._query(f"SELECT * FROM data USING SAMPLE reservoir({int(n)} ROWS) REPEATABLE ({int(seed)})")
+
+    def sql(self, query):
+        """
+        Run a read-only query against `data`, returning at most max_rows rows
+        """
+        query = query.strip().rstrip(";")
+        if not _READ_ONLY.match(query) or ";" in query:
+            raise ValueError("Only a single SELECT, WITH, DESCRIBE or SUMMARIZE statement is allowed.")
+
+        return self._query(f"SELECT * FROM ({query}) LIMIT {int(self.max_rows)}")
+
+    def rate_by(self, group, target="Attrition", positive="Yes"):
+        group, target = resolve_column(self, group), resolve_column(self, target)
+        label = positive.lower() if isinstance(positive, str) else "positive"
+
+        totals = self._query(
+            f"SELECT {_quote(group)}, COUNT(*), COUNT(*) FILTER (WHERE {_quote(target)} = ?) "
+            f"FROM data GROUP BY 1",
+            [positive]
+        ).set_index(group)
+        return _rate_frame(totals, label)
+
+    def mean_by(self, group, value):
+        group, value = resolve_column(self, group), resolve_column(self, value)
+
+        result = self._query(
+            f"SELECT {_quote(group)}, ROUND(AVG({_quote(value)}), 2) AS mean, COUNT({_quote(value)}) AS count "
+            f"FROM data GROUP BY 1 ORDER BY mean DESC"
+        )
+        return result.set_index(group)
+
+    def top_k(self, column, k=10, by=None, ascending=False):
+        column = resolve_column(self, column)
+
+        if by is None:
+            result = self._query(
+                f"SELECT {_quote(column)}, COUNT(*) AS employees FROM data GROUP BY 1 ORDER BY employees DESC LIMIT {int(k)}"
+            )
+            return result.set_index(column)
+
+        by = resolve_column(self, by)
+        columns = _quote(column) if column == by else f"{_quote(column)}, {_quote(by)}"
+        order = "ASC" if ascending else "DESC"
+        return self._query(f"SELECT {columns} FROM data ORDER BY {_quote(by)} {order} LIMIT {int(k)}")
+
+
+def open_dataset(path, backend="auto", chunksize=100_000, memory_limit="1GB"):
+    """
+    Open a dataset out of core: DuckDB when installed (or requested),
+    chunked pandas otherwise. Parquet files need the DuckDB backend.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+
+    if backend == "duckdb" or (backend == "auto" and duckdb is not None):
+        return DuckDBDataset(path, memory_limit=memory_limit)
+
+    return ChunkedDataset(path, chunksize=chunksize)
+
+
+def create_out_of_core_tools(dataset, sample_rows=1000, sandbox=None):
+    """
+    LangChain tools over an out-of-core dataset: sandboxed code on a sample
+    for exploration, full-scan aggregates and, with DuckDB, read-only SQL.
+
+    sandbox is a SandboxPool whose DataFrame is the sample, bound to the
+    name `sample`; by default a one-worker pool is started on first use.
+    """
+    pool = {"sandbox": sandbox}
+
+    def explore_sample(code: str) -> str:
+        """Evaluate pandas code on `sample`, a random sample of the dataset, for exploration only (e.g. "sample['JobRole'].unique()"). Do not use it for final numbers."""
+        if pool["sandbox"] is None:
+            pool["sandbox"] = SandboxPool(dataset.sample(sample_rows), workers=1, name="sample")
+        return pool["sandbox"].run(code)
+
+    def attrition_rate_by(group: str, target: str = "Attrition", positive: str = "Yes") -> str:
+        """Exact rate of target == positive (default: attrition) per value of the group column, over the full dataset."""
+        return dataset.rate_by(group, target, positive).to_string()
+
+    def average_by(group: str, value: str) -> str:
+        """Exact mean and count of a numeric value column per value of the group column, over the full dataset."""
+        return dataset.mean_by(group, value).to_string()
+
+    def top_values(column: str, k: int = 10, by: str = None, ascending: bool = False) -> str:
+        """The k most frequent values of column, or the k rows with the largest (ascending=True: smallest) by values, over the full dataset."""
+        return dataset.top_k(column, k, by, ascending).to_string()
+
+    def count_rows() -> str:
+        """Exact number of rows in the full dataset."""
+        return str(dataset.row_count())
+
+    functions = [explore_sample, attrition_rate_by, average_by, top_values, count_rows]
+
+    if isinstance(dataset, DuckDBDataset):
+        def run_sql(query: str) -> str:
+            """Run one read-only DuckDB SQL query against the full dataset, available as the table `data`. Use it for exact answers the other tools cannot give; aggregate in SQL rather than selecting raw rows."""
+            return dataset.sql(query).to_string()
+
+        functions.append(run_sql)
+
+    return [StructuredTool.from_function(function) for function in functions]
+
+
+def create_out_of_core_agent(llm, dataset, profile, verbose=True, sandbox=None):
+    """
+    Tool-calling agent answering questions about an out-of-core dataset;
+    sandbox is passed to create_out_of_core_tools
+    """
+    prompt = ChatPromptTemplate.from_messages([
+        ("system",
+         "You answer questions about an HR dataset that is too large to load into memory.\n"
+         "This is a profile of the dataset:\n\n{profile}\n\n"
+         "Use explore_sample only to look at values; compute every number you report with the "
+         "full-dataset tools."),
+        ("human", "{input}"),
+        ("placeholder", "{agent_scratchpad}"),
+    ]).partial(profile=profile)
+
+    tools = create_out_of_core_tools(dataset, sandbox=sandbox)
+    agent = create_tool_calling_agent(llm, tools, prompt)
+
+    return AgentExecutor(agent=agent, tools=tools, verbose=verbose, handle_parsing_errors=True)
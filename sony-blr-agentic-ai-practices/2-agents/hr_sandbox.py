@@ -0,0 +1,272 @@
+"""
+Sandboxed execution of agent-generated pandas code.
+
+The pandas agent's python_repl_ast tool executes LLM-written code inside the
+Streamlit process, so one runaway df.apply or cartesian merge stalls the app
+for every user. SandboxPool runs that code in a pool of warm worker
+processes instead:
+  * the DataFrame is snapshotted to disk once; workers load it when they
+    start. With pyarrow the snapshot is uncompressed Feather, memory-mapped
+    by every worker: numeric columns without nulls stay views of the same
+    read-only pages, while string, categorical and nullable columns are
+    converted into a private copy per worker. Without pyarrow it is a
+    pickle and every worker holds a full copy. Mapped pages and private
+    copies both count towards the memory limit,
+  * every call is limited in CPU time (RLIMIT_CPU), wall time (the caller
+    stops waiting and kills the worker) and memory (RLIMIT_AS),
+  * workers are started ahead of time and replaced when they die, so a call
+    never pays for process start-up and data loading.
+
+create_sandbox_tool() returns a drop-in replacement for python_repl_ast.
+
+Usage:
+    pool = SandboxPool(df, workers=2, cpu_seconds=10, wall_seconds=20, memory_mb=2048)
+    print(pool.run("df.groupby('Department')['MonthlyIncome'].mean()"))
+    agent.tools = [create_sandbox_tool(pool) if tool.name == "python_repl_ast" else tool for tool in agent.tools]
+"""
+import ast
+import atexit
+import contextlib
+import io
+import math
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import threading
+
+import pandas as pd
+from langchain_core.tools import Tool
+
+try:
+    import resource
+except ImportError:  # not available on Windows: only the wall-time limit applies
+    resource = None
+
+
+class SandboxError(RuntimeError):
+    pass
+
+
+def _snapshot(df, directory):
+    try:
+        path = os.path.join(directory, "data.feather")
+        # Uncompressed, in one record batch: columns can then be mapped without copying
+        df.reset_index(drop=True).to_feather(path, compression="uncompressed", chunksize=max(len(df), 1))
+        return path, "feather"
+    except ImportError:
+        path = os.path.join(directory, "data.pickle")
+        df.to_pickle(path)
+        return path, "pickle"
+
+
+def _load_snapshot(path, data_format):
+    if data_format == "feather":
+        from pyarrow import feather
+
+        # One block per column, so numeric columns are not consolidated into a copy
+        return feather.read_table(path, memory_map=True).to_pandas(split_blocks=True)
+    return pd.read_pickle(path)
+
+
+def _execute(code, namespace):
+    """
+    Run code like python_repl_ast: statements are executed and the value of
+    a final expression is returned, or else whatever was printed
+    """
+    tree = ast.parse(code)
+    body, last = tree.body[:-1], tree.body[-1:] if tree.body else []
+    stdout = io.StringIO()
+
+    with contextlib.redirect_stdout(stdout):
+        exec(compile(ast.Module(body=body, type_ignores=[]), "<agent>", "exec"), namespace)
+        if last and isinstance(last[0], ast.Expr):
+            result = eval(compile(ast.Expression(last[0].value), "<agent>", "eval"), namespace)
+            if result is not None:
+                print(result)
+        elif last:
+            exec(compile(ast.Module(body=last, type_ignores=[]), "<agent>", "exec"), namespace)
+
+    return stdout.getvalue()
+
+
+def _worker(connection, path, data_format, cpu_seconds, memory_mb, name):
+    if resource is not None and memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    import numpy as np
+
+    try:
+        df = _load_snapshot(path, data_format)
+    except MemoryError:
+        connection.send(("failed", f"MemoryError: loading the data needs more than the {memory_mb} MB memory limit"))
+        return
+    except BaseException as e:
+        connection.send(("failed", f"{type(e).__name__}: {e}"))
+        return
+    connection.send(("ready", None))
+
+    while True:
+        try:
+            code = connection.recv()
+        except EOFError:
+            return
+
+        if resource is not None and cpu_seconds:
+            # RLIMIT_CPU counts the worker's whole lifetime: allow cpu_seconds more
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            used = math.ceil(usage.ru_utime + usage.ru_stime)
+            resource.setrlimit(resource.RLIMIT_CPU, (used + cpu_seconds, resource.RLIM_INFINITY))
+
+        # A shallow copy, so added or dropped columns do not leak into later calls
+        namespace = {name: df.copy(deep=False), "pd": pd, "np": np}
+        try:
+            connection.send(("ok", _execute(code, namespace)))
+        except MemoryError:
+            connection.send(("error", f"MemoryError: the code exceeded the {memory_mb} MB memory limit"))
+        except Exception as e:
+            connection.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    def __init__(self, context, path, data_format, cpu_seconds, memory_mb, name):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(
+            target=_worker,
+            args=(child, path, data_format, cpu_seconds, memory_mb, name),
+            daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.ready = False
+        self.failed = False
+
+    def wait_ready(self, timeout):
+        if not self.ready:
+            if not self.connection.poll(timeout):
+                raise SandboxError("Sandbox worker did not start in time.")
+            try:
+                status, message = self.connection.recv()
+            except (EOFError, OSError):
+                self.process.join(1)
+                status, message = "failed", f"the process exited with code {self.process.exitcode}"
+            if status != "ready":
+                self.failed = True
+                raise SandboxError(f"Sandbox worker failed to start: {message}")
+            self.ready = True
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(1)
+        self.connection.close()
+
+
+class SandboxPool:
+    """
+    A fixed number of warm worker processes executing code against a
+    read-only snapshot of a DataFrame, with per-call CPU, wall-time and
+    memory limits. memory_mb must leave room for the loaded snapshot. Safe to use from several threads; calls beyond the
+    number of workers wait for a free worker. The code sees the DataFrame
+    as the variable name ("df" by default).
+    """
+
+    def __init__(self, df, workers=2, cpu_seconds=10, wall_seconds=20, memory_mb=2048, start_timeout=60,
+                 name="df"):
+        self.name = name
+        self.cpu_seconds = cpu_seconds
+        self.wall_seconds = wall_seconds
+        self.memory_mb = memory_mb
+        self.start_timeout = start_timeout
+
+        self._directory = tempfile.mkdtemp(prefix="hr-sandbox-")
+        self.path, self.data_format = _snapshot(df, self._directory)
+
+        # spawn: forking a multi-threaded Streamlit server is not safe
+        self._context = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._start_error = None
+
+        for _ in range(workers):
+            self._idle.put(self._start_worker())
+
+        atexit.register(self.close)
+
+    def _start_worker(self):
+        worker = _Worker(self._context, self.path, self.data_format, self.cpu_seconds, self.memory_mb, self.name)
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def _replace(self, worker):
+        worker.kill()
+        with self._lock:
+            self._workers.remove(worker)
+        if not self._closed:
+            self._idle.put(self._start_worker())
+
+    def run(self, code):
+        """
+        Execute code in a worker and return its output. Errors in the code,
+        and exceeded limits, are returned as text for the agent to read.
+        Raises SandboxError if a worker cannot start, on this call and every
+        later one.
+        """
+        if self._closed:
+            raise SandboxError("The sandbox pool is closed.")
+        if self._start_error is not None:
+            raise self._start_error
+
+        worker = self._idle.get()
+
+        try:
+            worker.wait_ready(self.start_timeout)
+            worker.connection.send(code)
+
+            if not worker.connection.poll(self.wall_seconds):
+                self._replace(worker)
+                return f"TimeoutError: the code did not finish within {self.wall_seconds} seconds"
+
+            status, output = worker.connection.recv()
+        except (EOFError, OSError, BrokenPipeError):
+            # The worker was killed, typically by the CPU time limit
+            self._replace(worker)
+            return f"Error: the code was stopped (CPU limit of {self.cpu_seconds} seconds or a crash)"
+        except SandboxError as e:
+            if worker.failed:
+                # A worker that cannot load the data will not do better on a restart
+                self._start_error = e
+            self._replace(worker)
+            raise
+
+        self._idle.put(worker)
+        return output
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.kill()
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+
+def create_sandbox_tool(pool, name="python_repl_ast"):
+    """
+    Tool with the name and contract of the pandas agent's Python tool that
+    executes code in the sandbox pool
+    """
+    return Tool(
+        name=name,
+        func=pool.run,
+        description=(
+            "A Python shell. Use this to execute python commands. Input should be a valid python command. "
+            "When using this tool, sometimes output is abbreviated - make sure it does not look abbreviated "
+            "before using it in your answer. The dataframe `df` is read-only; assign changes to a new variable."
+        )
+    )
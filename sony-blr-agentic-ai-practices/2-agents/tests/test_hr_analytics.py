@@ -0,0 +1,91 @@
+import pytest
+
+from hr_analytics import AnswerCache, answer_directly, mean_by, rate_by, top_k
+from hr_data import DEFAULT_CSV_PATH, load_dataset
+from hr_out_of_core import ChunkedDataset
+
+
+@pytest.fixture(scope="module")
+def df():
+    return load_dataset(DEFAULT_CSV_PATH)
+
+
+@pytest.fixture(scope="module")
+def chunked():
+    return ChunkedDataset(DEFAULT_CSV_PATH, chunksize=300)
+
+
+@pytest.mark.parametrize("data", ["df", "chunked"])
+def test_rate_question_on_yes_no_column(request, data, df):
+    answer = answer_directly(request.getfixturevalue(data), "What is the attrition rate by department?")
+
+    assert answer == rate_by(df, "Department").to_string()
+
+
+@pytest.mark.parametrize("data", ["df", "chunked"])
+@pytest.mark.parametrize("question, group, value", [
+    ("What is the hourly rate by department?", "Department", "HourlyRate"),
+    ("daily rate by job role", "JobRole", "DailyRate"),
+])
+def test_rate_question_on_numeric_column_is_a_mean(request, data, question, group, value):
+    dataset = request.getfixturevalue(data)
+    means = mean_by(dataset, group, value) if data == "df" else dataset.mean_by(group, value)
+
+    assert answer_directly(dataset, question) == means.to_string()
+
+
+@pytest.mark.parametrize("data", ["df", "chunked"])
+def test_rate_question_without_yes_values_needs_the_agent(request, data):
+    assert answer_directly(request.getfixturevalue(data), "gender rate by department") is None
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("Average monthly income by job role?", lambda df: mean_by(df, "JobRole", "MonthlyIncome")),
+    ("mean age per department", lambda df: mean_by(df, "Department", "Age")),
+    ("Top 3 job role", lambda df: top_k(df, "JobRole", 3)),
+    ("most common education field", lambda df: top_k(df, "EducationField", 10)),
+    ("top 5 employee number by monthly income", lambda df: top_k(df, "EmployeeNumber", 5, "MonthlyIncome")),
+])
+def test_answer_directly_question_shapes(df, question, expected):
+    assert answer_directly(df, question) == expected(df).to_string()
+
+
+@pytest.mark.parametrize("question", [
+    "Why do people in sales leave?",
+    "average shoe size by department",
+    "attrition rate by favourite colour",
+])
+def test_answer_directly_leaves_other_questions_to_the_agent(df, question):
+    assert answer_directly(df, question) is None
+
+
+def test_rate_by_matches_a_manual_count(df):
+    result = rate_by(df, "Department")
+    sales = df[df.Department == "Sales"]
+
+    assert result.loc["Sales", "employees"] == len(sales)
+    assert result.loc["Sales", "yes"] == (sales.Attrition == "Yes").sum()
+    assert result.loc["Sales", "rate"] == round((sales.Attrition == "Yes").mean(), 4)
+
+
+def test_answer_cache_normalizes_questions_and_persists(tmp_path):
+    path = str(tmp_path / "answers.sqlite")
+    cache = AnswerCache(path)
+
+    assert cache.get("v1", "Attrition rate by department?") is None
+    cache.put("v1", "Attrition rate by department?", "answer")
+
+    assert cache.get("v1", "  attrition RATE by department ") == "answer"
+    assert cache.get("v2", "Attrition rate by department?") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    reopened = AnswerCache(path)
+    assert reopened.get("v1", "attrition rate by department") == "answer"
+
+
+def test_memory_only_answer_cache():
+    cache = AnswerCache()
+    cache.put("v1", "q", "a")
+
+    assert cache.get("v1", "Q?") == "a"
+    assert AnswerCache().get("v1", "q") is None
@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+
+from hr_data import (
+    DEFAULT_CSV_PATH,
+    downcast_numeric,
+    format_profile,
+    load_dataset,
+    optimize_dtypes,
+    profile_dataset,
+    widen_numeric,
+)
+
+
+@pytest.fixture(scope="module")
+def raw():
+    return pd.read_csv(DEFAULT_CSV_PATH, encoding="utf-8-sig")
+
+
+def test_optimized_frame_keeps_arithmetic_of_raw_frame(raw):
+    optimized = load_dataset(DEFAULT_CSV_PATH)
+
+    for expression in ("MonthlyIncome * 12", "Age * Age", "TotalWorkingYears * 12", "DailyRate * 365"):
+        pd.testing.assert_series_equal(optimized.eval(expression), raw.eval(expression), check_names=False)
+    assert (optimized.MonthlyIncome * 12).max() == (raw.MonthlyIncome * 12).max()
+
+
+def test_low_cardinality_strings_become_categories(raw):
+    optimized = optimize_dtypes(raw)
+
+    assert optimized["Department"].dtype == "category"
+    assert optimized["Department"].astype(str).equals(raw["Department"])
+    assert optimized["MonthlyIncome"].dtype == raw["MonthlyIncome"].dtype
+
+
+def test_widen_numeric_undoes_downcast(raw):
+    stored = downcast_numeric(raw)
+    assert stored["Age"].dtype.itemsize < 8
+
+    pd.testing.assert_frame_equal(widen_numeric(stored), raw)
+
+
+def test_cached_frame_has_wide_numbers(raw, tmp_path):
+    pytest.importorskip("pyarrow")
+
+    first = load_dataset(DEFAULT_CSV_PATH, cache_format="feather", cache_dir=tmp_path)
+    cached = load_dataset(DEFAULT_CSV_PATH, cache_format="feather", cache_dir=tmp_path)
+
+    assert list(tmp_path.iterdir())
+    pd.testing.assert_frame_equal(cached, first)
+    assert (cached.MonthlyIncome * 12).equals(raw.MonthlyIncome * 12)
+
+
+def test_profile_describes_every_column(raw):
+    df = optimize_dtypes(raw)
+    profile = profile_dataset(df, top_categories=2)
+
+    assert profile["rows"] == len(df)
+    assert set(profile["columns"]) == set(df.columns)
+
+    age = profile["columns"]["Age"]
+    assert (age["min"], age["max"]) == (int(raw.Age.min()), int(raw.Age.max()))
+    assert age["mean"] == round(raw.Age.mean(), 2)
+
+    department = profile["columns"]["Department"]
+    assert department["distinct"] == raw.Department.nunique()
+    assert list(department["top"]) == list(raw.Department.value_counts().index[:2])
+
+
+def test_format_profile_renders_one_line_per_column(raw):
+    text = format_profile(profile_dataset(raw[["Age", "Attrition"]]))
+    lines = text.splitlines()
+
+    assert lines[0] == f"{len(raw)} rows, 2 columns:"
+    assert lines[1].startswith("- Age (int64, ") and "min 18" in lines[1]
+    assert lines[2].startswith("- Attrition (") and "Yes (" in lines[2]
@@ -0,0 +1,116 @@
+import os
+
+import pandas as pd
+import pytest
+
+from hr_analytics import mean_by, rate_by, top_k
+from hr_data import DEFAULT_CSV_PATH
+from hr_out_of_core import ChunkedDataset, DuckDBDataset, create_out_of_core_tools, open_dataset
+
+
+@pytest.fixture(scope="module")
+def df():
+    return pd.read_csv(DEFAULT_CSV_PATH, encoding="utf-8-sig")
+
+
+@pytest.fixture(scope="module")
+def chunked():
+    # A chunk size that does not divide the row count, so groups span chunks
+    return ChunkedDataset(DEFAULT_CSV_PATH, chunksize=317)
+
+
+def test_row_count_and_columns(chunked, df):
+    assert chunked.row_count() == len(df)
+    assert chunked.columns == list(df.columns)
+
+
+@pytest.mark.parametrize("group", ["Department", "JobRole", "OverTime"])
+def test_rate_by_matches_pandas(chunked, df, group):
+    expected = rate_by(df, group)
+    result = chunked.rate_by(group).loc[expected.index]
+
+    assert result["employees"].tolist() == expected["employees"].tolist()
+    assert result["yes"].tolist() == expected["yes"].tolist()
+    assert result["rate"].tolist() == expected["rate"].tolist()
+
+
+@pytest.mark.parametrize("group, value", [("Department", "MonthlyIncome"), ("JobRole", "Age")])
+def test_mean_by_matches_pandas(chunked, df, group, value):
+    expected = mean_by(df, group, value)
+    result = chunked.mean_by(group, value).loc[expected.index]
+
+    assert result["mean"].tolist() == expected["mean"].tolist()
+    assert result["count"].tolist() == expected["count"].tolist()
+
+
+def test_top_k_matches_pandas(chunked, df):
+    pd.testing.assert_frame_equal(chunked.top_k("JobRole", 3), top_k(df, "JobRole", 3), check_names=False)
+
+    result = chunked.top_k("EmployeeNumber", 5, by="MonthlyIncome")
+    expected = top_k(df, "EmployeeNumber", 5, by="MonthlyIncome")
+    assert result["MonthlyIncome"].tolist() == expected["MonthlyIncome"].tolist()
+
+    result = chunked.top_k("Age", 4, by="Age", ascending=True)
+    assert result["Age"].tolist() == sorted(df.Age)[:4]
+
+
+def test_sample_is_a_reproducible_subset(chunked, df):
+    sample = chunked.sample(100, seed=1)
+
+    assert len(sample) == 100
+    assert sample.index.is_unique
+    pd.testing.assert_frame_equal(sample, df.loc[sample.index])
+    pd.testing.assert_frame_equal(sample, chunked.sample(100, seed=1))
+
+
+def test_is_numeric(chunked):
+    assert chunked.is_numeric("monthly income")
+    assert not chunked.is_numeric("Attrition")
+
+
+def test_open_dataset_backends():
+    assert isinstance(open_dataset(DEFAULT_CSV_PATH, backend="chunked"), ChunkedDataset)
+    with pytest.raises(ValueError):
+        open_dataset(DEFAULT_CSV_PATH, backend="spark")
+
+
+def test_tools_without_sql_for_chunked_datasets(chunked):
+    tools = {tool.name: tool for tool in create_out_of_core_tools(chunked)}
+
+    assert "run_sql" not in tools
+    assert tools["count_rows"].invoke({}) == str(chunked.row_count())
+
+
+@pytest.fixture(scope="module")
+def duckdb_dataset():
+    pytest.importorskip("duckdb")
+    dataset = DuckDBDataset(DEFAULT_CSV_PATH)
+    yield dataset
+    dataset.close()
+
+
+def test_duckdb_matches_pandas(duckdb_dataset, df):
+    expected = rate_by(df, "Department")
+    result = duckdb_dataset.rate_by("Department").loc[expected.index]
+
+    assert duckdb_dataset.row_count() == len(df)
+    assert result["yes"].tolist() == expected["yes"].tolist()
+    assert duckdb_dataset.is_numeric("MonthlyIncome") and not duckdb_dataset.is_numeric("Attrition")
+
+
+@pytest.mark.parametrize("query", [
+    "DELETE FROM data",
+    "SELECT 1; DROP TABLE data",
+    f"SELECT * FROM read_csv_auto('{DEFAULT_CSV_PATH}')",
+    "SELECT * FROM read_text('/etc/passwd')",
+])
+def test_duckdb_sql_is_read_only_and_has_no_file_access(duckdb_dataset, query):
+    with pytest.raises(Exception):
+        duckdb_dataset.sql(query)
+
+
+def test_explore_sample_runs_in_the_sandbox(chunked):
+    tools = {tool.name: tool for tool in create_out_of_core_tools(chunked, sample_rows=50)}
+
+    assert tools["explore_sample"].invoke({"code": "len(sample)"}) == "50\n"
+    assert tools["explore_sample"].invoke({"code": "import os\nos.getpid()"}) != f"{os.getpid()}\n"
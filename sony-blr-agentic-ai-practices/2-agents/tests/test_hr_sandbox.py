@@ -0,0 +1,61 @@
+import sys
+import time
+
+import pandas as pd
+import pytest
+
+from hr_sandbox import SandboxError, SandboxPool, create_sandbox_tool
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="the CPU and memory limits need resource")
+
+
+@pytest.fixture(scope="module")
+def pool():
+    df = pd.DataFrame({"Department": ["Sales", "R&D", "Sales"], "MonthlyIncome": [5000, 7000, 6000]})
+    pool = SandboxPool(df, workers=1, cpu_seconds=2, wall_seconds=5, memory_mb=1024)
+    yield pool
+    pool.close()
+
+
+def test_runs_code_like_python_repl(pool):
+    assert pool.run("x = df.MonthlyIncome.sum()\nx") == "18000\n"
+    assert pool.run("print(len(df))") == "3\n"
+    assert create_sandbox_tool(pool).invoke("df.Department.nunique()") == "2\n"
+
+
+def test_errors_and_changes_do_not_leak(pool):
+    assert pool.run("1/0").startswith("ZeroDivisionError")
+    pool.run("df['extra'] = 1")
+    assert pool.run("list(df.columns)") == "['Department', 'MonthlyIncome']\n"
+
+
+def test_cpu_limit_allows_the_full_budget(pool):
+    pool.run("1")
+    started = time.perf_counter()
+
+    assert "CPU limit" in pool.run("while True: pass")
+    assert time.perf_counter() - started >= 1.9
+    assert pool.run("len(df)") == "3\n"
+
+
+def test_wall_time_limit(pool):
+    started = time.perf_counter()
+
+    assert pool.run("import time\ntime.sleep(60)").startswith("TimeoutError")
+    assert time.perf_counter() - started < 10
+    assert pool.run("len(df)") == "3\n"
+
+
+def test_memory_limit(pool):
+    assert pool.run("a = bytearray(2 * 1024 ** 3)").startswith("MemoryError")
+    assert pool.run("len(df)") == "3\n"
+
+
+def test_worker_failing_at_start_raises():
+    pool = SandboxPool(pd.DataFrame({"a": range(5_000_000)}), workers=1, memory_mb=30)
+    try:
+        for _ in range(2):
+            with pytest.raises(SandboxError, match="failed to start"):
+                pool.run("1")
+    finally:
+        pool.close()